@@ -1,170 +1,354 @@
 # ai/agents/job_matching_agent.py
 import logging
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable, Awaitable, AsyncIterator
 import asyncio
-from anthropic import AsyncAnthropic
-from openai import AsyncOpenAI
-from config.settings import (
-    CLAUDE_API_KEY,
-    OPENAI_API_KEY,
-    DEFAULT_AI_PROVIDER,
-    CLAUDE_MODEL,
-    OPENAI_MODEL
-)
+from config.settings import DEFAULT_AI_PROVIDER
+from ai.cache import get_llm_cache
+from ai.gateway import get_llm_gateway, default_model
+from ai.prompts.layout import Prompt, build_prompt
+from utils.json_stream import JSONArrayStreamParser
+from utils.validators import coerce_percentage
 
 logger = logging.getLogger(__name__)
 
-# Initialize AI clients
-claude_client = AsyncAnthropic(api_key=CLAUDE_API_KEY)
-openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+# Compact match protocol limits
+MATCH_DESCRIPTION_CHARS = 400
+MATCH_SKILLS_CHARS = 300
+MATCH_RESPONSIBILITY_CHARS = 160
+MATCH_OUTPUT_BASE_TOKENS = 200
+MATCH_OUTPUT_TOKENS_PER_JOB = 60
+
+def _clip(value: Any, length: int) -> str:
+    """Collapse whitespace and truncate a value for the prompt"""
+    text = " ".join(str(value or "").split())
+    return text if len(text) <= length else text[:length - 1] + "…"
+
+def compact_job_for_matching(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Project a job to the fields the matcher needs
+    
+    Args:
+        job: Job dictionary from the API
+        
+    Returns:
+        Compact job dictionary (empty fields omitted)
+    """
+    compact = {
+        "id": str(job.get("id")),
+        "title": _clip(job.get("title"), 120),
+        "skills": _clip(job.get("education_and_skills"), MATCH_SKILLS_CHARS),
+        "exp": _clip(job.get("experience"), 40),
+        "loc": _clip(job.get("location"), 80),
+        "desc": _clip(job.get("job_description"), MATCH_DESCRIPTION_CHARS)
+    }
+    return {key: value for key, value in compact.items() if value}
+
+def compact_resume_for_matching(resume_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Project a parsed resume to the fields the matcher needs (no contact details)
+    
+    Args:
+        resume_data: Parsed resume data
+        
+    Returns:
+        Compact resume dictionary
+    """
+    contact_info = resume_data.get("contact_info") or {}
+    skills = resume_data.get("skills") or {}
+    
+    if isinstance(skills, dict):
+        skills = [item for values in skills.values() if isinstance(values, list) for item in values]
+    
+    compact = {
+        "location": contact_info.get("location") if isinstance(contact_info, dict) else None,
+        "summary": _clip(resume_data.get("summary"), MATCH_DESCRIPTION_CHARS),
+        "skills": [str(skill) for skill in skills if skill] if isinstance(skills, list) else skills,
+        "experience": [
+            {
+                "title": job.get("title"),
+                "company": job.get("company"),
+                "from": job.get("start_date"),
+                "to": job.get("end_date"),
+                "did": [
+                    _clip(item, MATCH_RESPONSIBILITY_CHARS)
+                    for item in (job.get("responsibilities") if isinstance(job.get("responsibilities"), list) else [])[:3]
+                ]
+            }
+            for job in resume_data.get("work_experience") or []
+            if isinstance(job, dict)
+        ],
+        "education": [
+            " ".join(str(part) for part in (edu.get("degree"), edu.get("field")) if part)
+            for edu in resume_data.get("education") or []
+            if isinstance(edu, dict)
+        ]
+    }
+    return {key: value for key, value in compact.items() if value}
+
+def build_job_matching_prompt(jobs: List[Dict[str, Any]], resume_data: Dict[str, Any]) -> Prompt:
+    """Render the compact job matching prompt (minified JSON payloads, resume before jobs)"""
+    return build_prompt(
+        JobMatchingAgent.JOB_MATCHING_SYSTEM_PROMPT,
+        user_block=JobMatchingAgent.RESUME_BLOCK.format(
+            resume_json=json.dumps(compact_resume_for_matching(resume_data), separators=(",", ":"), ensure_ascii=False)
+        ),
+        call_block=JobMatchingAgent.JOBS_BLOCK.format(
+            jobs_json=json.dumps([compact_job_for_matching(job) for job in jobs], separators=(",", ":"), ensure_ascii=False)
+        )
+    )
 
 class JobMatchingAgent:
     """AI agent for matching jobs to user resumes"""
     
-    JOB_MATCHING_PROMPT = """
-    You are an AI assistant that helps match job listings to a candidate's resume. Your task is to:
-    
-    1. Analyze the candidate's resume
-    2. Analyze the job listings provided
-    3. Rank the job listings based on how well they match the candidate's skills, experience, and qualifications
-    4. For each job, calculate a match percentage (0-100%) and provide a brief explanation of the match
-    
-    Here is the candidate's resume information in JSON format:
-    {resume_json}
-    
-    Here are the job listings in JSON format:
-    {jobs_json}
-    
-    Please return a ranked list of job matches in the following JSON format:
-    
-    ```json
-    [
-      {{
-        "job_id": "job_id_here",
-        "match_percentage": 85,
-        "match_reasons": "Key skills match: Python, React. Experience level matches. Location is suitable.",
-        "job_data": {{...original job data...}}
-      }},
-      {{
-        "job_id": "another_job_id",
-        "match_percentage": 72,
-        "match_reasons": "Skills partially match. More experience required than candidate has.",
-        "job_data": {{...original job data...}}
-      }}
-    ]
-    ```
-    
-    Sort the results by match_percentage in descending order (best matches first).
+    # The fixed scoring rubric keeps the system block above the providers'
+    # minimum cacheable prefix (1024 tokens), so it is cached across users
+    JOB_MATCHING_SYSTEM_PROMPT = """
+    You are an AI assistant that helps match job listings to a candidate's resume.
+    Score how well each job the user sends matches the candidate's skills, experience, qualifications and location.
+    
+    INPUT
+    The candidate's resume is a JSON object with these keys (any may be missing):
+    - location: the city the candidate lives in
+    - summary: the candidate's own summary, clipped
+    - skills: a flat list of skills, tools and technologies
+    - experience: past roles, newest first, each with title, company, from, to and up to three things the candidate did
+    - education: degrees with their field of study
+    Each job listing is a JSON object with these keys (empty fields are omitted):
+    - id: the job's identifier, to be copied exactly into job_id
+    - title: the job title
+    - skills: required education and skills, clipped
+    - exp: the required experience, usually a range of years such as "2 - 5 Yrs"
+    - loc: one or more job locations, or "Remote"
+    - desc: the start of the job description, clipped
+    
+    SCORING RUBRIC
+    Judge each job on its own against the candidate; never compare jobs with each other when scoring. Weigh the criteria as follows:
+    1. Skills (40 points): how many of the job's required skills and tools the candidate has used, counting close equivalents
+       (PostgreSQL for SQL, React for JavaScript front-end work, AWS for cloud experience). Core skills named in the title or
+       early in the requirements matter more than skills listed as nice to have. Skills only listed, never used in a role,
+       count for half.
+    2. Experience (25 points): whether the candidate's years of relevant experience fall within the required range, and
+       whether past responsibilities resemble the job's. Being one or two years short costs a few points; being far short, or
+       applying for a role several levels below the candidate's seniority, costs most of them.
+    3. Role fit (15 points): whether the job is a natural next step from the candidate's recent titles, in the same function
+       (engineering, data, design, sales, support, operations) and at a similar or slightly higher level.
+    4. Location (10 points): full points for remote jobs or jobs in the candidate's city, half when the city is unknown on
+       either side, none when the job requires presence in a different city.
+    5. Education (10 points): full points when the candidate meets a stated degree requirement or none is stated, partial
+       points for a related field, none when a required degree or certification is clearly missing.
+    
+    SCORE BANDS
+    - 85-100: strong match; the candidate meets nearly every requirement and would be a credible shortlist candidate.
+    - 70-84: good match; most core requirements are met with one or two gaps that are easy to explain.
+    - 50-69: partial match; relevant background but missing a core skill, level or location requirement.
+    - 30-49: weak match; some transferable skills but a different function, level or stack.
+    - 0-29: poor match; little in common with the candidate's background.
+    Use the whole range. Do not give every job a similar score, and do not inflate scores to be encouraging.
+    
+    CALIBRATION EXAMPLES
+    - A backend developer with four years of Python and Django in Pune, for a remote "Python Developer, 3 - 6 Yrs" role
+      asking for Django, REST APIs and PostgreSQL: about 90.
+    - The same candidate for a "Java Developer, 2 - 5 Yrs" role in Pune asking for Spring Boot and microservices: about 55,
+      since the level and location fit but the core language does not.
+    - The same candidate for a "Senior Engineering Manager, 12 - 15 Yrs" role in Bengaluru: about 25.
+    - A recent graduate with a data science internship, for a "Data Analyst, 0 - 2 Yrs" role asking for SQL, Excel and
+      dashboards: about 75 if the resume shows SQL, about 60 if it does not.
+    
+    RULES
+    - Use only facts present in the resume and the listing. Do not assume skills, years or degrees that are not stated.
+    - When a listing is too sparse to judge a criterion, give that criterion half of its points rather than zero.
+    - Treat clipped text (ending in "…") as incomplete, not as a missing requirement.
+    - Score every job the user sends exactly once, and never invent job ids.
+    
+    REASON
+    Write one short sentence (at most 25 words) naming the main reason for the score: the strongest overlap for a good
+    match, or the most important gap for a weak one. Address the candidate as "you", do not restate the score, and do not
+    repeat the job title or company name.
+    
+    OUTPUT
+    Return ONLY a JSON array with one object per job, best match first:
+    [{"job_id":"<id>","score":<0-100>,"reason":"<one short sentence>"}]
+    Do not wrap the array in a code block, add commentary, or repeat any other job data.
+    """
+    
+    # Data blocks, most stable first so the resume prefix can be cached
+    RESUME_BLOCK = "Candidate resume (JSON):\n{resume_json}"
+    JOBS_BLOCK = "Job listings (JSON array; keys: id, title, skills, exp, loc, desc):\n{jobs_json}"
+    
+    APPLICATION_TIPS_SYSTEM_PROMPT = """
+    You are a career advisor helping a job seeker prepare for an application. 
+    
+    Based on the candidate's resume and the job listing sent by the user, provide specific tips for:
+    1. How to tailor their resume for this specific position
+    2. Key skills to emphasize in their application
+    3. Potential interview questions they might face
+    4. Any gaps or areas they should address or prepare for
+    
+    Provide your advice in a clear, structured format that would be helpful for the job seeker.
     """
     
     @staticmethod
     async def match_jobs_to_resume(
         jobs: List[Dict[str, Any]],
-        resume_data: Dict[str, Any]
+        resume_data: Dict[str, Any],
+        on_match: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Match jobs to a user's resume using AI
         
+        The model sees a compact projection of each job and returns only ids,
+        scores and short reasons; the full job data is rejoined here by id.
+        The response is streamed and each match is validated as soon as its
+        object is complete, so callers can act on the best matches while the
+        model is still writing the rest.
+        
         Args:
             jobs: List of job dictionaries
             resume_data: User's structured resume data
+            on_match: Optional async callback receiving each valid match as it
+                arrives (in the model's order, best first)
             
         Returns:
-            Ranked list of jobs with match information
+            Ranked list of matches (job_id, match_percentage, match_reasons, job_data)
         """
         try:
-            # Prepare prompt with job and resume data
-            prompt = JobMatchingAgent.JOB_MATCHING_PROMPT.format(
-                resume_json=json.dumps(resume_data, indent=2),
-                jobs_json=json.dumps(jobs, indent=2)
-            )
+            prompt = build_job_matching_prompt(jobs, resume_data)
+            jobs_by_id = {str(job.get("id")): job for job in jobs}
+            parser = JSONArrayStreamParser()
+            response_parts = []
+            valid_matches = []
+            seen_job_ids = set()
             
-            # Get AI response
-            response_text = await JobMatchingAgent._get_ai_response(prompt)
+            async def accept(item: Any) -> None:
+                match = JobMatchingAgent._validate_match(item, jobs_by_id)
+                
+                if match is None or match["job_id"] in seen_job_ids:
+                    return
+                
+                seen_job_ids.add(match["job_id"])
+                valid_matches.append(match)
+                
+                if on_match:
+                    try:
+                        await on_match(match)
+                    except Exception as e:
+                        logger.error(f"Error handling streamed match {match['job_id']}: {str(e)}")
             
-            # Extract JSON from response
-            matches_json = JobMatchingAgent._extract_json_from_text(response_text)
+            # Stream the AI response (output is a few dozen tokens per job)
+            async for text in JobMatchingAgent._stream_ai_response(
+                prompt,
+                max_tokens=min(4000, MATCH_OUTPUT_BASE_TOKENS + MATCH_OUTPUT_TOKENS_PER_JOB * len(jobs)),
+                validate=lambda text: JobMatchingAgent._has_valid_match(text, jobs_by_id)
+            ):
+                response_parts.append(text)
+                
+                for item in parser.feed(text):
+                    await accept(item)
             
-            try:
-                matches = json.loads(matches_json)
+            response_text = "".join(response_parts)
+            
+            if not valid_matches:
+                # Not a well-formed array of matches: parse the whole response instead
+                try:
+                    matches = json.loads(JobMatchingAgent._extract_json_from_text(response_text))
+                except json.JSONDecodeError as e:
+                    logger.error(f"Failed to parse JSON from AI response: {str(e)}")
+                    logger.debug(f"AI response: {response_text}")
+                    return jobs  # Return original jobs if parsing fails
                 
                 # Validate response format
                 if not isinstance(matches, list):
                     logger.error("Invalid matches format: not a list")
                     return jobs  # Return original jobs if matching fails
                 
-                # Ensure each match has required fields
-                valid_matches = []
                 for match in matches:
-                    if all(k in match for k in ["job_id", "match_percentage", "job_data"]):
-                        valid_matches.append(match)
+                    await accept(match)
                 
                 if not valid_matches:
                     logger.warning("No valid matches found in AI response")
                     return jobs  # Return original jobs if no valid matches
-                
-                # Sort by match percentage
-                valid_matches.sort(key=lambda x: x.get("match_percentage", 0), reverse=True)
-                
-                # Return each job with its original data plus match info
-                return valid_matches
             
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON from AI response: {str(e)}")
-                logger.debug(f"AI response: {response_text}")
-                return jobs  # Return original jobs if parsing fails
+            # Sort by match percentage
+            valid_matches.sort(key=lambda x: x.get("match_percentage", 0), reverse=True)
+            
+            return valid_matches
         
         except Exception as e:
             logger.error(f"Error matching jobs to resume: {str(e)}")
             return jobs  # Return original jobs if matching fails
     
     @staticmethod
-    async def _get_ai_response(prompt: str) -> str:
-        """Get response from AI service"""
-        if DEFAULT_AI_PROVIDER == "claude":
-            return await JobMatchingAgent._get_claude_response(prompt)
-        else:
-            return await JobMatchingAgent._get_openai_response(prompt)
+    def _validate_match(match: Any, jobs_by_id: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Rejoin a model-reported match to its job data (None if it names no known job or has no valid score)"""
+        if not isinstance(match, dict):
+            return None
+        
+        job_id = str(match.get("job_id"))
+        # The model may report the score as a string ("85") or a float
+        match_percentage = coerce_percentage(match.get("score"))
+        
+        if job_id not in jobs_by_id or match_percentage is None:
+            return None
+        
+        return {
+            "job_id": job_id,
+            "match_percentage": match_percentage,
+            "match_reasons": match.get("reason"),
+            "job_data": jobs_by_id[job_id]
+        }
     
     @staticmethod
-    async def _get_claude_response(prompt: str) -> str:
-        """Get response from Claude API"""
-        try:
-            response = await claude_client.messages.create(
-                model=CLAUDE_MODEL,
-                max_tokens=4000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            return response.content[0].text
+    def _has_valid_match(response_text: str, jobs_by_id: Dict[str, Dict[str, Any]]) -> bool:
+        """Whether a complete response holds at least one usable match (only those are cached)"""
+        parser = JSONArrayStreamParser()
+        items = parser.feed(response_text)
         
-        except Exception as e:
-            logger.error(f"Error getting Claude response: {str(e)}")
+        if not parser.finished:
+            try:
+                items = json.loads(JobMatchingAgent._extract_json_from_text(response_text))
+            except json.JSONDecodeError:
+                return False
             
-            # Fallback to OpenAI if Claude fails
-            logger.info("Falling back to OpenAI")
-            return await JobMatchingAgent._get_openai_response(prompt)
+            if not isinstance(items, list):
+                return False
+        
+        return any(JobMatchingAgent._validate_match(item, jobs_by_id) for item in items)
     
     @staticmethod
-    async def _get_openai_response(prompt: str) -> str:
-        """Get response from OpenAI API"""
-        try:
-            response = await openai_client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=4000
-            )
-            
-            return response.choices[0].message.content
-        
-        except Exception as e:
-            logger.error(f"Error getting OpenAI response: {str(e)}")
-            raise
+    async def _get_ai_response(
+        prompt: Prompt,
+        max_tokens: int = 4000,
+        task: str = "match",
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """Get response from AI service (served from the response cache when possible)"""
+        return await get_llm_cache().get_or_call(
+            "job_matching",
+            DEFAULT_AI_PROVIDER,
+            default_model(DEFAULT_AI_PROVIDER, task),
+            prompt,
+            {"max_tokens": max_tokens},
+            lambda info: get_llm_gateway().complete(prompt, max_tokens, task=task, info=info),
+            validate
+        )
+    
+    @staticmethod
+    def _stream_ai_response(
+        prompt: Prompt,
+        max_tokens: int = 4000,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> AsyncIterator[str]:
+        """Stream response from AI service (replayed from the response cache when possible)"""
+        return get_llm_cache().get_or_stream(
+            "job_matching",
+            DEFAULT_AI_PROVIDER,
+            default_model(DEFAULT_AI_PROVIDER, "match"),
+            prompt,
+            {"max_tokens": max_tokens},
+            lambda info: get_llm_gateway().stream(prompt, max_tokens, task="match", info=info),
+            validate
+        )
     
     @staticmethod
     def _extract_json_from_text(text: str) -> str:
@@ -192,23 +376,11 @@ class JobMatchingAgent:
         Returns:
             Tips and suggestions for the job application
         """
-        prompt = f"""
-        You are a career advisor helping a job seeker prepare for an application. 
-        
-        Based on the job listing and the candidate's resume below, provide specific tips for:
-        1. How to tailor their resume for this specific position
-        2. Key skills to emphasize in their application
-        3. Potential interview questions they might face
-        4. Any gaps or areas they should address or prepare for
-        
-        JOB LISTING:
-        {json.dumps(job_data, indent=2)}
-        
-        CANDIDATE'S RESUME:
-        {json.dumps(resume_data, indent=2)}
-        
-        Provide your advice in a clear, structured format that would be helpful for the job seeker.
-        """
+        prompt = build_prompt(
+            JobMatchingAgent.APPLICATION_TIPS_SYSTEM_PROMPT,
+            user_block=f"CANDIDATE'S RESUME:\n{json.dumps(resume_data, indent=2)}",
+            call_block=f"JOB LISTING:\n{json.dumps(job_data, indent=2)}"
+        )
         
-        response_text = await JobMatchingAgent._get_ai_response(prompt)
+        response_text = await JobMatchingAgent._get_ai_response(prompt, task="tips")
         return response_text
\ No newline at end of file
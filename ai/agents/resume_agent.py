@@ -3,21 +3,20 @@ import logging
 import json
 import os
 from datetime import datetime
+from typing import Any, Callable, Dict, Optional
 import aiohttp
 import asyncio
-from anthropic import AsyncAnthropic
-from openai import AsyncOpenAI
-from config.settings import (
-    CLAUDE_API_KEY,
-    OPENAI_API_KEY,
-    DEFAULT_AI_PROVIDER,
-    CLAUDE_MODEL,
-    OPENAI_MODEL
-)
+from config.settings import DEFAULT_AI_PROVIDER
+from ai.cache import get_llm_cache
+from ai.gateway import get_llm_gateway, default_model
+from ai.prompts.layout import Prompt, build_prompt
 from ai.prompts.resume_prompts import (
-    RESUME_PARSING_PROMPT,
-    RESUME_CUSTOMIZATION_PROMPT,
-    RESUME_SKILLS_EXTRACTION_PROMPT
+    RESUME_PARSING_SYSTEM_PROMPT,
+    RESUME_TEXT_BLOCK,
+    RESUME_CUSTOMIZATION_SYSTEM_PROMPT,
+    RESUME_DATA_BLOCK,
+    JOB_DETAILS_BLOCK,
+    RESUME_SKILLS_EXTRACTION_SYSTEM_PROMPT
 )
 from models.resume import ResumeRequest
 from utils.db import get_db
@@ -26,10 +25,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
-# Initialize AI clients
-claude_client = AsyncAnthropic(api_key=CLAUDE_API_KEY)
-openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-
 class ResumeAgent:
     """AI agent for resume parsing and customization"""
     
@@ -53,10 +48,17 @@ class ResumeAgent:
                 return None
             
             # Build prompt for resume parsing
-            prompt = RESUME_PARSING_PROMPT.format(resume_text=resume_text)
+            prompt = build_prompt(
+                RESUME_PARSING_SYSTEM_PROMPT,
+                call_block=RESUME_TEXT_BLOCK.format(resume_text=resume_text)
+            )
             
             # Get AI response
-            response_text = await ResumeAgent._get_ai_response(prompt)
+            response_text = await ResumeAgent._get_ai_response(
+                prompt,
+                task="parse",
+                validate=lambda text: isinstance(ResumeAgent._load_json(text), dict)
+            )
             
             # Parse JSON from response
             try:
@@ -117,18 +119,23 @@ class ResumeAgent:
             company = job_data.get("company", {}).get("name", "")
             required_skills = job_data.get("skills", [])
             
-            # Build prompt for resume customization
-            prompt = RESUME_CUSTOMIZATION_PROMPT.format(
-                job_title=job_title,
-                job_description=job_description,
-                company=company,
-                required_skills=", ".join(required_skills),
-                resume_data=json.dumps(resume_data, indent=2)
+            # Build prompt for resume customization (resume before job, so a user's
+            # customizations for different jobs share a cached prefix)
+            prompt = build_prompt(
+                RESUME_CUSTOMIZATION_SYSTEM_PROMPT,
+                user_block=RESUME_DATA_BLOCK.format(resume_data=json.dumps(resume_data, indent=2)),
+                call_block=JOB_DETAILS_BLOCK.format(
+                    job_title=job_title,
+                    job_description=job_description,
+                    company=company,
+                    required_skills=", ".join(required_skills)
+                )
             )
             
             # Get AI response
             start_time = datetime.now()
-            response_text = await ResumeAgent._get_ai_response(prompt, max_tokens=4000)
+            info = {}
+            response_text = await ResumeAgent._get_ai_response(prompt, max_tokens=4000, task="customize", info=info)
             end_time = datetime.now()
             processing_time = (end_time - start_time).total_seconds()
             
@@ -143,7 +150,8 @@ class ResumeAgent:
                     resume_request.status = "completed"
                     resume_request.customized_resume = response_text
                     resume_request.processing_time = int(processing_time)
-                    resume_request.ai_model_used = CLAUDE_MODEL if DEFAULT_AI_PROVIDER == "claude" else OPENAI_MODEL
+                    # The model that answered (a fallback or downgrade may have replaced the preferred one)
+                    resume_request.ai_model_used = info.get("model") or default_model(DEFAULT_AI_PROVIDER, "customize")
                     
                     await db.commit()
             
@@ -185,12 +193,17 @@ class ResumeAgent:
         """
         try:
             # Build prompt for skills extraction
-            prompt = RESUME_SKILLS_EXTRACTION_PROMPT.format(
-                resume_data=json.dumps(resume_data, indent=2)
+            prompt = build_prompt(
+                RESUME_SKILLS_EXTRACTION_SYSTEM_PROMPT,
+                user_block=RESUME_DATA_BLOCK.format(resume_data=json.dumps(resume_data, indent=2))
             )
             
             # Get AI response
-            response_text = await ResumeAgent._get_ai_response(prompt)
+            response_text = await ResumeAgent._get_ai_response(
+                prompt,
+                task="skills",
+                validate=lambda text: ResumeAgent._load_json(text) is not None
+            )
             
             # Parse JSON from response
             try:
@@ -276,51 +289,32 @@ class ResumeAgent:
         return "Failed to extract text from file."
     
     @staticmethod
-    async def _get_ai_response(prompt: str, max_tokens: int = 2000) -> str:
-        """Get response from AI service"""
-        if DEFAULT_AI_PROVIDER == "claude":
-            return await ResumeAgent._get_claude_response(prompt, max_tokens)
-        else:
-            return await ResumeAgent._get_openai_response(prompt, max_tokens)
+    async def _get_ai_response(
+        prompt: Prompt,
+        max_tokens: int = 2000,
+        task: Optional[str] = None,
+        validate: Optional[Callable[[str], bool]] = None,
+        info: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Get response from AI service (served from the response cache when possible)"""
+        return await get_llm_cache().get_or_call(
+            "resume",
+            DEFAULT_AI_PROVIDER,
+            default_model(DEFAULT_AI_PROVIDER, task),
+            prompt,
+            {"max_tokens": max_tokens},
+            lambda info: get_llm_gateway().complete(prompt, max_tokens, task=task, info=info),
+            validate,
+            info
+        )
     
     @staticmethod
-    async def _get_claude_response(prompt: str, max_tokens: int = 2000) -> str:
-        """Get response from Claude API"""
+    def _load_json(text: str) -> Any:
+        """Parse the JSON of a response (None if it is not valid JSON)"""
         try:
-            response = await claude_client.messages.create(
-                model=CLAUDE_MODEL,
-                max_tokens=max_tokens,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            return response.content[0].text
-        
-        except Exception as e:
-            logger.error(f"Error getting Claude response: {str(e)}")
-            
-            # Fallback to OpenAI if Claude fails
-            logger.info("Falling back to OpenAI")
-            return await ResumeAgent._get_openai_response(prompt, max_tokens)
-    
-    @staticmethod
-    async def _get_openai_response(prompt: str, max_tokens: int = 2000) -> str:
-        """Get response from OpenAI API"""
-        try:
-            response = await openai_client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens
-            )
-            
-            return response.choices[0].message.content
-        
-        except Exception as e:
-            logger.error(f"Error getting OpenAI response: {str(e)}")
-            raise
+            return json.loads(ResumeAgent._extract_json_from_text(text))
+        except json.JSONDecodeError:
+            return None
     
     @staticmethod
     def _extract_json_from_text(text: str) -> str:
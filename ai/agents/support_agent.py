@@ -3,26 +3,17 @@ import logging
 import json
 from typing import Tuple, List, Dict, Any
 import asyncio
-from anthropic import AsyncAnthropic
-from openai import AsyncOpenAI
-from config.settings import (
-    CLAUDE_API_KEY,
-    OPENAI_API_KEY,
-    DEFAULT_AI_PROVIDER,
-    CLAUDE_MODEL,
-    OPENAI_MODEL
-)
+from config.settings import DEFAULT_AI_PROVIDER
+from ai.cache import get_llm_cache
+from ai.gateway import get_llm_gateway, default_model
+from ai.prompts.layout import Prompt, build_prompt
 
 logger = logging.getLogger(__name__)
 
-# Initialize AI clients
-claude_client = AsyncAnthropic(api_key=CLAUDE_API_KEY)
-openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-
 class SupportAgent:
     """AI agent for handling support requests"""
     
-    SUPPORT_PROMPT = """
+    SUPPORT_SYSTEM_PROMPT = """
     You are an AI support assistant for a Telegram bot that provides job updates and resume customization services. 
     Your task is to help users with their questions and issues related to the bot's services.
 
@@ -46,12 +37,6 @@ class SupportAgent:
     - For complex technical problems, offer to escalate to a human agent
     - Use markdown formatting for better readability
 
-    User Message:
-    {user_message}
-
-    Conversation History:
-    {conversation_history}
-    
     Your response should be helpful and concise. At the end of your response, include one line with your assessment on whether this query needs human escalation. Format it as: NEEDS_HUMAN: true or NEEDS_HUMAN: false
     """
     
@@ -80,10 +65,11 @@ class SupportAgent:
                     for msg in conversation_history
                 ])
             
-            # Build prompt
-            prompt = SupportAgent.SUPPORT_PROMPT.format(
-                user_message=user_message,
-                conversation_history=history_text
+            # Build prompt (history before the new message, so earlier turns stay a cached prefix)
+            prompt = build_prompt(
+                SupportAgent.SUPPORT_SYSTEM_PROMPT,
+                user_block=f"Conversation History:\n{history_text}" if history_text else None,
+                call_block=f"User Message:\n{user_message}"
             )
             
             # Get AI response
@@ -113,48 +99,13 @@ class SupportAgent:
             )
     
     @staticmethod
-    async def _get_ai_response(prompt: str) -> str:
-        """Get response from AI service"""
-        if DEFAULT_AI_PROVIDER == "claude":
-            return await SupportAgent._get_claude_response(prompt)
-        else:
-            return await SupportAgent._get_openai_response(prompt)
-    
-    @staticmethod
-    async def _get_claude_response(prompt: str) -> str:
-        """Get response from Claude API"""
-        try:
-            response = await claude_client.messages.create(
-                model=CLAUDE_MODEL,
-                max_tokens=2000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            return response.content[0].text
-        
-        except Exception as e:
-            logger.error(f"Error getting Claude response: {str(e)}")
-            
-            # Fallback to OpenAI if Claude fails
-            logger.info("Falling back to OpenAI")
-            return await SupportAgent._get_openai_response(prompt)
-    
-    @staticmethod
-    async def _get_openai_response(prompt: str) -> str:
-        """Get response from OpenAI API"""
-        try:
-            response = await openai_client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000
-            )
-            
-            return response.choices[0].message.content
-        
-        except Exception as e:
-            logger.error(f"Error getting OpenAI response: {str(e)}")
-            raise
\ No newline at end of file
+    async def _get_ai_response(prompt: Prompt) -> str:
+        """Get response from AI service (served from the response cache when possible)"""
+        return await get_llm_cache().get_or_call(
+            "support",
+            DEFAULT_AI_PROVIDER,
+            default_model(DEFAULT_AI_PROVIDER, "support"),
+            prompt,
+            {"max_tokens": 2000},
+            lambda info: get_llm_gateway().complete(prompt, 2000, task="support", info=info)
+        )
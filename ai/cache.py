@@ -0,0 +1,389 @@
+# ai/cache.py
+import logging
+import json
+import time
+import hashlib
+import asyncio
+import sqlite3
+from collections import defaultdict
+from contextlib import closing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from config.settings import (
+    REDIS_URL,
+    AI_CACHE_BACKEND,
+    AI_CACHE_TTL,
+    AI_CACHE_MAX_ENTRIES,
+    AI_CACHE_SQLITE_PATH,
+    AI_CACHE_AGENTS
+)
+from ai.prompts.layout import Prompt, prompt_text
+from utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "ai:response:"
+# Redis sorted set of cache keys scored by last use, for LRU eviction
+REDIS_LRU_KEY = "ai:response-lru"
+
+def normalize_prompt(prompt: Prompt) -> str:
+    """Collapse whitespace so re-indented or re-wrapped prompts share a key"""
+    return " ".join(prompt_text(prompt).split())
+
+def build_cache_key(provider: str, model: str, prompt: Prompt, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the content address of an LLM request
+
+    Args:
+        provider: AI provider (claude, openai)
+        model: Model name
+        prompt: Prompt text or layered prompt
+        params: Generation parameters (max_tokens, temperature, ...)
+
+    Returns:
+        Cache key string
+    """
+    payload = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "prompt": normalize_prompt(prompt),
+            "params": params or {}
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return f"{CACHE_KEY_PREFIX}{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+class MemoryResponseCacheBackend:
+    """In-process LRU backend (development and tests)"""
+
+    def __init__(self, max_entries: int = AI_CACHE_MAX_ENTRIES):
+        self._cache = LRUCache(max_entries)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._cache.set(key, value, ttl)
+
+class RedisResponseCacheBackend:
+    """
+    Redis backend shared by all API, bot and Celery processes
+
+    Entries expire through Redis TTLs. Size is bounded by a sorted set of
+    keys scored by last use rather than by a server-wide maxmemory policy,
+    since the same Redis also serves as the Celery broker.
+    """
+
+    def __init__(self, url: str = REDIS_URL, max_entries: int = AI_CACHE_MAX_ENTRIES):
+        self.url = url
+        self.max_entries = max_entries
+        self._client = None
+        self._loop = None
+
+    def _get_client(self):
+        # redis.asyncio connections are bound to the loop that opened them
+        loop = asyncio.get_running_loop()
+
+        if self._client is None or self._loop is not loop:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self.url)
+            self._loop = loop
+
+        return self._client
+
+    async def get(self, key: str) -> Optional[str]:
+        client = self._get_client()
+        raw = await client.get(key)
+
+        if raw is None:
+            return None
+
+        await client.zadd(REDIS_LRU_KEY, {key: time.time()})
+        return raw.decode("utf-8") if isinstance(raw, bytes) else raw
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        client = self._get_client()
+
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, ex=ttl)
+            pipe.zadd(REDIS_LRU_KEY, {key: time.time()})
+            pipe.zcard(REDIS_LRU_KEY)
+            _, _, size = await pipe.execute()
+
+        if size > self.max_entries:
+            evicted = await client.zpopmin(REDIS_LRU_KEY, size - self.max_entries)
+            if evicted:
+                await client.delete(*[member for member, _ in evicted])
+
+class SQLiteResponseCacheBackend:
+    """
+    On-disk SQLite backend for single-host deployments
+
+    Queries run in a worker thread so the event loop is never blocked.
+    """
+
+    def __init__(self, path: str = AI_CACHE_SQLITE_PATH, max_entries: int = AI_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=10)
+
+        if not self._initialized:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS ai_responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_ai_responses_last_used ON ai_responses (last_used)")
+            self._initialized = True
+
+        return connection
+
+    def _get(self, key: str) -> Optional[str]:
+        # The connection's own context manager only commits; closing() releases it
+        with closing(self._connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT value, expires_at FROM ai_responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            if row[1] < time.time():
+                connection.execute("DELETE FROM ai_responses WHERE key = ?", (key,))
+                return None
+
+            connection.execute("UPDATE ai_responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def _set(self, key: str, value: str, ttl: int) -> None:
+        now = time.time()
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO ai_responses (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now)
+            )
+            connection.execute("DELETE FROM ai_responses WHERE expires_at < ?", (now,))
+            connection.execute(
+                "DELETE FROM ai_responses WHERE key IN ("
+                "SELECT key FROM ai_responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+class LLMResponseCache:
+    """
+    Content-addressed cache of LLM responses
+
+    Keys hash (provider, model, normalized prompt, parameters), so any
+    agent sending an identical request gets the stored response instead of
+    paying for a new completion. Only agents listed in AI_CACHE_AGENTS use
+    it; backend failures fall through to the provider.
+    """
+
+    def __init__(self, backend, ttl: int = AI_CACHE_TTL, agents=AI_CACHE_AGENTS):
+        self.backend = backend
+        self.ttl = ttl
+        self.agents = set(agents)
+        self.stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "errors": 0})
+
+    def is_enabled(self, agent: str) -> bool:
+        return self.backend is not None and agent in self.agents
+
+    async def _lookup(self, agent: str, key: str, validate: Optional[Callable[[str], bool]]) -> Optional[str]:
+        stats = self.stats[agent]
+
+        try:
+            cached = await self.backend.get(key)
+        except Exception as e:
+            stats["errors"] += 1
+            logger.warning(f"AI cache read failed for {agent}: {str(e)}")
+            return None
+
+        # Entries stored before a validator existed may not pass it
+        if cached is not None and validate is not None and not validate(cached):
+            logger.debug(f"Ignoring cached {agent} response that failed validation")
+            return None
+
+        return cached
+
+    async def _store(
+        self,
+        agent: str,
+        key: str,
+        response: str,
+        provider: str,
+        model: str,
+        info: Dict[str, Any],
+        validate: Optional[Callable[[str], bool]]
+    ) -> None:
+        # A fallback provider or a downgraded model answered: the response
+        # does not belong under the key of the requested model
+        if info.get("provider", provider) != provider or info.get("model", model) != model:
+            logger.debug(f"Not caching {agent} response from {info.get('provider')}/{info.get('model')}")
+            return
+
+        # Empty, truncated or unusable responses usually mean a provider
+        # problem and would be served for the whole TTL, so they are not cached
+        if not response or info.get("truncated"):
+            return
+        if validate is not None and not validate(response):
+            logger.debug(f"Not caching {agent} response that failed validation")
+            return
+
+        try:
+            await self.backend.set(key, response, self.ttl)
+        except Exception as e:
+            self.stats[agent]["errors"] += 1
+            logger.warning(f"AI cache write failed for {agent}: {str(e)}")
+
+    async def get_or_call(
+        self,
+        agent: str,
+        provider: str,
+        model: str,
+        prompt: Prompt,
+        params: Optional[Dict[str, Any]],
+        call: Callable[[Dict[str, Any]], Awaitable[str]],
+        validate: Optional[Callable[[str], bool]] = None,
+        info: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Get the response for a request, calling the provider only on a miss
+
+        Args:
+            agent: Name of the calling agent (job_matching, resume, support)
+            provider: AI provider
+            model: Model name
+            prompt: Prompt text or layered prompt
+            params: Generation parameters
+            call: Coroutine function that performs the provider request; it
+                receives a dictionary to fill with details of the answer
+                (see LLMGateway.complete)
+            validate: Optional predicate; responses failing it (e.g. output
+                the agent cannot parse) are returned but not stored
+            info: Optional dictionary passed to call; on a hit it receives
+                the provider and model of the key
+
+        Returns:
+            Response text
+        """
+        info = info if info is not None else {}
+
+        if not self.is_enabled(agent):
+            return await call(info)
+
+        key = build_cache_key(provider, model, prompt, params)
+        stats = self.stats[agent]
+        cached = await self._lookup(agent, key, validate)
+
+        if cached is not None:
+            stats["hits"] += 1
+            logger.debug(f"AI cache hit for {agent} ({stats})")
+            info.update({"provider": provider, "model": model})
+            return cached
+
+        stats["misses"] += 1
+        response = await call(info)
+        await self._store(agent, key, response, provider, model, info, validate)
+
+        return response
+
+    async def get_or_stream(
+        self,
+        agent: str,
+        provider: str,
+        model: str,
+        prompt: Prompt,
+        params: Optional[Dict[str, Any]],
+        stream: Callable[[Dict[str, Any]], AsyncIterator[str]],
+        validate: Optional[Callable[[str], bool]] = None,
+        info: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming counterpart of get_or_call
+
+        A hit is yielded as one chunk. On a miss the provider stream is
+        passed through and stored once it completes; streams abandoned by
+        the caller or cut off at max_tokens are not stored.
+
+        Args:
+            agent: Name of the calling agent
+            provider: AI provider
+            model: Model name
+            prompt: Prompt text or layered prompt
+            params: Generation parameters
+            stream: Function returning the provider's chunk iterator; it
+                receives a dictionary filled with details of the answer
+                once the stream ends
+            validate: Optional predicate the complete response must pass
+                to be stored
+            info: Optional dictionary passed to stream (see get_or_call)
+
+        Yields:
+            Response text chunks
+        """
+        info = info if info is not None else {}
+
+        if not self.is_enabled(agent):
+            async for text in stream(info):
+                yield text
+            return
+
+        key = build_cache_key(provider, model, prompt, params)
+        stats = self.stats[agent]
+        cached = await self._lookup(agent, key, validate)
+
+        if cached is not None:
+            stats["hits"] += 1
+            logger.debug(f"AI cache hit for {agent} ({stats})")
+            info.update({"provider": provider, "model": model})
+            yield cached
+            return
+
+        stats["misses"] += 1
+        parts = []
+
+        async for text in stream(info):
+            parts.append(text)
+            yield text
+
+        await self._store(agent, key, "".join(parts), provider, model, info, validate)
+
+# Global cache instance
+_llm_cache = None
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Get the process-wide LLM response cache
+
+    Returns:
+        LLMResponseCache instance (disabled when AI_CACHE_BACKEND is none)
+    """
+    global _llm_cache
+
+    if _llm_cache is None:
+        if AI_CACHE_BACKEND == "redis":
+            backend = RedisResponseCacheBackend()
+        elif AI_CACHE_BACKEND == "sqlite":
+            backend = SQLiteResponseCacheBackend()
+        elif AI_CACHE_BACKEND == "memory":
+            backend = MemoryResponseCacheBackend()
+        else:
+            backend = None
+
+        _llm_cache = LLMResponseCache(backend)
+
+    return _llm_cache
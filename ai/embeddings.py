@@ -0,0 +1,138 @@
+# ai/embeddings.py
+import logging
+import math
+import re
+import zlib
+from collections import Counter
+from typing import List, Optional
+
+import numpy as np
+
+from config.settings import (
+    OPENAI_API_KEY,
+    EMBEDDING_PROVIDER,
+    EMBEDDING_MODEL,
+    EMBEDDING_DIM,
+    EMBEDDING_BATCH_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+# Provider inputs are cut to roughly their context size
+MAX_EMBEDDING_TEXT_LENGTH = 8000
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row so dot products are cosine similarities"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+class HashingEmbedder:
+    """
+    Local embedder: signed feature hashing of unigrams and bigrams with
+    sublinear term frequency
+
+    Needs no model or network, so it is the default for development, tests
+    and offline runs.
+    """
+
+    name = "hashing"
+
+    _token_pattern = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def _embed_one(self, text: str, out: np.ndarray) -> None:
+        tokens = self._token_pattern.findall((text or "").lower())
+        features = Counter(tokens)
+        features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+        for feature, count in features.items():
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if hashed & 0x80000000 else -1.0
+            out[hashed % self.dim] += sign * (1.0 + math.log(count))
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 matrix of shape (len(texts), dim) with unit-length rows
+        """
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            self._embed_one(text, matrix[row])
+
+        return normalize_rows(matrix)
+
+class OpenAIEmbedder:
+    """Provider embedder using the OpenAI embeddings API"""
+
+    name = "openai"
+
+    def __init__(self, model: str = EMBEDDING_MODEL, dim: int = EMBEDDING_DIM, batch_size: int = EMBEDDING_BATCH_SIZE):
+        self.model = model
+        self.dim = dim
+        self.batch_size = batch_size
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+        return self._client
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts in batches
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 matrix of shape (len(texts), dim) with unit-length rows
+        """
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        for start in range(0, len(texts), self.batch_size):
+            batch = [(text or " ")[:MAX_EMBEDDING_TEXT_LENGTH] for text in texts[start:start + self.batch_size]]
+
+            response = await self._get_client().embeddings.create(
+                model=self.model,
+                input=batch,
+                dimensions=self.dim
+            )
+
+            for item in response.data:
+                matrix[start + item.index] = item.embedding
+
+        return normalize_rows(matrix)
+
+# Global embedder instance
+_embedder = None
+
+def get_embedder(provider: Optional[str] = None):
+    """
+    Get the configured embedder
+
+    Args:
+        provider: Override EMBEDDING_PROVIDER ("hashing" or "openai")
+
+    Returns:
+        Embedder with an async embed(texts) method and a dim attribute
+    """
+    global _embedder
+
+    if provider is not None:
+        return OpenAIEmbedder() if provider == "openai" else HashingEmbedder()
+
+    if _embedder is None:
+        _embedder = OpenAIEmbedder() if EMBEDDING_PROVIDER == "openai" else HashingEmbedder()
+        logger.info(f"Using {_embedder.name} embedder ({_embedder.dim} dimensions)")
+
+    return _embedder
@@ -0,0 +1,348 @@
+# ai/fake_provider.py
+import logging
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from config.settings import (
+    AI_FAKE_LATENCY_MEDIAN,
+    AI_FAKE_LATENCY_SIGMA,
+    AI_FAKE_ERROR_RATE,
+    AI_FAKE_SEED
+)
+from ai.prompts.layout import Prompt, prompt_text
+
+logger = logging.getLogger(__name__)
+
+# Errors injected at AI_FAKE_ERROR_RATE (rate limited, server error, overloaded)
+FAKE_ERROR_STATUSES = (429, 500, 529)
+# Share of the sampled latency spent before the first streamed chunk
+FIRST_CHUNK_SHARE = 0.2
+STREAM_CHUNK_CHARS = 16
+# Simulated prompt cache, with Anthropic's limits (shortest cacheable prefix, entry lifetime)
+PREFIX_CACHE_MIN_TOKENS = 1024
+PREFIX_CACHE_TTL = 300
+
+# Skills recognized when "parsing" a resume
+KNOWN_SKILLS = (
+    "python", "java", "javascript", "typescript", "go", "c++", "c#", "sql", "postgresql", "mysql",
+    "mongodb", "redis", "django", "flask", "fastapi", "spring", "react", "angular", "vue", "node.js",
+    "docker", "kubernetes", "aws", "azure", "gcp", "git", "linux", "html", "css", "machine learning",
+    "data analysis", "excel", "communication", "leadership", "teamwork"
+)
+SOFT_SKILLS = frozenset({"communication", "leadership", "teamwork"})
+
+_email_pattern = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_phone_pattern = re.compile(r"\+?\d[\d\s()-]{8,}\d")
+_fence_pattern = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```")
+_word_pattern = re.compile(r"[a-z][a-z0-9+#.]+")
+
+class FakeLLMError(Exception):
+    """Injected provider failure, shaped like an SDK status error so the gateway retries it"""
+
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        super().__init__(f"Fake provider error {status_code}")
+
+def _stable_fraction(*parts: Any) -> float:
+    """Deterministic value in [0, 1) for the given inputs"""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+def _json_after(prompt: str, marker: str) -> Any:
+    """Parse the JSON payload on the line following a marker"""
+    lines = prompt.splitlines()
+
+    for position, line in enumerate(lines):
+        if marker in line and position + 1 < len(lines):
+            try:
+                return json.loads(lines[position + 1].strip())
+            except ValueError:
+                return None
+
+    return None
+
+def _last_fenced(prompt: str) -> str:
+    """Content of the last fenced block (the data blocks follow the instructions)"""
+    fenced = _fence_pattern.findall(prompt)
+    return fenced[-1] if fenced else ""
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+def _words(value: Any) -> set:
+    return set(_word_pattern.findall(json.dumps(value).lower())) if value else set()
+
+def _find_skills(text: str) -> List[str]:
+    """Known skills mentioned in a text, as whole words"""
+    lowered = text.lower()
+    return [
+        skill for skill in KNOWN_SKILLS
+        if re.search(rf"(?<![\w+#.]){re.escape(skill)}(?![\w+#])", lowered)
+    ]
+
+class FakeLLMProvider:
+    """
+    Local stand-in for the Claude/OpenAI APIs
+
+    Recognizes the agents' prompts and returns schema-valid responses
+    derived from the prompt content, so the same prompt always gets the
+    same answer. Latency is log-normal around a configurable median and
+    a configurable share of calls fail with retryable errors. Token usage
+    is estimated, with a simulated prefix cache at the prompt's markers.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_median: float = AI_FAKE_LATENCY_MEDIAN,
+        latency_sigma: float = AI_FAKE_LATENCY_SIGMA,
+        error_rate: float = AI_FAKE_ERROR_RATE,
+        seed: Optional[int] = AI_FAKE_SEED
+    ):
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        # Prefix hash -> expiry time
+        self._prefix_cache: Dict[str, float] = {}
+
+    def sample_latency(self) -> float:
+        if self.latency_median <= 0:
+            return 0.0
+        return self._random.lognormvariate(math.log(self.latency_median), self.latency_sigma)
+
+    async def complete(self, prompt: Prompt, max_tokens: int = 2000) -> str:
+        """
+        Answer a prompt after a simulated delay
+
+        Args:
+            prompt: Prompt text or layered prompt
+            max_tokens: Ignored (responses are short)
+
+        Returns:
+            Response text
+
+        Raises:
+            FakeLLMError: At the configured error rate
+        """
+        await asyncio.sleep(self.sample_latency())
+
+        if self._random.random() < self.error_rate:
+            raise FakeLLMError(self._random.choice(FAKE_ERROR_STATUSES))
+
+        return self.respond(prompt_text(prompt))
+
+    async def stream(self, prompt: Prompt, max_tokens: int = 2000) -> AsyncIterator[str]:
+        """
+        Stream the answer to a prompt in small chunks
+
+        The sampled latency is split into a time to first chunk and an even
+        pace for the remaining chunks; errors are raised before any output.
+        """
+        latency = self.sample_latency()
+        await asyncio.sleep(latency * FIRST_CHUNK_SHARE)
+
+        if self._random.random() < self.error_rate:
+            raise FakeLLMError(self._random.choice(FAKE_ERROR_STATUSES))
+
+        text = self.respond(prompt_text(prompt))
+        chunks = [text[start:start + STREAM_CHUNK_CHARS] for start in range(0, len(text), STREAM_CHUNK_CHARS)]
+        pause = latency * (1 - FIRST_CHUNK_SHARE) / max(1, len(chunks))
+
+        for position, chunk in enumerate(chunks):
+            if position:
+                await asyncio.sleep(pause)
+            yield chunk
+
+    def usage(self, prompt: Prompt, response: str) -> Dict[str, int]:
+        """
+        Estimate the token usage of a call, as the Claude API would report it
+
+        Each cache marker of a layered prompt (after the system block and
+        after the per-user block) is a breakpoint: input up to the longest
+        breakpoint seen within PREFIX_CACHE_TTL is read from the cache, input
+        up to the last breakpoint after it is written to the cache.
+
+        Args:
+            prompt: Prompt text or layered prompt
+            response: Response text
+
+        Returns:
+            Token counts (input_tokens includes cached input)
+        """
+        segments = [(prompt, False)] if isinstance(prompt, str) else (
+            [(prompt["system"], True)] + [(block["text"], block["cache"]) for block in prompt["blocks"]]
+        )
+        now = time.monotonic()
+        prefix = hashlib.sha256()
+        input_tokens = cached = written = 0
+
+        for text, cache in segments:
+            input_tokens += _estimate_tokens(text)
+            prefix.update(text.encode("utf-8") + b"\0")
+
+            if not cache or input_tokens < PREFIX_CACHE_MIN_TOKENS:
+                continue
+
+            key = prefix.hexdigest()
+
+            if self._prefix_cache.get(key, 0) > now:
+                cached, written = input_tokens, 0
+            else:
+                written = input_tokens - cached
+
+            self._prefix_cache[key] = now + PREFIX_CACHE_TTL
+
+        return {
+            "input_tokens": input_tokens,
+            "cached_tokens": cached,
+            "cache_write_tokens": written,
+            "output_tokens": _estimate_tokens(response)
+        }
+
+    def respond(self, prompt: str) -> str:
+        """Build the response for a prompt (no delay, no errors)"""
+        if "Job listings (JSON array" in prompt:
+            return self._match_jobs(prompt)
+        if "expert resume parser" in prompt:
+            return self._parse_resume(prompt)
+        if "tailoring resumes for specific job applications" in prompt:
+            return self._customize_resume(prompt)
+        if "skills analysis for job matching" in prompt:
+            return self._extract_skills(prompt)
+        if "AI support assistant" in prompt:
+            return self._support(prompt)
+        if "career advisor" in prompt:
+            return self._application_tips(prompt)
+
+        return "This is a response from the local fake AI provider."
+
+    def _match_jobs(self, prompt: str) -> str:
+        resume = _json_after(prompt, "Candidate resume (JSON)") or {}
+        jobs = _json_after(prompt, "Job listings (JSON array") or []
+        resume_words = _words(resume.get("skills")) | _words(resume.get("experience"))
+        matches = []
+
+        for job in jobs:
+            if not isinstance(job, dict) or not job.get("id"):
+                continue
+
+            job_words = _words(job.get("title")) | _words(job.get("skills"))
+            common = sorted(resume_words & job_words)
+            overlap = len(common) / len(job_words) if job_words else 0.0
+            score = int(round(min(100, 35 + 55 * overlap + 10 * _stable_fraction(job["id"], resume))))
+
+            matches.append({
+                "job_id": str(job["id"]),
+                "score": score,
+                "reason": f"Shares {', '.join(common[:3])}." if common else "Few direct skill matches."
+            })
+
+        matches.sort(key=lambda match: match["score"], reverse=True)
+        return json.dumps(matches, separators=(",", ":"))
+
+    def _parse_resume(self, prompt: str) -> str:
+        text = _last_fenced(prompt)
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        email = _email_pattern.search(text)
+        phone = _phone_pattern.search(text)
+        skills = _find_skills(text)
+
+        return json.dumps({
+            "contact_info": {
+                "name": lines[0] if lines else "",
+                "email": email.group(0) if email else "",
+                "phone": phone.group(0).strip() if phone else "",
+                "location": "",
+                "linkedin": "",
+                "website": ""
+            },
+            "summary": lines[1] if len(lines) > 1 else "",
+            "skills": {
+                "technical": [skill for skill in skills if skill not in SOFT_SKILLS],
+                "soft": [skill for skill in skills if skill in SOFT_SKILLS],
+                "languages": [],
+                "tools": []
+            },
+            "work_experience": [],
+            "education": [],
+            "projects": [],
+            "certifications": []
+        }, indent=2)
+
+    def _customize_resume(self, prompt: str) -> str:
+        title = re.search(r"- Title: (.*)", prompt)
+        company = re.search(r"- Company: (.*)", prompt)
+        title = title.group(1).strip() if title else "the role"
+        company = company.group(1).strip() if company else "the company"
+
+        return (
+            "## CUSTOMIZATION NOTES\n"
+            f"- Reordered experience to lead with work most relevant to {title}.\n"
+            f"- Added keywords from the {company} job description.\n\n"
+            "# Candidate Name\n\n"
+            "## Summary\n"
+            f"Engineer with experience aligned to the {title} position at {company}.\n\n"
+            "## Experience\n- Delivered projects using the skills this role requires.\n\n"
+            "## Skills\n- Listed in order of relevance to the job.\n\n"
+            "## Education\n- As in the original resume.\n"
+        )
+
+    def _extract_skills(self, prompt: str) -> str:
+        skills = _find_skills(_last_fenced(prompt))
+
+        def entries(names: List[str]) -> List[Dict[str, str]]:
+            return [{"skill": name, "level": "Proficient", "evidence": "Mentioned in the resume"} for name in names]
+
+        return json.dumps({
+            "technical_skills": entries([skill for skill in skills if skill not in SOFT_SKILLS]),
+            "domain_knowledge": [],
+            "soft_skills": entries([skill for skill in skills if skill in SOFT_SKILLS]),
+            "tools_platforms": [],
+            "top_marketable_skills": [
+                {"skill": skill, "market_relevance": "In demand"} for skill in skills[:5]
+            ]
+        }, indent=2)
+
+    def _support(self, prompt: str) -> str:
+        message = prompt.split("User Message:", 1)[-1].lower()
+        needs_human = any(word in message for word in ("payment", "refund", "charged", "human"))
+
+        return (
+            "Thanks for reaching out! Here is what you can try:\n\n"
+            "1. Use /start to see the main menu.\n"
+            "2. Use /subscribe to manage your plan.\n\n"
+            f"NEEDS_HUMAN: {'true' if needs_human else 'false'}"
+        )
+
+    def _application_tips(self, prompt: str) -> str:
+        return (
+            "## Tailoring your resume\n- Lead with the skills the listing names first.\n\n"
+            "## Skills to emphasize\n- Your strongest overlapping technical skills.\n\n"
+            "## Likely interview questions\n- Walk us through a project you are proud of.\n\n"
+            "## Gaps to prepare for\n- Any required skill missing from your resume.\n"
+        )
+
+# Global provider instance
+_fake_provider = None
+
+def get_fake_provider() -> FakeLLMProvider:
+    """
+    Get the process-wide fake provider
+
+    Returns:
+        FakeLLMProvider instance
+    """
+    global _fake_provider
+
+    if _fake_provider is None:
+        _fake_provider = FakeLLMProvider()
+
+    return _fake_provider
@@ -0,0 +1,604 @@
+# ai/gateway.py
+import logging
+import asyncio
+import random
+import time
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from config.settings import (
+    CLAUDE_API_KEY,
+    OPENAI_API_KEY,
+    DEFAULT_AI_PROVIDER,
+    AI_MAX_CONCURRENCY,
+    AI_CLAUDE_RPM,
+    AI_OPENAI_RPM,
+    AI_RATE_LIMIT_BURST,
+    AI_REQUEST_TIMEOUT,
+    AI_REQUEST_DEADLINE,
+    AI_MAX_RETRIES,
+    AI_RETRY_BASE_DELAY,
+    AI_HEDGE_ENABLED,
+    AI_HEDGE_MIN_SAMPLES
+)
+from ai.prompts.layout import Prompt
+from ai.routing import get_model_router
+from utils.resilience import RedisTokenBucket, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("claude", "openai")
+# Local provider for load tests; never rate limited and never a fallback
+FAKE_PROVIDER = "fake"
+# Request timeouts, rate limiting, server errors and overload
+RETRYABLE_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+# Successful latencies kept per provider for the hedging percentile
+LATENCY_WINDOW = 200
+# Anthropic prompt cache breakpoint (five-minute TTL, refreshed on every hit)
+CACHE_CONTROL = {"type": "ephemeral"}
+
+class LLMGatewayError(Exception):
+    """Raised when a completion cannot be obtained within the deadline"""
+    pass
+
+def default_model(provider: str, task: Optional[str] = None) -> str:
+    """Get the model a task is routed to when its preferred tier is fast enough"""
+    return get_model_router().model_for(provider, task)
+
+def _claude_messages(prompt: Prompt) -> Dict[str, Any]:
+    """Messages API arguments, with a cache breakpoint after the system and per-user blocks"""
+    if isinstance(prompt, str):
+        return {"messages": [{"role": "user", "content": prompt}]}
+
+    content = [
+        {"type": "text", "text": block["text"], **({"cache_control": CACHE_CONTROL} if block["cache"] else {})}
+        for block in prompt["blocks"]
+    ]
+    return {
+        "system": [{"type": "text", "text": prompt["system"], "cache_control": CACHE_CONTROL}],
+        "messages": [{"role": "user", "content": content}]
+    }
+
+def _openai_messages(prompt: Prompt) -> List[Dict[str, str]]:
+    """Chat messages; OpenAI caches long prompt prefixes automatically, without markers"""
+    if isinstance(prompt, str):
+        return [{"role": "user", "content": prompt}]
+
+    return [
+        {"role": "system", "content": prompt["system"]},
+        {"role": "user", "content": "\n\n".join(block["text"] for block in prompt["blocks"])}
+    ]
+
+def _usage_counts(provider: str, usage: Any) -> Dict[str, int]:
+    """Normalize provider token usage (input_tokens counts cached and uncached input)"""
+    if usage is None:
+        return {}
+
+    if provider == "claude":
+        cached = getattr(usage, "cache_read_input_tokens", None) or 0
+        written = getattr(usage, "cache_creation_input_tokens", None) or 0
+        return {
+            "input_tokens": (usage.input_tokens or 0) + cached + written,
+            "cached_tokens": cached,
+            "cache_write_tokens": written,
+            "output_tokens": usage.output_tokens or 0
+        }
+
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "input_tokens": usage.prompt_tokens or 0,
+        "cached_tokens": getattr(details, "cached_tokens", None) or 0,
+        "cache_write_tokens": 0,
+        "output_tokens": usage.completion_tokens or 0
+    }
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+
+    import anthropic
+    import openai
+
+    if isinstance(error, (anthropic.APIConnectionError, openai.APIConnectionError)):
+        return True
+
+    return getattr(error, "status_code", None) in RETRYABLE_STATUSES
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    return parse_retry_after(headers.get("retry-after")) if headers is not None else None
+
+class LLMGateway:
+    """
+    Single entry point for LLM completions
+
+    Every request passes a per-process concurrency limit and a per-provider
+    token bucket shared through Redis, runs under a per-attempt timeout,
+    and is retried with full-jitter backoff within an overall deadline. Each
+    attempt goes to the model the router picks for the task, so attempts
+    late in a budget drop to a faster tier. If the primary provider fails,
+    the other one is tried; with hedging on, the other one is also started
+    once the primary is slower than its p95. Token usage, including input
+    served from the provider's prompt cache, is tallied per task.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, object] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.buckets = {
+            "claude": RedisTokenBucket("ai:ratelimit:claude", AI_CLAUDE_RPM / 60, AI_RATE_LIMIT_BURST),
+            "openai": RedisTokenBucket("ai:ratelimit:openai", AI_OPENAI_RPM / 60, AI_RATE_LIMIT_BURST)
+        }
+        self.latencies = {provider: deque(maxlen=LATENCY_WINDOW) for provider in PROVIDERS + (FAKE_PROVIDER,)}
+        self.stats = {"requests": 0, "retries": 0, "fallbacks": 0, "hedges": 0, "hedge_wins": 0}
+        self.usage: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "input_tokens": 0, "cached_tokens": 0, "cache_write_tokens": 0, "output_tokens": 0}
+        )
+
+    def _get_client(self, provider: str):
+        # Created on first use, so importing an agent needs no API key
+        if provider not in self._clients:
+            if provider == "claude":
+                from anthropic import AsyncAnthropic
+                self._clients[provider] = AsyncAnthropic(api_key=CLAUDE_API_KEY, max_retries=0)
+            else:
+                from openai import AsyncOpenAI
+                self._clients[provider] = AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+
+        return self._clients[provider]
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(AI_MAX_CONCURRENCY)
+            self._loop = loop
+
+        return self._semaphore
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        """p95 latency of the provider, or None until enough samples exist"""
+        latencies = self.latencies[provider]
+
+        if len(latencies) < AI_HEDGE_MIN_SAMPLES:
+            return None
+
+        ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def record_usage(self, task: Optional[str], counts: Dict[str, int]) -> None:
+        """Add one call's token usage to the totals of its task"""
+        if not counts:
+            return
+
+        totals = self.usage[task or "default"]
+        totals["calls"] += 1
+
+        for key, value in counts.items():
+            totals[key] += value
+
+        logger.debug(
+            f"{task or 'default'} call used {counts['input_tokens']} input tokens "
+            f"({counts['cached_tokens']} cached) and {counts['output_tokens']} output tokens"
+        )
+
+    def usage_report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Token usage per task
+
+        Returns:
+            Dictionary of task to token totals, with cached_ratio being the
+            share of input tokens served from the provider's prefix cache
+        """
+        return {
+            task: {
+                **totals,
+                "cached_ratio": round(totals["cached_tokens"] / totals["input_tokens"], 3) if totals["input_tokens"] else 0.0
+            }
+            for task, totals in self.usage.items()
+        }
+
+    def _fallback_provider(self, provider: str) -> Optional[str]:
+        if provider == FAKE_PROVIDER:
+            return None
+
+        fallback = "openai" if provider == "claude" else "claude"
+        return fallback if (OPENAI_API_KEY if fallback == "openai" else CLAUDE_API_KEY) else None
+
+    async def _request(
+        self,
+        provider: str,
+        model: str,
+        prompt: Prompt,
+        max_tokens: int,
+        task: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """One provider request; returns the text and whether it was cut off at max_tokens"""
+        if provider == FAKE_PROVIDER:
+            from ai.fake_provider import get_fake_provider
+            fake = get_fake_provider()
+            text = await fake.complete(prompt, max_tokens)
+            self.record_usage(task, fake.usage(prompt, text))
+            return {"text": text, "truncated": False}
+
+        client = self._get_client(provider)
+
+        if provider == "claude":
+            response = await client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                **_claude_messages(prompt)
+            )
+            self.record_usage(task, _usage_counts(provider, response.usage))
+            return {"text": response.content[0].text, "truncated": response.stop_reason == "max_tokens"}
+
+        response = await client.chat.completions.create(
+            model=model,
+            messages=_openai_messages(prompt),
+            max_tokens=max_tokens
+        )
+        self.record_usage(task, _usage_counts(provider, response.usage))
+        return {
+            "text": response.choices[0].message.content,
+            "truncated": response.choices[0].finish_reason == "length"
+        }
+
+    async def _stream_request(
+        self,
+        provider: str,
+        model: str,
+        prompt: Prompt,
+        max_tokens: int,
+        task: Optional[str] = None,
+        info: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Stream one provider request; sets info["truncated"] once the stream ends"""
+        info = info if info is not None else {}
+
+        if provider == FAKE_PROVIDER:
+            from ai.fake_provider import get_fake_provider
+            fake = get_fake_provider()
+            parts = []
+
+            async for text in fake.stream(prompt, max_tokens):
+                parts.append(text)
+                yield text
+
+            self.record_usage(task, fake.usage(prompt, "".join(parts)))
+            info["truncated"] = False
+            return
+
+        client = self._get_client(provider)
+
+        if provider == "claude":
+            async with client.messages.stream(
+                model=model,
+                max_tokens=max_tokens,
+                **_claude_messages(prompt)
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+
+                message = await stream.get_final_message()
+                self.record_usage(task, _usage_counts(provider, message.usage))
+                info["truncated"] = message.stop_reason == "max_tokens"
+            return
+
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=_openai_messages(prompt),
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+            if chunk.choices and chunk.choices[0].finish_reason:
+                info["truncated"] = chunk.choices[0].finish_reason == "length"
+
+            # The last chunk has no choices and carries the usage of the whole stream
+            if getattr(chunk, "usage", None):
+                self.record_usage(task, _usage_counts(provider, chunk.usage))
+
+    async def _call_with_retries(
+        self,
+        provider: str,
+        prompt: Prompt,
+        max_tokens: int,
+        deadline: float,
+        task: Optional[str] = None,
+        started_at: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Call one provider, retrying transient errors until the deadline"""
+        router = get_model_router()
+        started_at = started_at or time.monotonic()
+
+        for attempt in range(AI_MAX_RETRIES + 1):
+            remaining = deadline - time.monotonic()
+            bucket = self.buckets.get(provider)
+
+            if remaining <= 0 or (bucket and not await bucket.acquire(remaining)):
+                raise LLMGatewayError(f"{provider} request could not start before the deadline")
+
+            async with self._get_semaphore():
+                started = time.monotonic()
+                timeout = min(AI_REQUEST_TIMEOUT, deadline - started)
+                model = router.select(provider, task, started - started_at, deadline - started)
+
+                try:
+                    self.stats["requests"] += 1
+                    result = await asyncio.wait_for(self._request(provider, model, prompt, max_tokens, task), timeout=timeout)
+                    self.latencies[provider].append(time.monotonic() - started)
+                    router.record(provider, model, time.monotonic() - started, task)
+                    return {**result, "provider": provider, "model": model}
+
+                except Exception as e:
+                    if isinstance(e, asyncio.TimeoutError):
+                        router.record(provider, model, time.monotonic() - started, task)
+
+                    if attempt == AI_MAX_RETRIES or not _is_retryable(e):
+                        raise
+
+                    delay = _retry_after(e)
+                    if delay is None:
+                        delay = random.uniform(0, AI_RETRY_BASE_DELAY * 2 ** attempt)
+
+                    if time.monotonic() + delay >= deadline:
+                        raise
+
+                    logger.warning(f"Retrying {provider} request in {delay:.1f}s after: {str(e) or type(e).__name__}")
+
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+        raise LLMGatewayError(f"{provider} request failed")
+
+    async def complete(
+        self,
+        prompt: Prompt,
+        max_tokens: int = 2000,
+        provider: Optional[str] = None,
+        deadline_seconds: float = AI_REQUEST_DEADLINE,
+        task: Optional[str] = None,
+        info: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Get a completion, falling back to (or hedging with) the other provider
+
+        Args:
+            prompt: Prompt text or layered prompt (see ai/prompts/layout.py)
+            max_tokens: Maximum tokens to generate
+            provider: Primary provider (defaults to DEFAULT_AI_PROVIDER)
+            deadline_seconds: Time budget for all attempts and providers
+                (capped by the task's latency budget)
+            task: Task name used to route the request to a model tier
+            info: Optional dictionary that receives details of the answer:
+                the provider and model that produced it (which differ from
+                the preferred ones after a fallback or downgrade) and
+                whether it was truncated at max_tokens
+
+        Returns:
+            Response text
+
+        Raises:
+            Exception: The last provider error when no provider answered
+        """
+        result = await self._complete(prompt, max_tokens, provider, deadline_seconds, task)
+
+        if info is not None:
+            info.update({key: value for key, value in result.items() if key != "text"})
+
+        return result["text"]
+
+    async def _complete(
+        self,
+        prompt: Prompt,
+        max_tokens: int,
+        provider: Optional[str],
+        deadline_seconds: float,
+        task: Optional[str]
+    ) -> Dict[str, Any]:
+        provider = provider or DEFAULT_AI_PROVIDER
+        fallback = self._fallback_provider(provider)
+        max_tokens = get_model_router().max_tokens(task, max_tokens)
+        started_at = time.monotonic()
+        deadline = started_at + get_model_router().deadline(task, deadline_seconds)
+
+        primary = asyncio.ensure_future(
+            self._call_with_retries(provider, prompt, max_tokens, deadline, task, started_at)
+        )
+        hedge_delay = self.hedge_delay(provider) if AI_HEDGE_ENABLED and fallback else None
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+
+            if not done:
+                # Primary is slower than its p95: race it against the fallback provider
+                self.stats["hedges"] += 1
+                hedge = asyncio.ensure_future(
+                    self._call_with_retries(fallback, prompt, max_tokens, deadline, task, started_at)
+                )
+                return await self._first_success(primary, hedge)
+
+            try:
+                return primary.result()
+            except Exception as e:
+                if not fallback:
+                    raise
+
+                logger.error(f"Error getting {provider} response: {str(e)}")
+                logger.info(f"Falling back to {fallback}")
+                self.stats["fallbacks"] += 1
+                return await self._call_with_retries(fallback, prompt, max_tokens, deadline, task, started_at)
+
+        finally:
+            if not primary.done():
+                primary.cancel()
+
+    async def _stream_with_retries(
+        self,
+        provider: str,
+        prompt: Prompt,
+        max_tokens: int,
+        deadline: float,
+        task: Optional[str] = None,
+        started_at: Optional[float] = None,
+        info: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Stream from one provider, retrying transient errors that occur before any output"""
+        router = get_model_router()
+        started_at = started_at or time.monotonic()
+
+        for attempt in range(AI_MAX_RETRIES + 1):
+            remaining = deadline - time.monotonic()
+            bucket = self.buckets.get(provider)
+
+            if remaining <= 0 or (bucket and not await bucket.acquire(remaining)):
+                raise LLMGatewayError(f"{provider} request could not start before the deadline")
+
+            emitted = False
+
+            async with self._get_semaphore():
+                started = time.monotonic()
+                timeout_at = started + min(AI_REQUEST_TIMEOUT, deadline - started)
+                model = router.select(provider, task, started - started_at, deadline - started)
+                chunks = self._stream_request(provider, model, prompt, max_tokens, task, info)
+
+                if info is not None:
+                    info.update({"provider": provider, "model": model})
+
+                try:
+                    self.stats["requests"] += 1
+
+                    while True:
+                        try:
+                            text = await asyncio.wait_for(chunks.__anext__(), timeout=max(0, timeout_at - time.monotonic()))
+                        except StopAsyncIteration:
+                            router.record(provider, model, time.monotonic() - started, task)
+                            return
+
+                        emitted = True
+                        yield text
+
+                except Exception as e:
+                    if isinstance(e, asyncio.TimeoutError):
+                        router.record(provider, model, time.monotonic() - started, task)
+
+                    # Output already handed to the caller cannot be taken back
+                    if emitted or attempt == AI_MAX_RETRIES or not _is_retryable(e):
+                        raise
+
+                    delay = _retry_after(e)
+                    if delay is None:
+                        delay = random.uniform(0, AI_RETRY_BASE_DELAY * 2 ** attempt)
+
+                    if time.monotonic() + delay >= deadline:
+                        raise
+
+                    logger.warning(f"Retrying {provider} stream in {delay:.1f}s after: {str(e) or type(e).__name__}")
+
+                finally:
+                    await chunks.aclose()
+
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+        raise LLMGatewayError(f"{provider} request failed")
+
+    async def stream(
+        self,
+        prompt: Prompt,
+        max_tokens: int = 2000,
+        provider: Optional[str] = None,
+        deadline_seconds: float = AI_REQUEST_DEADLINE,
+        task: Optional[str] = None,
+        info: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion as text chunks
+
+        Retries and the fallback provider apply until the first chunk
+        arrives; later errors propagate to the caller. Streams are not
+        hedged.
+
+        Args:
+            prompt: Prompt text or layered prompt (see ai/prompts/layout.py)
+            max_tokens: Maximum tokens to generate
+            provider: Primary provider (defaults to DEFAULT_AI_PROVIDER)
+            deadline_seconds: Time budget for all attempts and providers
+                (capped by the task's latency budget)
+            task: Task name used to route the request to a model tier
+            info: Optional dictionary that receives details of the answer
+                (see complete); "truncated" is set once the stream ends
+
+        Yields:
+            Response text chunks
+        """
+        provider = provider or DEFAULT_AI_PROVIDER
+        fallback = self._fallback_provider(provider)
+        max_tokens = get_model_router().max_tokens(task, max_tokens)
+        started_at = time.monotonic()
+        deadline = started_at + get_model_router().deadline(task, deadline_seconds)
+        emitted = False
+
+        try:
+            async for text in self._stream_with_retries(provider, prompt, max_tokens, deadline, task, started_at, info):
+                emitted = True
+                yield text
+            return
+
+        except Exception as e:
+            if emitted or not fallback:
+                raise
+
+            logger.error(f"Error streaming {provider} response: {str(e)}")
+            logger.info(f"Falling back to {fallback}")
+            self.stats["fallbacks"] += 1
+
+        async for text in self._stream_with_retries(fallback, prompt, max_tokens, deadline, task, started_at, info):
+            yield text
+
+    async def _first_success(self, primary: asyncio.Future, hedge: asyncio.Future) -> Dict[str, Any]:
+        """Return the first successful result and cancel the other request"""
+        pending = {primary, hedge}
+        error = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+
+                    if task is primary or error is None:
+                        error = task.exception()
+
+            raise error
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+# Global gateway instance
+_llm_gateway = None
+
+def get_llm_gateway() -> LLMGateway:
+    """
+    Get the process-wide LLM gateway
+
+    Returns:
+        LLMGateway instance
+    """
+    global _llm_gateway
+
+    if _llm_gateway is None:
+        _llm_gateway = LLMGateway()
+
+    return _llm_gateway
@@ -0,0 +1,47 @@
+# ai/prompts/layout.py
+
+"""
+Layered prompt layout for provider-side prefix caching.
+
+Providers reuse the work done on a prompt prefix they have seen recently,
+so prompts are ordered from most to least stable: static system
+instructions shared by every call of a task, then a per-user block (the
+resume) shared by that user's calls, then the data of this call (jobs,
+messages). The system and per-user blocks carry cache markers.
+"""
+
+import textwrap
+from typing import Any, Dict, Optional, Union
+
+# A prompt is either plain text or {"system": str, "blocks": [{"text": str, "cache": bool}]}
+Prompt = Union[str, Dict[str, Any]]
+
+def _clean(text: str) -> str:
+    return textwrap.dedent(text).strip()
+
+def build_prompt(system: str, user_block: Optional[str] = None, call_block: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build a layered prompt
+
+    Args:
+        system: Static instructions and output format of the task
+        user_block: Per-user data reused across calls (cached)
+        call_block: Data specific to this call (not cached)
+
+    Returns:
+        Layered prompt dictionary
+    """
+    blocks = []
+
+    if user_block:
+        blocks.append({"text": _clean(user_block), "cache": True})
+    if call_block:
+        blocks.append({"text": _clean(call_block), "cache": False})
+
+    return {"system": _clean(system), "blocks": blocks}
+
+def prompt_text(prompt: Prompt) -> str:
+    """Flatten a prompt into one text (for cache keys, token counts and the fake provider)"""
+    if isinstance(prompt, str):
+        return prompt
+    return "\n\n".join([prompt["system"]] + [block["text"] for block in prompt["blocks"]])
@@ -2,16 +2,14 @@
 
 """
 This module contains prompt templates for AI resume processing.
-"""
 
-# Prompt for parsing resume text into structured data
-RESUME_PARSING_PROMPT = """
-You are an expert resume parser. Your task is to extract structured information from the provided resume text.
+Each task has a static system prompt followed by data blocks, most stable
+first, so providers can cache the shared prefix (see ai/prompts/layout.py).
+"""
 
-Resume text:
-```
-{resume_text}
-```
+# Prompt for parsing resume text into structured data (the resume text follows in RESUME_TEXT_BLOCK)
+RESUME_PARSING_SYSTEM_PROMPT = """
+You are an expert resume parser. Your task is to extract structured information from the resume text provided by the user.
 
 Extract the following information and return it in the specified JSON format:
 
@@ -131,23 +129,16 @@ Important guidelines:
 5. Extract as much detail as possible while maintaining accuracy.
 """
 
-# Prompt for customizing resume for a specific job
-RESUME_CUSTOMIZATION_PROMPT = """
-You are an expert resume writer specializing in tailoring resumes for specific job applications. Your task is to create a customized resume for a job applicant based on their original resume and the details of the job they're applying for.
-
-JOB DETAILS:
-- Title: {job_title}
-- Company: {company}
-- Required Skills: {required_skills}
-- Job Description:
+RESUME_TEXT_BLOCK = """
+Resume text:
 ```
-{job_description}
+{resume_text}
 ```
+"""
 
-APPLICANT'S RESUME DATA:
-```
-{resume_data}
-```
+# Prompt for customizing resume for a specific job (followed by RESUME_DATA_BLOCK and JOB_DETAILS_BLOCK)
+RESUME_CUSTOMIZATION_SYSTEM_PROMPT = """
+You are an expert resume writer specializing in tailoring resumes for specific job applications. Your task is to create a customized resume for a job applicant based on their original resume and the details of the job they're applying for, both provided by the user.
 
 Your task is to:
 
@@ -167,14 +158,29 @@ RETURN GUIDELINES:
 Remember that the goal is to present the applicant as an ideal candidate for this specific position while remaining truthful and authentic to their actual experience.
 """
 
-# Prompt for extracting skills from resume data
-RESUME_SKILLS_EXTRACTION_PROMPT = """
-You are an expert in skills analysis for job matching. Your task is to extract and categorize skills from a resume, then organize them based on relevance and expertise level.
-
-RESUME DATA:
+# Per-user block shared by the prompts that work on a parsed resume
+RESUME_DATA_BLOCK = """
+APPLICANT'S RESUME DATA:
 ```
 {resume_data}
 ```
+"""
+
+# Per-job block, placed after the resume so the resume prefix can be cached
+JOB_DETAILS_BLOCK = """
+JOB DETAILS:
+- Title: {job_title}
+- Company: {company}
+- Required Skills: {required_skills}
+- Job Description:
+```
+{job_description}
+```
+"""
+
+# Prompt for extracting skills from resume data (followed by RESUME_DATA_BLOCK)
+RESUME_SKILLS_EXTRACTION_SYSTEM_PROMPT = """
+You are an expert in skills analysis for job matching. Your task is to extract and categorize skills from the resume provided by the user, then organize them based on relevance and expertise level.
 
 Your task is to:
 
@@ -218,23 +224,9 @@ Return the results in the following JSON format:
 Make sure to be thorough in extracting skills, including those that may be implied but not explicitly stated. Base your assessment on concrete evidence from the resume.
 """
 
-# Prompt for generating interview questions based on resume and job
-INTERVIEW_PREP_PROMPT = """
-You are an expert career coach helping a job candidate prepare for an interview. Based on their resume and the job they're applying for, generate tailored interview preparation materials.
-
-JOB DETAILS:
-- Title: {job_title}
-- Company: {company}
-- Required Skills: {required_skills}
-- Job Description:
-```
-{job_description}
-```
-
-CANDIDATE'S RESUME:
-```
-{resume_data}
-```
+# Prompt for generating interview questions based on resume and job (followed by RESUME_DATA_BLOCK and JOB_DETAILS_BLOCK)
+INTERVIEW_PREP_SYSTEM_PROMPT = """
+You are an expert career coach helping a job candidate prepare for an interview. Based on their resume and the job they're applying for, both provided by the user, generate tailored interview preparation materials.
 
 Please provide the following interview preparation materials:
 
@@ -258,51 +250,3 @@ Please provide the following interview preparation materials:
 
 Format your response in a clear, organized manner using Markdown formatting. Make the preparation materials practical and actionable, ready for the candidate to use in their interview preparation.
 """
-
-# Prompt for job matching between resume and job listings
-JOB_MATCHING_PROMPT = """
-You are an AI assistant specializing in matching job candidates with suitable job opportunities. Your task is to analyze a candidate's resume and a set of job listings to determine the most suitable matches.
-
-CANDIDATE'S RESUME:
-```
-{resume_data}
-```
-
-JOB LISTINGS:
-```
-{job_listings}
-```
-
-For each job listing, evaluate the match based on the following criteria:
-1. Skills match: How well do the candidate's technical and soft skills align with the job requirements?
-2. Experience match: Does the candidate have relevant experience in terms of roles, responsibilities, and industry?
-3. Education match: Does the candidate meet the educational requirements?
-4. Location compatibility: Is the job location compatible with the candidate's current location?
-5. Career trajectory: Is this job a logical next step in the candidate's career path?
-
-For each job, provide:
-1. A match score from 0-100%
-2. A brief explanation of why this score was given
-3. Key strengths that make the candidate suitable
-4. Any potential gaps or areas of concern
-5. Suggestions for how the candidate could position themselves for this role
-
-Return your analysis in the following JSON format:
-
-```json
-[
-  {
-    "job_id": "job1",
-    "job_title": "Software Engineer",
-    "company": "TechCorp",
-    "match_score": 85,
-    "reasoning": "Strong technical skills match with 3+ years of relevant experience",
-    "strengths": ["Python expertise", "Cloud computing experience", "Relevant industry background"],
-    "gaps": ["No experience with specific framework mentioned in requirements"],
-    "recommendations": ["Emphasize previous work with similar frameworks", "Highlight adaptability and fast learning"]
-  }
-]
-```
-
-Rank the jobs from highest to lowest match score. Be objective and thorough in your assessment, focusing on concrete evidence from both the resume and job listings.
-"""
\ No newline at end of file
@@ -0,0 +1,161 @@
+# ai/routing.py
+import logging
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+
+from config.settings import (
+    CLAUDE_MODEL,
+    CLAUDE_MODEL_BALANCED,
+    CLAUDE_MODEL_FAST,
+    OPENAI_MODEL,
+    OPENAI_MODEL_BALANCED,
+    OPENAI_MODEL_FAST,
+    AI_ROUTING_ENABLED
+)
+
+logger = logging.getLogger(__name__)
+
+# Model tiers, slowest and most capable first
+TIERS = ("best", "balanced", "fast")
+
+TIER_MODELS = {
+    "claude": {"best": CLAUDE_MODEL, "balanced": CLAUDE_MODEL_BALANCED, "fast": CLAUDE_MODEL_FAST},
+    "openai": {"best": OPENAI_MODEL, "balanced": OPENAI_MODEL_BALANCED, "fast": OPENAI_MODEL_FAST},
+    "fake": {"best": "fake", "balanced": "fake", "fast": "fake"}
+}
+
+# Preferred tier, latency budget (seconds, a hard cap on the request
+# deadline) and output token cap per task
+TASK_ROUTES = {
+    "match": {"tier": "balanced", "latency_budget": 30, "max_tokens": 4000},
+    "parse": {"tier": "balanced", "latency_budget": 45, "max_tokens": 3000},
+    "skills": {"tier": "balanced", "latency_budget": 45, "max_tokens": 2000},
+    "customize": {"tier": "best", "latency_budget": 120, "max_tokens": 4000},
+    "tips": {"tier": "fast", "latency_budget": 20, "max_tokens": 1500},
+    "support": {"tier": "fast", "latency_budget": 10, "max_tokens": 800}
+}
+DEFAULT_ROUTE = {"tier": "best", "latency_budget": 180, "max_tokens": 4000}
+
+# Latencies kept per model and task for the p95 estimate
+LATENCY_WINDOW = 200
+# Samples needed before a model's p95 is trusted
+MIN_LATENCY_SAMPLES = 10
+# Seconds after which a latency sample is forgotten, so a skipped tier
+# gets retried (and re-measured) once its slow samples have expired
+LATENCY_MAX_AGE = 600
+
+class ModelRouter:
+    """
+    Maps each AI task to a model tier, dropping to a faster tier when the
+    preferred one would not answer in time
+
+    A tier is used if its observed p95 latency fits in what is left of
+    both the task's latency budget and the request deadline; otherwise the
+    next faster tier is tried, down to the fastest. Timed-out attempts
+    count as samples, so a tier that stops answering is skipped on retry.
+    The budget also caps the request deadline, so no attempt (or retry)
+    outlives it.
+
+    Latencies are kept per task, since output lengths (and so latencies)
+    differ widely between tasks on the same model, and expire after
+    LATENCY_MAX_AGE: a skipped tier gets no new samples, so without
+    expiry it would never be chosen again.
+    """
+
+    def __init__(self, enabled: bool = AI_ROUTING_ENABLED, clock: Callable[[], float] = time.monotonic):
+        self.enabled = enabled
+        self.clock = clock
+        self.latencies: Dict[Tuple[str, str, str], deque] = {}
+        self.stats = {"routed": 0, "downgrades": 0}
+
+    def route(self, task: Optional[str]) -> Dict[str, object]:
+        """Routing entry of a task (the best tier without a budget when routing is off)"""
+        if not self.enabled:
+            return DEFAULT_ROUTE
+        return TASK_ROUTES.get(task, DEFAULT_ROUTE)
+
+    def model_for(self, provider: str, task: Optional[str] = None) -> str:
+        """Preferred model of a task (used as the cache identity of its responses)"""
+        return TIER_MODELS[provider][self.route(task)["tier"]]
+
+    def max_tokens(self, task: Optional[str], requested: int) -> int:
+        return min(requested, self.route(task)["max_tokens"])
+
+    def deadline(self, task: Optional[str], requested: float) -> float:
+        """Seconds a request of the task may take in total (its latency budget at most)"""
+        return min(requested, self.route(task)["latency_budget"])
+
+    def record(self, provider: str, model: str, seconds: float, task: Optional[str] = None) -> None:
+        """Record how long a task's request to a model took (or ran before timing out)"""
+        key = (provider, model, task or "default")
+        self.latencies.setdefault(key, deque(maxlen=LATENCY_WINDOW)).append((self.clock(), seconds))
+
+    def p95(self, provider: str, model: str, task: Optional[str] = None) -> Optional[float]:
+        latencies = self.latencies.get((provider, model, task or "default"))
+
+        if not latencies:
+            return None
+
+        # Samples are appended in time order, so expired ones are at the left
+        cutoff = self.clock() - LATENCY_MAX_AGE
+        while latencies and latencies[0][0] < cutoff:
+            latencies.popleft()
+
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            return None
+
+        ordered = sorted(seconds for _, seconds in latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def select(self, provider: str, task: Optional[str], elapsed: float, remaining: float) -> str:
+        """
+        Choose the model for the next attempt
+
+        Args:
+            provider: AI provider
+            task: Task name (match, parse, skills, customize, tips, support)
+            elapsed: Seconds already spent on this request
+            remaining: Seconds left before the request deadline
+
+        Returns:
+            Model name
+        """
+        route = self.route(task)
+        models = TIER_MODELS[provider]
+
+        if not self.enabled:
+            return models[route["tier"]]
+
+        allowed = min(remaining, route["latency_budget"] - elapsed)
+        candidates = TIERS[TIERS.index(route["tier"]):]
+        self.stats["routed"] += 1
+
+        for tier in candidates:
+            p95 = self.p95(provider, models[tier], task)
+
+            if p95 is None or p95 <= allowed:
+                break
+
+        if tier != route["tier"]:
+            self.stats["downgrades"] += 1
+            logger.info(f"Routing {task or 'request'} to the {tier} {provider} tier ({allowed:.1f}s left)")
+
+        return models[tier]
+
+# Global router instance
+_model_router = None
+
+def get_model_router() -> ModelRouter:
+    """
+    Get the process-wide model router
+
+    Returns:
+        ModelRouter instance
+    """
+    global _model_router
+
+    if _model_router is None:
+        _model_router = ModelRouter()
+
+    return _model_router
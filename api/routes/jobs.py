@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Optional
 
 from utils.auth import get_admin_user
-from services.job_service import fetch_jobs
+from services.job_service import get_cached_jobs
+from services.job_listing_service import query_job_listings, search_job_listings, is_local_data_fresh
 
 # Create router
 router = APIRouter()
@@ -16,21 +17,67 @@ async def get_jobs(
     title: Optional[str] = None,
     company: Optional[str] = None,
     experience: Optional[str] = None,
-    job_type: Optional[str] = None
+    job_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    order: str = "desc"
 ):
     """
-    Get jobs from API
+    Get jobs from the local job listings table
+    
+    Falls back to the upstream Jobs API (through the query cache) only when
+    the local data is stale. Pass the returned next_cursor to get the next page.
     """
-    jobs = await fetch_jobs(
-        limit=limit,
-        location=location,
-        title=title,
-        company=company,
-        experience=experience,
-        job_type=job_type
-    )
+    if order not in ("asc", "desc"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="order must be 'asc' or 'desc'"
+        )
+    
+    filters = {
+        "location": location,
+        "title": title,
+        "company": company,
+        "experience": experience,
+        "job_type": job_type
+    }
+    
+    if await is_local_data_fresh():
+        try:
+            jobs, next_cursor = await query_job_listings(
+                limit=limit,
+                cursor=cursor,
+                order=order,
+                **filters
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
+        return {"jobs": jobs, "next_cursor": next_cursor, "source": "local"}
+    
+    jobs = await get_cached_jobs(limit=limit, **filters)
+    
+    return {"jobs": jobs, "next_cursor": None, "source": "upstream"}
+
+@router.get("/search")
+async def search_jobs(
+    q: str,
+    limit: int = 10,
+    offset: int = 0
+):
+    """
+    Full-text search over local job listings (title, company, skills, description)
+    
+    The last word is matched as a prefix, so partial queries work as you type.
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must not be empty"
+        )
+    
+    jobs = await search_job_listings(q, limit=limit, offset=offset)
     
-    return jobs
+    return {"jobs": jobs, "query": q}
 
 @router.get("/saved/{user_id}")
 async def get_saved_jobs(
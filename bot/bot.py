@@ -40,7 +40,12 @@ def set_bot_instance(bot):
 
 class TelegramBot:
     def __init__(self):
-        self.application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+        self.application = (
+            Application.builder()
+            .token(TELEGRAM_BOT_TOKEN)
+            .post_shutdown(self._post_shutdown)
+            .build()
+        )
         
         # Set global bot instance
         set_bot_instance(self.application.bot)
@@ -125,10 +130,12 @@ class TelegramBot:
             resume_request_callback,
             view_jobs_callback
         )
+        from bot.handlers.jobs import search_command, save_job_callback, not_interested_callback
         
         # Command handlers
         self.application.add_handler(CommandHandler("start", start_command))
         self.application.add_handler(CommandHandler("help", self._help_command))
+        self.application.add_handler(CommandHandler("search", search_command))
         
         # Callback query handlers - menu navigation
         self.application.add_handler(CallbackQueryHandler(back_to_main_callback, pattern="^back_to_main$"))
@@ -155,6 +162,10 @@ class TelegramBot:
         self.application.add_handler(CallbackQueryHandler(view_jobs_callback, pattern="^view_jobs$"))
         self.application.add_handler(CallbackQueryHandler(view_jobs_callback, pattern="^load_more_jobs$"))
         
+        # Job card feedback handlers
+        self.application.add_handler(CallbackQueryHandler(save_job_callback, pattern="^save_job_"))
+        self.application.add_handler(CallbackQueryHandler(not_interested_callback, pattern="^not_interested_"))
+        
         # Document handler for resume uploads
         self.application.add_handler(MessageHandler(filters.ATTACHMENT, resume_upload_handler))
         
@@ -172,7 +183,8 @@ class TelegramBot:
             "🤖 *Job Updates Bot Help*\n\n"
             "Here are the commands you can use:\n"
             "/start - Start the bot and see main menu\n"
-            "/help - Show this help message\n\n"
+            "/help - Show this help message\n"
+            "/search <keywords> - Search job listings\n\n"
             "You can also use the buttons in the main menu to:\n"
             "• Subscribe to job updates\n"
             "• Upload your resume\n"
@@ -215,6 +227,12 @@ class TelegramBot:
                 "Sorry, something went wrong processing your request. Please try again later."
             )
     
+    async def _post_shutdown(self, application):
+        """Close shared HTTP clients when the bot stops"""
+        from utils.jobs_api import close_jobs_api_client
+        
+        await close_jobs_api_client()
+    
     def run(self):
         logger.info("Starting Telegram bot")
         self.application.run_polling()
\ No newline at end of file
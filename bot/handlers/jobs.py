@@ -0,0 +1,127 @@
+# bot/handlers/jobs.py
+import logging
+from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
+from telegram.ext import ContextTypes
+
+from bot.handlers.resume import check_subscription_in_db
+from services.job_service import format_job_for_telegram, save_job_for_user
+from services.job_listing_service import search_job_listings
+from services.job_match_service import record_match_feedback, FEEDBACK_SAVED, FEEDBACK_NOT_INTERESTED
+
+logger = logging.getLogger(__name__)
+
+SEARCH_RESULTS_LIMIT = 5
+
+async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle the /search command: /search <keywords>"""
+    telegram_id = update.effective_user.id
+    is_subscribed, user_id = await check_subscription_in_db(telegram_id)
+
+    # Save user_id in context
+    if user_id:
+        context.user_data["db_user_id"] = user_id
+
+    if not is_subscribed:
+        await update.message.reply_text(
+            "You need an active subscription to search jobs. Please subscribe to a plan first.",
+            reply_markup=InlineKeyboardMarkup([
+                [InlineKeyboardButton("💼 Subscription Plans", callback_data="subscription")]
+            ])
+        )
+        return
+
+    search_text = " ".join(context.args or []).strip()
+
+    if not search_text:
+        await update.message.reply_text(
+            "Please add keywords after the command, for example:\n/search python developer bangalore"
+        )
+        return
+
+    try:
+        jobs = await search_job_listings(search_text, limit=SEARCH_RESULTS_LIMIT)
+
+    except Exception as e:
+        logger.error(f"Error searching jobs for user {user_id}: {str(e)}")
+        await update.message.reply_text("❌ Job search is unavailable right now. Please try again later.")
+        return
+
+    if not jobs:
+        await update.message.reply_text(
+            f"No jobs found for \"{search_text}\". Try different or fewer keywords."
+        )
+        return
+
+    await update.message.reply_text(f"🔍 Top {len(jobs)} jobs for \"{search_text}\":")
+
+    for job in jobs:
+        job_text = await format_job_for_telegram(job)
+
+        keyboard = InlineKeyboardMarkup([
+            [InlineKeyboardButton("✨ Customize Resume", callback_data=f"resume_request_{job.get('id')}")],
+            [
+                InlineKeyboardButton("💾 Save Job", callback_data=f"save_job_{job.get('id')}"),
+                InlineKeyboardButton("👎 Not Interested", callback_data=f"not_interested_{job.get('id')}")
+            ]
+        ])
+
+        await update.message.reply_text(
+            job_text,
+            parse_mode="Markdown",
+            reply_markup=keyboard,
+            disable_web_page_preview=True
+        )
+
+async def _get_db_user_id(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Get the database user ID of the sender, cached in context"""
+    user_id = context.user_data.get("db_user_id")
+
+    if not user_id:
+        _, user_id = await check_subscription_in_db(update.effective_user.id)
+        if user_id:
+            context.user_data["db_user_id"] = user_id
+
+    return user_id
+
+async def save_job_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle the Save Job button: save the job and record the feedback"""
+    query = update.callback_query
+    job_id = query.data[len("save_job_"):]
+    user_id = await _get_db_user_id(update, context)
+
+    if not user_id or not job_id:
+        await query.answer("Please start the bot with /start first.")
+        return
+
+    try:
+        saved = await save_job_for_user(user_id, job_id)
+        await record_match_feedback(user_id, job_id, FEEDBACK_SAVED)
+
+    except Exception as e:
+        logger.error(f"Error saving job {job_id} for user {user_id}: {str(e)}")
+        saved = False
+
+    await query.answer("💾 Job saved." if saved else "❌ Could not save this job. Please try again later.")
+
+async def not_interested_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle the Not Interested button: record the feedback and hide the job's buttons"""
+    query = update.callback_query
+    job_id = query.data[len("not_interested_"):]
+    user_id = await _get_db_user_id(update, context)
+
+    if not user_id or not job_id:
+        await query.answer("Please start the bot with /start first.")
+        return
+
+    try:
+        await record_match_feedback(user_id, job_id, FEEDBACK_NOT_INTERESTED)
+
+    except Exception as e:
+        logger.error(f"Error recording feedback on job {job_id} for user {user_id}: {str(e)}")
+
+    await query.answer("👍 Thanks, we'll show you fewer jobs like this.")
+
+    try:
+        await query.edit_message_reply_markup(reply_markup=None)
+    except Exception as e:
+        logger.debug(f"Could not remove job buttons: {str(e)}")
@@ -332,6 +332,8 @@ from models.user import User
 from models.subscription import Subscription
 from sqlalchemy.future import select
 from datetime import datetime
+from services.job_vector_service import embed_resume
+from services.job_push_service import index_user_terms
 
 logger = logging.getLogger(__name__)
 
@@ -515,6 +517,9 @@ async def resume_upload_handler(update: Update, context: ContextTypes.DEFAULT_TY
 async def update_user_resume_status(user_id, has_resume, resume_data=None):
     """Update user's resume status in the database"""
     try:
+        # Embed once at upload, outside the transaction
+        resume_embedding = await embed_resume(resume_data)
+        
         async with get_db() as db:
             # Get user
             result = await db.execute(
@@ -531,6 +536,9 @@ async def update_user_resume_status(user_id, has_resume, resume_data=None):
             
             if resume_data:
                 user.resume_data = resume_data
+                user.resume_embedding = resume_embedding
+                # Keep the term index current so new jobs are pushed to this resume
+                await index_user_terms(db, user.id, resume_data)
             
             await db.commit()
             logger.info(f"Updated resume status for user {user_id}")
@@ -46,6 +46,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Shutdown hook
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close shared HTTP clients"""
+    from utils.jobs_api import close_jobs_api_client
+    
+    await close_jobs_api_client()
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -138,6 +138,18 @@ app.conf.imports = [
 #         'task': 'tasks.job_updates.send_job_updates',
 #         'schedule': crontab(hour=JOB_UPDATE_EVENING_HOUR, minute=0),
 #     },
+#     'purge-expired-job-listings': {
+#         'task': 'tasks.maintenance.purge_expired_job_listings',
+#         'schedule': crontab(hour=4, minute=0),  # Daily at 4 AM
+#     },
+#     'purge-stale-job-matches': {
+#         'task': 'tasks.maintenance.purge_stale_job_matches',
+#         'schedule': crontab(hour=4, minute=15),  # Daily at 4:15 AM
+#     },
+#     'train-job-reranker': {
+#         'task': 'tasks.maintenance.train_job_reranker',
+#         'schedule': crontab(hour=5, minute=0),  # Daily at 5 AM, after the purges (feedback rows are kept)
+#     },
 # }
 
 # Other Celery configurations
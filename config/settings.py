@@ -54,10 +54,105 @@ CLAUDE_API_KEY = os.getenv("CLAUDE_API_KEY")
 DEFAULT_AI_PROVIDER = os.getenv("DEFAULT_AI_PROVIDER", "claude")
 CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "claude-3-opus-20240229")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+# Faster, cheaper model tiers used by the task router (CLAUDE_MODEL / OPENAI_MODEL are the "best" tier)
+CLAUDE_MODEL_BALANCED = os.getenv("CLAUDE_MODEL_BALANCED", "claude-3-5-sonnet-20240620")
+CLAUDE_MODEL_FAST = os.getenv("CLAUDE_MODEL_FAST", "claude-3-haiku-20240307")
+OPENAI_MODEL_BALANCED = os.getenv("OPENAI_MODEL_BALANCED", "gpt-4o")
+OPENAI_MODEL_FAST = os.getenv("OPENAI_MODEL_FAST", "gpt-4o-mini")
+AI_ROUTING_ENABLED = os.getenv("AI_ROUTING_ENABLED", "True").lower() == "true"  # route tasks to model tiers; off uses the best tier everywhere
+
+# AI gateway settings
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "8"))  # concurrent LLM requests per process
+AI_CLAUDE_RPM = float(os.getenv("AI_CLAUDE_RPM", "50"))  # requests per minute, shared by all workers
+AI_OPENAI_RPM = float(os.getenv("AI_OPENAI_RPM", "500"))  # requests per minute, shared by all workers
+AI_RATE_LIMIT_BURST = float(os.getenv("AI_RATE_LIMIT_BURST", "5"))  # requests allowed back to back
+AI_REQUEST_TIMEOUT = float(os.getenv("AI_REQUEST_TIMEOUT", "90"))  # seconds per attempt
+AI_REQUEST_DEADLINE = float(os.getenv("AI_REQUEST_DEADLINE", "180"))  # seconds for all attempts, waits included
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "2"))
+AI_RETRY_BASE_DELAY = float(os.getenv("AI_RETRY_BASE_DELAY", "1"))  # seconds; full jitter, doubled per attempt
+AI_HEDGE_ENABLED = os.getenv("AI_HEDGE_ENABLED", "False").lower() == "true"  # fire the fallback provider at the primary's p95
+AI_HEDGE_MIN_SAMPLES = int(os.getenv("AI_HEDGE_MIN_SAMPLES", "20"))  # latencies observed before hedging starts
+
+# Fake AI provider settings (DEFAULT_AI_PROVIDER=fake, for load tests and benchmarks)
+AI_FAKE_LATENCY_MEDIAN = float(os.getenv("AI_FAKE_LATENCY_MEDIAN", "1.5"))  # seconds; 0 disables the delay
+AI_FAKE_LATENCY_SIGMA = float(os.getenv("AI_FAKE_LATENCY_SIGMA", "0.5"))  # log-normal spread of the latency
+AI_FAKE_ERROR_RATE = float(os.getenv("AI_FAKE_ERROR_RATE", "0"))  # share of calls failing with 429/500/529
+AI_FAKE_SEED = int(os.getenv("AI_FAKE_SEED")) if os.getenv("AI_FAKE_SEED") else None  # fixes latencies and errors
+
+# AI response cache settings
+AI_CACHE_BACKEND = os.getenv("AI_CACHE_BACKEND", "redis")  # redis, sqlite, memory or none
+AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", "604800"))  # seconds a cached response is reused (7 days)
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "20000"))  # least recently used entries are evicted beyond this
+AI_CACHE_SQLITE_PATH = os.getenv("AI_CACHE_SQLITE_PATH", str(BASE_DIR / "ai_cache.sqlite3"))
+AI_CACHE_AGENTS = [
+    agent.strip() for agent in os.getenv("AI_CACHE_AGENTS", "job_matching,resume").split(",") if agent.strip()
+]  # agents whose responses are cached (job_matching, resume, support)
 
 # Jobs API settings
 JOBS_API_KEY = os.getenv("JOBS_API_KEY", "sk-live-P8FmXB3gKD0MQpPw9AsMfmkCnj8iqPlCyKmWF1Ok")
 JOBS_API_BASE_URL = os.getenv("JOBS_API_BASE_URL", "https://jobs.indianapi.in")
+JOBS_API_CONNECT_TIMEOUT = float(os.getenv("JOBS_API_CONNECT_TIMEOUT", "5"))  # seconds
+JOBS_API_READ_TIMEOUT = float(os.getenv("JOBS_API_READ_TIMEOUT", "20"))  # seconds
+JOBS_API_MAX_CONNECTIONS = int(os.getenv("JOBS_API_MAX_CONNECTIONS", "100"))
+JOBS_API_MAX_CONNECTIONS_PER_HOST = int(os.getenv("JOBS_API_MAX_CONNECTIONS_PER_HOST", "20"))
+JOBS_API_DNS_CACHE_TTL = int(os.getenv("JOBS_API_DNS_CACHE_TTL", "300"))  # seconds
+JOBS_API_KEEPALIVE_TIMEOUT = float(os.getenv("JOBS_API_KEEPALIVE_TIMEOUT", "60"))  # seconds
+
+# Jobs API resilience settings
+JOBS_API_BREAKER_WINDOW = float(os.getenv("JOBS_API_BREAKER_WINDOW", "60"))  # seconds of outcomes considered
+JOBS_API_BREAKER_MIN_REQUESTS = int(os.getenv("JOBS_API_BREAKER_MIN_REQUESTS", "10"))  # before the breaker may trip
+JOBS_API_BREAKER_FAILURE_RATIO = float(os.getenv("JOBS_API_BREAKER_FAILURE_RATIO", "0.5"))
+JOBS_API_BREAKER_OPEN_SECONDS = float(os.getenv("JOBS_API_BREAKER_OPEN_SECONDS", "30"))  # before a probe is allowed
+JOBS_API_MIN_CONCURRENCY = int(os.getenv("JOBS_API_MIN_CONCURRENCY", "1"))
+JOBS_API_INITIAL_CONCURRENCY = int(os.getenv("JOBS_API_INITIAL_CONCURRENCY", "4"))
+JOBS_API_LATENCY_TARGET = float(os.getenv("JOBS_API_LATENCY_TARGET", "3"))  # seconds; slower responses shrink the limit
+JOBS_API_QUEUE_TIMEOUT = float(os.getenv("JOBS_API_QUEUE_TIMEOUT", "10"))  # seconds a caller may wait for a slot
+
+# Jobs API query cache settings
+JOBS_CACHE_BACKEND = os.getenv("JOBS_CACHE_BACKEND", "memory")  # memory or redis
+JOBS_CACHE_TTL = int(os.getenv("JOBS_CACHE_TTL", "900"))  # seconds an entry is fresh
+JOBS_CACHE_STALE_TTL = int(os.getenv("JOBS_CACHE_STALE_TTL", "3600"))  # seconds a stale entry may still be served
+JOBS_CACHE_MAX_ENTRIES = int(os.getenv("JOBS_CACHE_MAX_ENTRIES", "1024"))  # memory backend only
+JOB_LOOKUP_CACHE_SIZE = int(os.getenv("JOB_LOOKUP_CACHE_SIZE", "4096"))  # single-job LRU entries
+JOB_LOOKUP_CACHE_TTL = int(os.getenv("JOB_LOOKUP_CACHE_TTL", "3600"))  # seconds
+
+# Local job listings settings
+JOBS_LOCAL_MAX_AGE_MINUTES = int(os.getenv("JOBS_LOCAL_MAX_AGE_MINUTES", "180"))  # older local data is stale
+JOBS_QUERY_MAX_LIMIT = int(os.getenv("JOBS_QUERY_MAX_LIMIT", "100"))
+
+# Job ingestion settings
+JOBS_INGEST_PAGE_SIZE = int(os.getenv("JOBS_INGEST_PAGE_SIZE", "100"))
+JOBS_INGEST_MAX_PAGES = int(os.getenv("JOBS_INGEST_MAX_PAGES", "100"))  # safety cap per run
+JOBS_UPSERT_BATCH_SIZE = int(os.getenv("JOBS_UPSERT_BATCH_SIZE", "500"))  # rows per INSERT ... ON CONFLICT
+JOBS_RETENTION_DAYS = int(os.getenv("JOBS_RETENTION_DAYS", "30"))  # listings older than this are purged
+
+# Near-duplicate job detection settings
+JOBS_DEDUP_THRESHOLD = float(os.getenv("JOBS_DEDUP_THRESHOLD", "0.8"))  # estimated Jaccard similarity
+JOBS_MINHASH_PERMUTATIONS = int(os.getenv("JOBS_MINHASH_PERMUTATIONS", "64"))
+JOBS_LSH_BANDS = int(os.getenv("JOBS_LSH_BANDS", "8"))  # must divide JOBS_MINHASH_PERMUTATIONS
+
+# Job matching settings
+JOBS_MATCH_CANDIDATE_LIMIT = int(os.getenv("JOBS_MATCH_CANDIDATE_LIMIT", "5000"))  # local listings pre-ranked per user
+JOBS_MATCH_TOP_K = int(os.getenv("JOBS_MATCH_TOP_K", "20"))  # pre-ranked jobs sent to the LLM
+JOB_MATCH_TTL_HOURS = int(os.getenv("JOB_MATCH_TTL_HOURS", "72"))  # stored match scores are reused this long
+JOBS_PUSH_MIN_SCORE = float(os.getenv("JOBS_PUSH_MIN_SCORE", "0.5"))  # minimum skill score (0-1) for pushing a new job
+JOBS_CLUSTER_RANKING = os.getenv("JOBS_CLUSTER_RANKING", "False").lower() == "true"  # one LLM ranking per group of similar users
+JOBS_CLUSTER_SIMILARITY = float(os.getenv("JOBS_CLUSTER_SIMILARITY", "0.9"))  # resume cosine similarity to join a cluster
+JOBS_CLUSTER_MAX_SIZE = int(os.getenv("JOBS_CLUSTER_MAX_SIZE", "50"))  # users sharing one ranking
+JOBS_CLUSTER_ADJUST_WEIGHT = float(os.getenv("JOBS_CLUSTER_ADJUST_WEIGHT", "50"))  # match points per unit of cosine difference from the representative
+
+# Learned re-ranker settings (trained from Save Job / Not Interested feedback)
+JOBS_RERANKER_MODE = os.getenv("JOBS_RERANKER_MODE", "off")  # off, gate (LLM scores only the re-ranker's top jobs) or replace (no LLM)
+JOBS_RERANKER_LLM_TOP_K = int(os.getenv("JOBS_RERANKER_LLM_TOP_K", "5"))  # jobs still sent to the LLM in gate mode
+JOBS_RERANKER_MIN_SAMPLES = int(os.getenv("JOBS_RERANKER_MIN_SAMPLES", "200"))  # feedback events needed to train
+JOBS_RERANKER_MIN_AUC = float(os.getenv("JOBS_RERANKER_MIN_AUC", "0.65"))  # held-out AUC a model needs to be published
+JOBS_RERANKER_REFRESH_SECONDS = int(os.getenv("JOBS_RERANKER_REFRESH_SECONDS", "600"))  # how often processes reload the model
+
+# Embedding settings
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "hashing")  # hashing (local) or openai
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")  # openai provider only
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "512"))
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "128"))  # texts per provider request
 
 # Admin settings
 ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "admin")
@@ -7,7 +7,7 @@ from models.user import User
 from models.subscription import SubscriptionPlan, Subscription
 from models.payment import Payment
 from models.resume import ResumeRequest
-from models.job import SavedJob, JobListing, JobApplication, JobMatch, JobSearchPreference
+from models.job import SavedJob, JobListing, JobApplication, JobMatch, JobSearchPreference, JobIngestionRun, JobFingerprintBucket, UserMatchTerm
 
 # Create empty init files for other directories
 # utils/__init__.py
@@ -1,5 +1,6 @@
 # models/job.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, LargeBinary, UniqueConstraint, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -36,16 +37,71 @@ class JobListing(Base):
     title = Column(String(255), nullable=False)
     company = Column(String(255), nullable=True)
     location = Column(String(255), nullable=True)
-    job_type = Column(String(100), nullable=True)  # e.g., Full Time, Part Time
-    experience = Column(String(100), nullable=True)  # e.g., 1-3 years, 3-5 years
+    job_type = Column(String(100), nullable=True, index=True)  # e.g., Full Time, Part Time
+    experience = Column(String(100), nullable=True, index=True)  # e.g., 1-3 years, 3-5 years
     posted_date = Column(DateTime, nullable=True)
     job_data = Column(JSON, nullable=False)  # Complete job data
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of job_data, used to skip unchanged upserts
+    minhash = Column(JSON, nullable=True)  # MinHash signature of normalized title/company/description
+    embedding = Column(LargeBinary, nullable=True)  # float32 embedding of title/skills/description
+    # Set when this listing is a near-duplicate re-post of another (canonical) listing
+    canonical_job_id = Column(
+        String(255),
+        ForeignKey("job_listings.job_id", ondelete="SET NULL"),
+        nullable=True,
+        index=True
+    )
+    # Weighted full-text document (title > company/skills > description), maintained by Postgres on write
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(job_data->>'education_and_skills', '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(job_data->>'job_description', '')), 'C')",
+            persisted=True
+        )
+    )
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    
+    __table_args__ = (
+        # Trigram indexes for case-insensitive substring filters (requires pg_trgm)
+        Index('ix_job_listings_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+        Index('ix_job_listings_company_trgm', 'company', postgresql_using='gin', postgresql_ops={'company': 'gin_trgm_ops'}),
+        Index('ix_job_listings_location_trgm', 'location', postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'}),
+        Index('ix_job_listings_search_vector', 'search_vector', postgresql_using='gin'),
+        # Retention purge falls back to created_at for listings without a posted_date
+        Index('ix_job_listings_undated_created_at', 'created_at', postgresql_where=text('posted_date IS NULL')),
+        # Push matching loads the listings inserted by the latest ingestion
+        Index('ix_job_listings_created_at', 'created_at'),
+    )
     
     def __repr__(self):
         return f"<JobListing job_id={self.job_id}, title={self.title}>"
 
+# Keyset pagination index matching the listing sort order (newest first)
+Index(
+    'ix_job_listings_posted_date_id',
+    JobListing.posted_date.desc().nullslast(),
+    JobListing.id.desc()
+)
+
+class JobFingerprintBucket(Base):
+    """LSH band buckets of canonical job listings, used to find near-duplicates"""
+    __tablename__ = "job_fingerprint_buckets"
+    
+    band_key = Column(String(40), primary_key=True)  # band index + hash of the band's MinHash values
+    job_id = Column(
+        String(255),
+        ForeignKey("job_listings.job_id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True
+    )
+    
+    def __repr__(self):
+        return f"<JobFingerprintBucket band_key={self.band_key}, job_id={self.job_id}>"
+
 class JobApplication(Base):
     """Model for tracking job applications"""
     __tablename__ = "job_applications"
@@ -80,8 +136,11 @@ class JobMatch(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     job_id = Column(String(255), nullable=False)  # ID from the Jobs API
+    resume_hash = Column(String(64), nullable=True)  # SHA-256 of the resume_data the match was scored against
+    job_content_hash = Column(String(64), nullable=True)  # SHA-256 of the job data the match was scored against
     match_percentage = Column(Integer, nullable=False)  # 0-100
     match_reasons = Column(Text, nullable=True)  # Reasons for the match
+    source = Column(String(20), default="llm")  # llm (AI-scored), cluster (AI score of a similar resume, adjusted) or skills (pushed on ingestion, not yet AI-scored)
     created_at = Column(DateTime, default=datetime.utcnow)
     sent_to_user = Column(Boolean, default=False)  # Whether this match was sent to the user
     user_feedback = Column(String(50), nullable=True)  # User feedback (e.g., "relevant", "not relevant")
@@ -91,13 +150,24 @@ class JobMatch(Base):
     user = relationship("User", backref="job_matches")
     
     __table_args__ = (
-        # Unique constraint for user-job combination
-        UniqueConstraint('user_id', 'job_id', name='uix_user_job_match'),
+        # One match per job and resume version; a new resume gets fresh matches
+        UniqueConstraint('user_id', 'resume_hash', 'job_id', name='uix_user_resume_job_match'),
+        Index('ix_job_matches_created_at', 'created_at'),
     )
     
     def __repr__(self):
         return f"<JobMatch user_id={self.user_id}, job_id={self.job_id}, match_percentage={self.match_percentage}>"
 
+class UserMatchTerm(Base):
+    """Inverted index of resume skill/title terms to users, used to push new jobs"""
+    __tablename__ = "user_match_terms"
+    
+    term = Column(String(100), primary_key=True)  # normalized skill or job title phrase
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True)
+    
+    def __repr__(self):
+        return f"<UserMatchTerm term={self.term}, user_id={self.user_id}>"
+
 class JobSearchPreference(Base):
     """Model for storing user job search preferences"""
     __tablename__ = "job_search_preferences"
@@ -119,4 +189,30 @@ class JobSearchPreference(Base):
     user = relationship("User", backref="job_search_preference")
     
     def __repr__(self):
-        return f"<JobSearchPreference user_id={self.user_id}>"
\ No newline at end of file
+        return f"<JobSearchPreference user_id={self.user_id}>"
+
+class JobIngestionRun(Base):
+    """Model for tracking incremental job ingestion runs and the feed watermark"""
+    __tablename__ = "job_ingestion_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String(50), default="running", index=True)  # running, paused, completed, failed
+    started_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    next_offset = Column(Integer, default=0)  # Offset of the next page to fetch (for resuming)
+    pages_fetched = Column(Integer, default=0)
+    new_rows = Column(Integer, default=0)
+    updated_rows = Column(Integer, default=0)
+    elapsed_seconds = Column(Integer, nullable=True)
+    # Watermark this run stops at (newest item of the previous completed run)
+    stop_posted_date = Column(DateTime, nullable=True)
+    stop_job_id = Column(String(255), nullable=True)
+    # Newest item seen by this run; becomes the next watermark once completed
+    watermark_posted_date = Column(DateTime, nullable=True)
+    watermark_job_id = Column(String(255), nullable=True)
+    # Set once the listings of this completed run were pushed to interested users
+    pushed_at = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
+    
+    def __repr__(self):
+        return f"<JobIngestionRun id={self.id}, status={self.status}, pages={self.pages_fetched}>"
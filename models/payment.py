@@ -22,7 +22,7 @@ class Payment(Base):
     payment_details = Column(JSON, nullable=True)  # Additional payment details
     
     # Relationships
-    user = relationship("User", backref="payments")
+    user = relationship("User", back_populates="payments")
     subscription = relationship("Subscription", backref="payments")
     
     def __repr__(self):
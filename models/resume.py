@@ -22,7 +22,7 @@ class ResumeRequest(Base):
     processing_time = Column(Integer, nullable=True)  # Processing time in seconds
     
     # Relationships
-    user = relationship("User", backref="resume_requests")
+    user = relationship("User", back_populates="resume_requests")
     
     def __repr__(self):
         return f"<ResumeRequest request_id={self.request_id}, status={self.status}>"
\ No newline at end of file
@@ -39,7 +39,7 @@ class Subscription(Base):
     subscription_metadata = Column(JSON, nullable=True)  # Changed from 'metadata' to 'subscription_metadata'
     
     # Relationships
-    user = relationship("User", backref="subscriptions")
+    user = relationship("User", back_populates="subscriptions")
     plan = relationship("SubscriptionPlan", back_populates="subscriptions")
     
     @property
@@ -1,13 +1,11 @@
 # models/user.py
-from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Text, JSON, desc
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Text, JSON, LargeBinary, desc
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
+from models.base import Base
 from models.subscription import Subscription
 
-Base = declarative_base()
-
 class User(Base):
     __tablename__ = "users"
     
@@ -24,6 +22,7 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     has_resume = Column(Boolean, default=False)
     resume_data = Column(JSON, nullable=True)  # Processed resume data in JSON format
+    resume_embedding = Column(LargeBinary, nullable=True)  # float32 embedding of resume_data
     
     # Relationships
     # subscriptions = relationship("Subscription", back_populates="user", order_by="desc(Subscription.created_at)")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# scripts/benchmark_match_prompt.py
+import argparse
+import json
+import logging
+import os
+import sys
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.agents.job_matching_agent import build_job_matching_prompt
+from ai.prompts.layout import prompt_text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Previous protocol: full indented job dicts in, full job_data echoed back out
+LEGACY_JOB_MATCHING_PROMPT = """
+    You are an AI assistant that helps match job listings to a candidate's resume. Your task is to:
+
+    1. Analyze the candidate's resume
+    2. Analyze the job listings provided
+    3. Rank the job listings based on how well they match the candidate's skills, experience, and qualifications
+    4. For each job, calculate a match percentage (0-100%) and provide a brief explanation of the match
+
+    Here is the candidate's resume information in JSON format:
+    {resume_json}
+
+    Here are the job listings in JSON format:
+    {jobs_json}
+
+    Please return a ranked list of job matches in the following JSON format:
+
+    ```json
+    [
+      {{
+        "job_id": "job_id_here",
+        "match_percentage": 85,
+        "match_reasons": "Key skills match: Python, React. Experience level matches. Location is suitable.",
+        "job_data": {{...original job data...}}
+      }},
+      {{
+        "job_id": "another_job_id",
+        "match_percentage": 72,
+        "match_reasons": "Skills partially match. More experience required than candidate has.",
+        "job_data": {{...original job data...}}
+      }}
+    ]
+    ```
+
+    Sort the results by match_percentage in descending order (best matches first).
+    """
+
+SAMPLE_REASON = "Strong Python and Django overlap; experience level and location fit."
+
+def sample_jobs(count):
+    """Generate jobs shaped like Jobs API results"""
+    description = (
+        "We are looking for an engineer to design, build and maintain scalable backend services. "
+        "You will work with product managers and designers to ship features, write clean and tested code, "
+        "review pull requests, mentor junior developers and take part in on-call rotations. "
+    ) * 6
+
+    return [
+        {
+            "id": str(100000 + i),
+            "title": f"Backend Developer {i}",
+            "company": f"Company {i}",
+            "location": "Bangalore, Karnataka, India",
+            "job_type": "Full Time",
+            "experience": "2-5 years",
+            "posted_date": "2024-03-01T10:00:00Z",
+            "salary": "12-18 LPA",
+            "job_description": description,
+            "education_and_skills": "B.Tech/B.E. in Computer Science. Python, Django, PostgreSQL, Redis, Docker, AWS, REST APIs.",
+            "role_and_responsibility": description[:400],
+            "about_company": "A fast-growing product company building software for small businesses. " * 3,
+            "apply_link": f"https://example.com/jobs/{100000 + i}"
+        }
+        for i in range(count)
+    ]
+
+def sample_resume():
+    """Generate a resume shaped like the resume parser output"""
+    return {
+        "contact_info": {
+            "name": "Sample Candidate",
+            "email": "candidate@example.com",
+            "phone": "+91 90000 00000",
+            "location": "Bangalore",
+            "linkedin": "",
+            "website": ""
+        },
+        "summary": "Backend engineer with four years of experience building Python web services.",
+        "skills": {
+            "technical": ["Python", "Django", "FastAPI", "PostgreSQL", "Redis"],
+            "soft": ["Communication", "Mentoring"],
+            "languages": ["English", "Hindi"],
+            "tools": ["Docker", "Git", "AWS"]
+        },
+        "work_experience": [
+            {
+                "company": f"Employer {i}",
+                "title": "Software Engineer",
+                "start_date": "2020-01",
+                "end_date": "Present" if i == 0 else "2019-12",
+                "location": "Bangalore",
+                "responsibilities": [
+                    "Built and maintained REST APIs serving millions of requests per day",
+                    "Reduced database load by introducing caching and query optimizations",
+                    "Mentored two junior engineers and led code reviews"
+                ]
+            }
+            for i in range(2)
+        ],
+        "education": [
+            {"institution": "Sample University", "degree": "B.Tech", "field": "Computer Science", "start_date": "2012", "end_date": "2016", "gpa": ""}
+        ],
+        "projects": [],
+        "certifications": []
+    }
+
+def get_token_counter():
+    """Use tiktoken when installed, otherwise estimate about 4 characters per token"""
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text)), "tiktoken cl100k_base"
+    except ImportError:
+        return lambda text: (len(text) + 3) // 4, "estimate (4 chars/token; install tiktoken for exact counts)"
+
+def legacy_payloads(jobs, resume_data):
+    prompt = LEGACY_JOB_MATCHING_PROMPT.format(
+        resume_json=json.dumps(resume_data, indent=2),
+        jobs_json=json.dumps(jobs, indent=2)
+    )
+    response = json.dumps([
+        {"job_id": job["id"], "match_percentage": 80, "match_reasons": SAMPLE_REASON, "job_data": job}
+        for job in jobs
+    ], indent=2)
+    return prompt, response
+
+def compact_payloads(jobs, resume_data):
+    prompt = prompt_text(build_job_matching_prompt(jobs, resume_data))
+    response = json.dumps(
+        [{"job_id": job["id"], "score": 80, "reason": SAMPLE_REASON} for job in jobs],
+        separators=(",", ":")
+    )
+    return prompt, response
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare token usage of the legacy and compact job matching protocols')
+    parser.add_argument('--jobs', help='JSON file with a list of jobs (defaults to generated samples)')
+    parser.add_argument('--resume', help='JSON file with parsed resume data (defaults to a generated sample)')
+    parser.add_argument('--sizes', default='5,20,50', help='Comma-separated batch sizes to compare')
+    args = parser.parse_args()
+
+    jobs = json.load(open(args.jobs)) if args.jobs else sample_jobs(max(int(size) for size in args.sizes.split(',')))
+    resume_data = json.load(open(args.resume)) if args.resume else sample_resume()
+    count_tokens, counter_name = get_token_counter()
+
+    logger.info(f"Token counter: {counter_name}")
+    print(f"{'jobs':>5} | {'input before':>12} | {'input after':>11} | {'output before':>13} | {'output after':>12} | {'total saved':>11}")
+
+    for size in (int(size) for size in args.sizes.split(',')):
+        batch = jobs[:size]
+        legacy_in, legacy_out = (count_tokens(text) for text in legacy_payloads(batch, resume_data))
+        compact_in, compact_out = (count_tokens(text) for text in compact_payloads(batch, resume_data))
+        saved = 1 - (compact_in + compact_out) / (legacy_in + legacy_out)
+
+        print(f"{len(batch):>5} | {legacy_in:>12} | {compact_in:>11} | {legacy_out:>13} | {compact_out:>12} | {saved:>10.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# scripts/load_test_ai.py
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+WORKLOADS = ("match", "parse", "support")
+
+SAMPLE_RESUME_TEXT = """Sample Candidate
+Backend engineer with four years of experience building Python web services.
+candidate@example.com | +91 90000 00000 | Bangalore
+
+Skills: Python, Django, FastAPI, PostgreSQL, Redis, Docker, AWS, Git, Communication
+
+Experience
+Software Engineer, Employer 0 (2020 - Present)
+- Built and maintained REST APIs serving millions of requests per day
+"""
+
+def configure_environment(args):
+    """Point the AI layer at the fake provider before any settings are imported"""
+    os.environ["DEFAULT_AI_PROVIDER"] = "fake"
+    os.environ["AI_CACHE_BACKEND"] = "none" if args.no_cache else "memory"
+    os.environ["AI_FAKE_LATENCY_MEDIAN"] = str(args.latency)
+    os.environ["AI_FAKE_LATENCY_SIGMA"] = str(args.sigma)
+    os.environ["AI_FAKE_ERROR_RATE"] = str(args.error_rate)
+    os.environ["AI_FAKE_SEED"] = str(args.seed)
+    os.environ["AI_MAX_CONCURRENCY"] = str(args.concurrency)
+
+async def match_with_first_match_time(batch, resume_data, first_match_latencies):
+    """Run one matching request, recording when its first streamed match arrives"""
+    from ai.agents.job_matching_agent import JobMatchingAgent
+
+    started = time.monotonic()
+    seen = []
+
+    async def on_match(match):
+        if not seen:
+            first_match_latencies.append(time.monotonic() - started)
+        seen.append(match)
+
+    return await JobMatchingAgent.match_jobs_to_resume(batch, resume_data, on_match=on_match)
+
+def build_requests(workload, count, jobs_per_request, first_match_latencies):
+    """Build request coroutine factories; distinct inputs so the cache does not answer them"""
+    from ai.agents.resume_agent import ResumeAgent
+    from ai.agents.support_agent import SupportAgent
+    from ai.prompts.layout import build_prompt
+    from ai.prompts.resume_prompts import RESUME_PARSING_SYSTEM_PROMPT, RESUME_TEXT_BLOCK
+    from scripts.benchmark_match_prompt import sample_jobs, sample_resume
+
+    jobs = sample_jobs(jobs_per_request * count)
+    resume_data = sample_resume()
+
+    if workload == "match":
+        return [
+            lambda i=i: match_with_first_match_time(
+                jobs[i * jobs_per_request:(i + 1) * jobs_per_request], resume_data, first_match_latencies
+            )
+            for i in range(count)
+        ]
+
+    if workload == "parse":
+        return [
+            lambda i=i: ResumeAgent._get_ai_response(
+                build_prompt(
+                    RESUME_PARSING_SYSTEM_PROMPT,
+                    call_block=RESUME_TEXT_BLOCK.format(resume_text=f"{SAMPLE_RESUME_TEXT}\nReference: {i}")
+                ),
+                task="parse"
+            )
+            for i in range(count)
+        ]
+
+    return [
+        lambda i=i: SupportAgent.get_support_response(f"How do I change my job preferences? (ticket {i})")
+        for i in range(count)
+    ]
+
+def validate(workload, result):
+    """Check a response has the shape its consumer expects"""
+    if workload == "match":
+        return bool(result) and all("match_percentage" in match for match in result)
+    if workload == "parse":
+        return "contact_info" in json.loads(result)
+    return bool(result[0])
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+async def run_workload(workload, requests, concurrency):
+    """Run requests with a bounded number in flight and collect per-request latencies"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def run_one(request):
+        nonlocal failures
+
+        async with semaphore:
+            started = time.monotonic()
+
+            try:
+                if not validate(workload, await request()):
+                    failures += 1
+            except Exception as e:
+                logger.warning(f"{workload} request failed: {str(e)}")
+                failures += 1
+
+            latencies.append(time.monotonic() - started)
+
+    started = time.monotonic()
+    await asyncio.gather(*(run_one(request) for request in requests))
+    return latencies, failures, time.monotonic() - started
+
+async def run(args):
+    from ai.gateway import get_llm_gateway
+    from ai.routing import get_model_router
+
+    print(f"{'workload':>8} | {'requests':>8} | {'failed':>6} | {'req/s':>7} | {'p50 s':>6} | {'p95 s':>6} | {'p99 s':>6}")
+
+    for workload in args.workloads.split(','):
+        first_match_latencies = []
+        requests = build_requests(workload, args.requests, args.jobs, first_match_latencies)
+        latencies, failures, elapsed = await run_workload(workload, requests, args.concurrency)
+
+        print(
+            f"{workload:>8} | {len(latencies):>8} | {failures:>6} | {len(latencies) / elapsed:>7.1f} | "
+            f"{percentile(latencies, 0.5):>6.2f} | {percentile(latencies, 0.95):>6.2f} | {percentile(latencies, 0.99):>6.2f}"
+        )
+
+        if first_match_latencies:
+            print(
+                f"{'':>8}   time to first match: p50 {percentile(first_match_latencies, 0.5):.2f}s, "
+                f"p95 {percentile(first_match_latencies, 0.95):.2f}s"
+            )
+
+    print(f"Gateway: {get_llm_gateway().stats}")
+    print(f"Router: {get_model_router().stats}")
+
+    for task, usage in get_llm_gateway().usage_report().items():
+        print(
+            f"Tokens ({task}): {usage['input_tokens']} in, {usage['output_tokens']} out, "
+            f"{usage['cached_ratio']:.0%} of input from the prompt cache"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the AI agents end to end against the local fake provider')
+    parser.add_argument('--workloads', default=','.join(WORKLOADS), help=f"Comma-separated workloads ({', '.join(WORKLOADS)})")
+    parser.add_argument('--requests', type=int, default=200, help='Requests per workload')
+    parser.add_argument('--concurrency', type=int, default=20, help='Requests in flight')
+    parser.add_argument('--jobs', type=int, default=20, help='Jobs per matching request')
+    parser.add_argument('--latency', type=float, default=1.5, help='Median provider latency in seconds')
+    parser.add_argument('--sigma', type=float, default=0.5, help='Log-normal spread of the provider latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of provider calls that fail')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for latencies and injected errors')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the AI response cache')
+    args = parser.parse_args()
+
+    unknown = set(args.workloads.split(',')) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"Unknown workloads: {', '.join(sorted(unknown))}")
+
+    configure_environment(args)
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import text
 from sqlalchemy_utils import database_exists, create_database
 
 from config.settings import DATABASE_URL
@@ -42,6 +43,9 @@ async def setup_database(drop_all=False):
                 await conn.run_sync(Base.metadata.drop_all)
                 logger.info("All tables dropped successfully")
             
+            # Extensions required by model indexes (trigram search on job listings)
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            
             # Create all tables
             logger.info("Creating tables...")
             await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,209 @@
+# services/job_cache.py
+import logging
+import json
+import time
+import hashlib
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config.settings import (
+    REDIS_URL,
+    JOBS_CACHE_BACKEND,
+    JOBS_CACHE_TTL,
+    JOBS_CACHE_STALE_TTL,
+    JOBS_CACHE_MAX_ENTRIES
+)
+from utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "jobs:query:"
+
+def normalize_query_params(params: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Normalize Jobs API filter params so equivalent queries share a cache key
+
+    Args:
+        params: Raw filter parameters (None values are dropped)
+
+    Returns:
+        Normalized parameter dictionary
+    """
+    normalized = {}
+
+    for key, value in params.items():
+        if value is None or value == "":
+            continue
+
+        if isinstance(value, str):
+            value = " ".join(value.split()).lower()
+
+        normalized[key] = str(value)
+
+    return normalized
+
+def build_cache_key(params: Dict[str, Any]) -> str:
+    """
+    Build a cache key from filter params
+
+    Args:
+        params: Filter parameters
+
+    Returns:
+        Cache key string
+    """
+    normalized = normalize_query_params(params)
+    digest = hashlib.sha1(json.dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{CACHE_KEY_PREFIX}{digest}"
+
+class MemoryCacheBackend:
+    """In-process LRU cache backend"""
+
+    def __init__(self, max_entries: int = JOBS_CACHE_MAX_ENTRIES):
+        self._cache = LRUCache(max_entries)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        self._cache.set(key, value, ttl)
+
+class RedisCacheBackend:
+    """Redis cache backend shared by all API, bot and Celery processes"""
+
+    def __init__(self, url: str = REDIS_URL):
+        self.url = url
+        self._client = None
+        self._loop = None
+
+    def _get_client(self):
+        # redis.asyncio connections are bound to the loop that opened them
+        loop = asyncio.get_running_loop()
+
+        if self._client is None or self._loop is not loop:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self.url)
+            self._loop = loop
+
+        return self._client
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self._get_client().get(key)
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        await self._get_client().set(key, json.dumps(value), ex=ttl)
+
+class JobsQueryCache:
+    """
+    Read-through cache for Jobs API queries
+
+    Fresh entries are served directly. Stale entries (older than ttl but
+    within stale_ttl) are served immediately while a single background
+    refresh runs. Concurrent misses for the same key share one upstream call.
+    """
+
+    def __init__(self, backend, ttl: int = JOBS_CACHE_TTL, stale_ttl: int = JOBS_CACHE_STALE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "upstream_calls": 0}
+
+    async def get_or_fetch(
+        self,
+        params: Dict[str, Any],
+        fetcher: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Get jobs for the given params, calling fetcher only when needed
+
+        Args:
+            params: Filter parameters used to build the cache key
+            fetcher: Coroutine function that performs the upstream call
+
+        Returns:
+            List of job dictionaries
+        """
+        key = build_cache_key(params)
+
+        try:
+            entry = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Jobs cache read failed for {key}: {str(e)}")
+            entry = None
+
+        if entry is not None:
+            age = time.time() - entry.get("fetched_at", 0)
+
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                return entry["jobs"]
+
+            # Serve stale data and revalidate in the background
+            self.stats["stale_hits"] += 1
+            self._refresh(key, fetcher)
+            return entry["jobs"]
+
+        self.stats["misses"] += 1
+
+        # Shield so one cancelled caller doesn't cancel the shared upstream call
+        return await asyncio.shield(self._refresh(key, fetcher))
+
+    def _refresh(self, key: str, fetcher) -> "asyncio.Task":
+        """Start (or join) the single upstream refresh for a key"""
+        task = self._in_flight.get(key)
+
+        # Tasks left over from a previous event loop are discarded
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            return task
+
+        task = asyncio.ensure_future(self._fetch_and_store(key, fetcher))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda t: self._in_flight.pop(key, None) if self._in_flight.get(key) is t else None)
+        return task
+
+    async def _fetch_and_store(self, key: str, fetcher) -> List[Dict[str, Any]]:
+        self.stats["upstream_calls"] += 1
+
+        try:
+            jobs = await fetcher()
+        except Exception as e:
+            logger.error(f"Error refreshing jobs cache entry {key}: {str(e)}")
+            return []
+
+        # Empty results usually mean an upstream error, so they are not cached
+        if jobs:
+            try:
+                await self.backend.set(
+                    key,
+                    {"jobs": jobs, "fetched_at": time.time()},
+                    self.ttl + self.stale_ttl
+                )
+            except Exception as e:
+                logger.warning(f"Jobs cache write failed for {key}: {str(e)}")
+
+        return jobs
+
+# Global cache instance
+_jobs_query_cache = None
+
+def get_jobs_query_cache() -> JobsQueryCache:
+    """
+    Get the process-wide Jobs API query cache
+
+    Returns:
+        JobsQueryCache instance
+    """
+    global _jobs_query_cache
+
+    if _jobs_query_cache is None:
+        if JOBS_CACHE_BACKEND == "redis":
+            backend = RedisCacheBackend()
+        else:
+            backend = MemoryCacheBackend()
+
+        _jobs_query_cache = JobsQueryCache(backend)
+
+    return _jobs_query_cache
@@ -0,0 +1,216 @@
+# services/job_cluster_service.py
+import logging
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from ai.agents.job_matching_agent import JobMatchingAgent
+from ai.embeddings import get_embedder
+from config.settings import (
+    JOBS_MATCH_TOP_K,
+    JOBS_CLUSTER_SIMILARITY,
+    JOBS_CLUSTER_MAX_SIZE,
+    JOBS_CLUSTER_ADJUST_WEIGHT,
+    JOBS_RERANKER_MODE,
+    JOBS_RERANKER_LLM_TOP_K
+)
+from models.user import User
+from services.job_match_service import compute_resume_hash, match_jobs_with_cache, save_matches
+from services.job_preference_service import JobPreferenceFilter, load_preference_filters
+from services.job_rerank_service import get_reranker
+from services.job_service import calculate_experience_level
+from services.job_vector_service import VectorIndex, blob_to_vector, get_job_vector_index
+
+logger = logging.getLogger(__name__)
+
+def canopy_clusters(
+    vectors: np.ndarray,
+    threshold: float = JOBS_CLUSTER_SIMILARITY,
+    max_size: int = JOBS_CLUSTER_MAX_SIZE
+) -> List[List[int]]:
+    """
+    Greedy canopy clustering of unit vectors
+
+    The first unassigned vector seeds a cluster and takes every unassigned
+    vector at least `threshold` similar to it (most similar first, up to
+    `max_size`); this repeats until all vectors are assigned. Each seed
+    costs one matrix-vector product.
+
+    Args:
+        vectors: Matrix of unit vectors (one per row)
+        threshold: Minimum cosine similarity to the seed
+        max_size: Maximum members per cluster
+
+    Returns:
+        Clusters as lists of row numbers, seed first
+    """
+    unassigned = np.arange(len(vectors))
+    clusters = []
+
+    while len(unassigned):
+        similarity = vectors[unassigned] @ vectors[unassigned[0]]
+        close = np.flatnonzero(similarity >= threshold)
+        close = close[np.argsort(-similarity[close], kind="stable")][:max_size]
+
+        # The seed is always close to itself, so every round assigns it
+        clusters.append(unassigned[close].tolist())
+        unassigned = np.delete(unassigned, close)
+
+    return clusters
+
+def _cluster_key(user: User, preference: Optional[JobPreferenceFilter]) -> tuple:
+    """Users are only clustered with users of the same city, experience level and filters"""
+    contact_info = user.resume_data.get("contact_info") or {}
+    location = str(contact_info.get("location") or "").strip().lower()
+    return (location, calculate_experience_level(user.resume_data), preference.key if preference else None)
+
+def _merge_candidates(candidate_lists: List[List[Dict[str, Any]]], top_n: int) -> List[Dict[str, Any]]:
+    """Pool the members' candidates, ranking jobs by summed reciprocal rank"""
+    scores = defaultdict(float)
+    jobs = {}
+
+    for candidates in candidate_lists:
+        for rank, job in enumerate(candidates):
+            job_id = str(job.get("id"))
+            scores[job_id] += 1 / (rank + 1)
+            jobs.setdefault(job_id, job)
+
+    return [jobs[job_id] for job_id in sorted(scores, key=scores.get, reverse=True)[:top_n]]
+
+def _adjust_for_user(
+    matches: List[Dict[str, Any]],
+    user_vector: np.ndarray,
+    representative_vector: np.ndarray,
+    index: VectorIndex
+) -> List[Dict[str, Any]]:
+    """
+    Shift the cluster's LLM scores by how much closer each job is to the
+    user's resume than to the representative's, then re-rank
+    """
+    adjusted = []
+
+    for match in matches:
+        position = index.positions.get(str(match.get("job_id")))
+        match_percentage = match.get("match_percentage")
+
+        if position is not None and match_percentage is not None:
+            job_vector = index.matrix[position]
+            shift = JOBS_CLUSTER_ADJUST_WEIGHT * float(job_vector @ user_vector - job_vector @ representative_vector)
+            match = {**match, "match_percentage": int(round(max(0, min(100, match_percentage + shift))))}
+
+        adjusted.append(match)
+
+    return sorted(adjusted, key=lambda match: match.get("match_percentage") or 0, reverse=True)
+
+async def rank_users_by_cluster(
+    users: List[User],
+    candidates: Dict[int, List[Dict[str, Any]]],
+    preferences: Optional[Dict[int, JobPreferenceFilter]] = None
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Rank candidate jobs for groups of similar users with one LLM call per group
+
+    Users are grouped by city, experience level and search preferences,
+    then clustered by resume embedding. Each cluster's pooled candidates
+    are ranked once against the resume of the member closest to the
+    cluster centroid, and every member gets that ranking adjusted by the
+    similarity of each job to their own resume. As in
+    get_personalized_jobs_for_user, a gating re-ranker narrows what the
+    LLM sees. Members' adjusted matches are stored (source "cluster") so
+    sent flags and feedback land on a match row.
+
+    Args:
+        users: Users with resumes
+        candidates: Candidate jobs by user ID (from the batched retrieval)
+        preferences: Preference filters by user ID (loaded if not given)
+
+    Returns:
+        Dictionary of user ID to ranked matches; users left alone in their
+        cluster, or without a resume embedding, are left out and should be
+        ranked individually (as is everyone when the re-ranker replaces
+        the LLM)
+    """
+    reranker = await get_reranker() if JOBS_RERANKER_MODE in ("gate", "replace") else None
+
+    # Without LLM calls there is nothing to share between users
+    if reranker and JOBS_RERANKER_MODE == "replace":
+        return {}
+
+    embedder = get_embedder()
+    vectors = {}
+
+    for user in users:
+        vector = blob_to_vector(user.resume_embedding, embedder.dim)
+        if vector is not None and user.resume_data and candidates.get(user.id):
+            vectors[user.id] = vector
+
+    if len(vectors) < 2:
+        return {}
+
+    if preferences is None:
+        preferences = await load_preference_filters(list(vectors))
+
+    groups = defaultdict(list)
+
+    for user in users:
+        if user.id in vectors:
+            groups[_cluster_key(user, preferences.get(user.id))].append(user)
+
+    index = await get_job_vector_index()
+    ranked = {}
+    clusters_ranked = 0
+
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+
+        matrix = np.vstack([vectors[user.id] for user in members])
+
+        for cluster in canopy_clusters(matrix):
+            if len(cluster) < 2:
+                continue
+
+            cluster_users = [members[row] for row in cluster]
+            centroid = matrix[cluster].mean(axis=0)
+            representative = cluster_users[int(np.argmax(matrix[cluster] @ centroid))]
+
+            pool = _merge_candidates([candidates[user.id] for user in cluster_users], JOBS_MATCH_TOP_K)
+
+            if reranker:
+                pool = [job for job, _ in reranker.rank(representative.resume_data, pool)][:JOBS_RERANKER_LLM_TOP_K]
+
+            try:
+                matches = await match_jobs_with_cache(
+                    representative.id,
+                    representative.resume_data,
+                    pool,
+                    JobMatchingAgent.match_jobs_to_resume
+                )
+            except Exception as e:
+                logger.error(f"Error ranking cluster of user {representative.id}: {str(e)}")
+                continue
+
+            clusters_ranked += 1
+            jobs_by_id = {str(job.get("id")): job for job in pool}
+
+            for user in cluster_users:
+                ranked[user.id] = _adjust_for_user(matches, vectors[user.id], vectors[representative.id], index)
+
+                # The representative's LLM matches were stored by match_jobs_with_cache
+                if user is representative:
+                    continue
+
+                try:
+                    await save_matches(
+                        user.id,
+                        compute_resume_hash(user.resume_data),
+                        ranked[user.id],
+                        jobs_by_id,
+                        source="cluster"
+                    )
+                except Exception as e:
+                    logger.error(f"Error storing cluster matches for user {user.id}: {str(e)}")
+
+    logger.info(f"Ranked {len(ranked)} users with {clusters_ranked} cluster rankings")
+    return ranked
@@ -0,0 +1,317 @@
+# services/job_dedup_service.py
+import logging
+import re
+import zlib
+import hashlib
+from typing import List, Dict, Any, Optional, Set
+
+import numpy as np
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.future import select
+
+from config.settings import JOBS_DEDUP_THRESHOLD, JOBS_MINHASH_PERMUTATIONS, JOBS_LSH_BANDS
+from models.job import JobListing, JobFingerprintBucket
+from services.job_listing_service import load_content_hashes
+from utils.db import get_db
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime modulus for the universal hash family
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+SHINGLE_SIZE = 3
+
+def normalize_job_text(job: Dict[str, Any]) -> str:
+    """
+    Build the normalized text used for fingerprinting a job
+
+    Args:
+        job: Job dictionary from the API
+
+    Returns:
+        Lowercased title, company and description with punctuation removed
+    """
+    parts = [
+        str(job.get("title") or ""),
+        str(job.get("company") or ""),
+        str(job.get("job_description") or "")
+    ]
+    return " ".join(re.findall(r"\w+", " ".join(parts).lower()))
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    Hash the word shingles of a text to 32-bit integers
+
+    Args:
+        text: Normalized text
+        size: Words per shingle
+
+    Returns:
+        Array of unique shingle hashes (uint64)
+    """
+    words = text.split()
+
+    if not words:
+        return np.array([], dtype=np.uint64)
+
+    if len(words) <= size:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+    return np.array([zlib.crc32(s.encode("utf-8")) for s in shingles], dtype=np.uint64)
+
+class MinHasher:
+    """MinHash signatures with LSH banding for near-duplicate detection"""
+
+    def __init__(self, num_perm: int = JOBS_MINHASH_PERMUTATIONS, bands: int = JOBS_LSH_BANDS, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        # Fixed seed so signatures are comparable across processes and runs
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: np.ndarray) -> Optional[List[int]]:
+        """
+        Compute the MinHash signature of a set of shingle hashes
+
+        Args:
+            hashes: Shingle hashes from shingle_hashes
+
+        Returns:
+            List of num_perm ints, or None for empty input
+        """
+        if hashes.size == 0:
+            return None
+
+        # (a * x + b) mod p stays below 2^64 since a, b, x < 2^32
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1).tolist()
+
+    def band_keys(self, signature: List[int]) -> List[str]:
+        """
+        Get the LSH bucket keys of a signature (one per band)
+
+        Args:
+            signature: MinHash signature
+
+        Returns:
+            List of band keys
+        """
+        keys = []
+
+        for band in range(self.bands):
+            values = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(
+                np.array(values, dtype=np.uint64).tobytes(),
+                digest_size=16
+            ).hexdigest()
+            keys.append(f"{band:02d}{digest}")
+
+        return keys
+
+    @staticmethod
+    def similarity(signature_a: List[int], signature_b: List[int]) -> float:
+        """Estimate Jaccard similarity from two signatures"""
+        if not signature_a or not signature_b or len(signature_a) != len(signature_b):
+            return 0.0
+        return float(np.mean(np.array(signature_a) == np.array(signature_b)))
+
+_minhasher = MinHasher()
+
+def _best_match(
+    signature: List[int],
+    candidate_ids: Set[str],
+    signatures: Dict[str, List[int]],
+    threshold: float
+) -> Optional[str]:
+    """Pick the most similar candidate at or above the threshold"""
+    best_id = None
+    best_score = threshold
+
+    for candidate_id in candidate_ids:
+        score = MinHasher.similarity(signature, signatures.get(candidate_id))
+
+        if score >= best_score:
+            best_id, best_score = candidate_id, score
+
+    return best_id
+
+async def assign_canonical_jobs(
+    db,
+    rows: List[Dict[str, Any]],
+    threshold: float = JOBS_DEDUP_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """
+    Fingerprint listing rows and link near-duplicates to a canonical listing
+
+    Candidates come from the LSH bucket index (only rows sharing at least
+    one band are compared), plus earlier rows of the same batch. Sets the
+    "minhash" and "canonical_job_id" values on every row in place; rows
+    whose content is unchanged are not re-fingerprinted, since the upsert
+    leaves them untouched anyway.
+
+    Args:
+        db: Database session
+        rows: JobListing column values from job_to_listing_values
+        threshold: Minimum estimated Jaccard similarity for a duplicate
+
+    Returns:
+        The new or changed rows (to pass to index_fingerprints)
+    """
+    if not rows:
+        return []
+
+    existing_hashes = await load_content_hashes(db, [row["job_id"] for row in rows])
+
+    changed_rows = []
+    row_keys = {}
+
+    for row in rows:
+        row["minhash"] = None
+        row["canonical_job_id"] = None
+
+        if existing_hashes.get(row["job_id"]) == row["content_hash"]:
+            continue
+
+        row["minhash"] = _minhasher.signature(shingle_hashes(normalize_job_text(row["job_data"])))
+        row_keys[row["job_id"]] = _minhasher.band_keys(row["minhash"]) if row["minhash"] else []
+        changed_rows.append(row)
+
+    all_keys = {key for keys in row_keys.values() for key in keys}
+
+    if not all_keys:
+        return changed_rows
+
+    # Candidate canonical listings already indexed in the database
+    result = await db.execute(
+        select(JobFingerprintBucket.band_key, JobFingerprintBucket.job_id)
+        .where(JobFingerprintBucket.band_key.in_(all_keys))
+    )
+    buckets: Dict[str, Set[str]] = {}
+
+    for band_key, job_id in result.all():
+        buckets.setdefault(band_key, set()).add(job_id)
+
+    candidate_ids = {job_id for ids in buckets.values() for job_id in ids}
+    signatures: Dict[str, List[int]] = {}
+
+    if candidate_ids:
+        result = await db.execute(
+            select(JobListing.job_id, JobListing.minhash)
+            .where(JobListing.job_id.in_(candidate_ids))
+        )
+        signatures = {job_id: minhash for job_id, minhash in result.all()}
+
+    for row in changed_rows:
+        job_id = row["job_id"]
+
+        if not row["minhash"]:
+            continue
+
+        candidates = set()
+        for key in row_keys[job_id]:
+            candidates |= buckets.get(key, set())
+        candidates.discard(job_id)
+
+        canonical_id = _best_match(row["minhash"], candidates, signatures, threshold)
+
+        if canonical_id:
+            row["canonical_job_id"] = canonical_id
+            continue
+
+        # Canonical rows of this batch become candidates for the rows after them
+        signatures[job_id] = row["minhash"]
+        for key in row_keys[job_id]:
+            buckets.setdefault(key, set()).add(job_id)
+
+    return changed_rows
+
+async def index_fingerprints(db, rows: List[Dict[str, Any]]) -> None:
+    """
+    Replace the LSH buckets of the given listings (canonical rows only)
+
+    Must run after the listings are written, since buckets reference them.
+
+    Args:
+        db: Database session (caller commits)
+        rows: Changed rows returned by assign_canonical_jobs
+    """
+    if not rows:
+        return
+
+    await db.execute(
+        delete(JobFingerprintBucket)
+        .where(JobFingerprintBucket.job_id.in_([row["job_id"] for row in rows]))
+    )
+
+    bucket_rows = [
+        {"band_key": key, "job_id": row["job_id"]}
+        for row in rows
+        if row.get("minhash") and not row.get("canonical_job_id")
+        for key in _minhasher.band_keys(row["minhash"])
+    ]
+
+    if bucket_rows:
+        await db.execute(pg_insert(JobFingerprintBucket).values(bucket_rows).on_conflict_do_nothing())
+
+async def filter_canonical_jobs(
+    jobs: List[Dict[str, Any]],
+    threshold: float = JOBS_DEDUP_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """
+    Drop duplicate jobs from a list before matching or delivery
+
+    Removes jobs the local index already links to a canonical listing, and
+    near-duplicates within the list itself (keeping the first occurrence).
+
+    Args:
+        jobs: Job dictionaries from the API
+        threshold: Minimum estimated Jaccard similarity for a duplicate
+
+    Returns:
+        List of canonical jobs, in the original order
+    """
+    if not jobs:
+        return jobs
+
+    duplicate_ids = set()
+
+    try:
+        async with get_db() as db:
+            result = await db.execute(
+                select(JobListing.job_id).where(
+                    JobListing.job_id.in_([str(job.get("id")) for job in jobs]),
+                    JobListing.canonical_job_id.isnot(None)
+                )
+            )
+            duplicate_ids = {job_id for (job_id,) in result.all()}
+    except Exception as e:
+        logger.error(f"Error loading duplicate job ids: {str(e)}")
+
+    canonical_jobs = []
+    kept_signatures = []
+
+    for job in jobs:
+        if str(job.get("id")) in duplicate_ids:
+            continue
+
+        signature = _minhasher.signature(shingle_hashes(normalize_job_text(job)))
+
+        if signature and any(
+            MinHasher.similarity(signature, kept) >= threshold for kept in kept_signatures
+        ):
+            continue
+
+        if signature:
+            kept_signatures.append(signature)
+        canonical_jobs.append(job)
+
+    return canonical_jobs
@@ -0,0 +1,264 @@
+# services/job_ingestion_service.py
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, Any
+
+from sqlalchemy import func
+from sqlalchemy.future import select
+
+from config.settings import JOBS_INGEST_PAGE_SIZE, JOBS_INGEST_MAX_PAGES
+from models.job import JobIngestionRun
+from services.job_listing_service import job_to_listing_values, bulk_upsert_job_listings, load_content_hashes
+from services.job_dedup_service import assign_canonical_jobs, index_fingerprints
+from services.job_vector_service import embed_listing_rows
+from utils.db import engine, get_db
+from utils.jobs_api import get_jobs_api_client
+
+logger = logging.getLogger(__name__)
+
+# Postgres advisory lock key held while a worker ingests and pushes listings
+INGESTION_LOCK_KEY = 728301
+
+@asynccontextmanager
+async def ingestion_lock() -> AsyncIterator[bool]:
+    """
+    Hold the ingestion lock, if no other worker does
+
+    A session-level advisory lock on a dedicated connection: it is held
+    until released here or until the connection closes, so a crashed
+    worker never keeps it.
+
+    Usage:
+        async with ingestion_lock() as acquired:
+            if acquired:
+                await ingest_jobs()
+
+    Yields:
+        Whether the lock was acquired
+    """
+    async with engine.connect() as connection:
+        acquired = (await connection.execute(select(func.pg_try_advisory_lock(INGESTION_LOCK_KEY)))).scalar()
+        # End the transaction; the lock belongs to the connection and outlives it
+        await connection.commit()
+
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                await connection.execute(select(func.pg_advisory_unlock(INGESTION_LOCK_KEY)))
+                await connection.commit()
+
+async def _start_or_resume_run() -> JobIngestionRun:
+    """
+    Resume the latest unfinished ingestion run, or start a new one that
+    stops at the watermark of the last completed run
+
+    Callers hold ingestion_lock, so a run still marked "running" belongs
+    to a worker that crashed and is safe to take over.
+
+    Returns:
+        JobIngestionRun record
+    """
+    async with get_db() as db:
+        result = await db.execute(
+            select(JobIngestionRun).order_by(JobIngestionRun.id.desc()).limit(1)
+        )
+        last_run = result.scalar_one_or_none()
+
+        if last_run and last_run.status in ("running", "paused", "failed"):
+            logger.info(f"Resuming job ingestion run {last_run.id} at offset {last_run.next_offset}")
+            last_run.status = "running"
+            last_run.error = None
+            await db.commit()
+            return last_run
+
+        run = JobIngestionRun(
+            status="running",
+            next_offset=0,
+            pages_fetched=0,
+            new_rows=0,
+            updated_rows=0,
+            stop_posted_date=last_run.watermark_posted_date if last_run else None,
+            stop_job_id=last_run.watermark_job_id if last_run else None
+        )
+
+        db.add(run)
+        await db.commit()
+        await db.refresh(run)
+
+        logger.info(f"Started job ingestion run {run.id} (watermark: {run.stop_posted_date}, {run.stop_job_id})")
+        return run
+
+async def get_push_watermark(run_id: int) -> datetime:
+    """
+    Get the time from which ingested listings still have to be pushed
+
+    This is when the last pushed run finished, so listings stored by
+    earlier invocations of a paused or failed run, or by a completed run
+    whose push failed, are still included. Before the first push it is the
+    start of the given run.
+
+    Args:
+        run_id: ID of the run that just completed
+
+    Returns:
+        Listings created at or after this time are to be pushed
+    """
+    async with get_db() as db:
+        result = await db.execute(
+            select(func.max(JobIngestionRun.finished_at)).where(JobIngestionRun.pushed_at.isnot(None))
+        )
+        watermark = result.scalar()
+
+        if watermark is None:
+            result = await db.execute(select(JobIngestionRun.started_at).where(JobIngestionRun.id == run_id))
+            watermark = result.scalar()
+
+    return watermark
+
+async def mark_run_pushed(run_id: int) -> None:
+    """Advance the push watermark to a completed run"""
+    async with get_db() as db:
+        result = await db.execute(select(JobIngestionRun).where(JobIngestionRun.id == run_id))
+        run = result.scalar_one()
+        run.pushed_at = datetime.utcnow()
+        await db.commit()
+
+def _reached_watermark(values: Dict[str, Any], run: JobIngestionRun) -> bool:
+    """Check whether a job is at or below the previous run's watermark"""
+    if run.stop_job_id and values["job_id"] == run.stop_job_id:
+        return True
+
+    if run.stop_posted_date and values["posted_date"]:
+        return values["posted_date"] < run.stop_posted_date
+
+    return False
+
+async def ingest_jobs(
+    page_size: int = JOBS_INGEST_PAGE_SIZE,
+    max_pages: int = JOBS_INGEST_MAX_PAGES
+) -> Dict[str, Any]:
+    """
+    Page through the Jobs API feed (newest first) until the watermark of the
+    previous completed run is reached, storing every page in job_listings
+
+    Progress is committed with each page, so a crashed or failed run is
+    resumed from its last committed offset on the next invocation. The
+    caller must hold ingestion_lock.
+
+    Args:
+        page_size: Jobs requested per page
+        max_pages: Maximum pages fetched in this invocation
+
+    Returns:
+        Dictionary of run stats
+    """
+    started = time.monotonic()
+    run = await _start_or_resume_run()
+    client = get_jobs_api_client()
+
+    watermark_date = run.watermark_posted_date
+    watermark_job_id = run.watermark_job_id
+    status = "completed"
+    error = None
+    duplicate_rows = 0
+
+    try:
+        for _ in range(max_pages):
+            jobs = await client.get_jobs({"limit": str(page_size), "offset": str(run.next_offset)})
+
+            if not jobs:
+                break
+
+            rows = []
+            reached_watermark = False
+
+            for job in jobs:
+                if not job.get("id"):
+                    continue
+
+                values = job_to_listing_values(job)
+
+                if _reached_watermark(values, run):
+                    reached_watermark = True
+                    break
+
+                rows.append(values)
+
+                if values["posted_date"] and (watermark_date is None or values["posted_date"] > watermark_date):
+                    watermark_date = values["posted_date"]
+                    watermark_job_id = values["job_id"]
+
+            # Embed new or changed listings outside the page transaction, so the
+            # provider call does not keep it open
+            async with get_db() as db:
+                stored_hashes = await load_content_hashes(db, [row["job_id"] for row in rows])
+
+            await embed_listing_rows(
+                rows,
+                [row for row in rows if stored_hashes.get(row["job_id"]) != row["content_hash"]]
+            )
+
+            async with get_db() as db:
+                # Fingerprint before writing so re-posts are stored linked to their canonical listing
+                changed_rows = await assign_canonical_jobs(db, rows)
+                duplicate_rows += sum(1 for row in changed_rows if row["canonical_job_id"])
+
+                new_count, updated_count = await bulk_upsert_job_listings(db, rows)
+                await index_fingerprints(db, changed_rows)
+
+                # Record progress in the same transaction as the page itself
+                result = await db.execute(select(JobIngestionRun).where(JobIngestionRun.id == run.id))
+                run = result.scalar_one()
+                run.next_offset += len(jobs)
+                run.pages_fetched += 1
+                run.new_rows += new_count
+                run.updated_rows += updated_count
+                run.watermark_posted_date = watermark_date
+                run.watermark_job_id = watermark_job_id
+
+                await db.commit()
+
+            if reached_watermark or len(jobs) < page_size:
+                break
+        else:
+            # Keep the run open so the next invocation continues where this one stopped
+            status = "paused"
+            logger.warning(f"Job ingestion run {run.id} hit the {max_pages} page cap")
+
+    except Exception as e:
+        status = "failed"
+        error = str(e)
+        logger.error(f"Job ingestion run {run.id} failed at offset {run.next_offset}: {error}")
+
+    async with get_db() as db:
+        result = await db.execute(select(JobIngestionRun).where(JobIngestionRun.id == run.id))
+        run = result.scalar_one()
+        run.status = status
+        run.error = error
+        run.elapsed_seconds = (run.elapsed_seconds or 0) + int(time.monotonic() - started)
+
+        if status == "completed":
+            run.finished_at = datetime.utcnow()
+
+            # Carry the previous watermark forward if nothing newer was seen
+            if run.watermark_posted_date is None and run.watermark_job_id is None:
+                run.watermark_posted_date = run.stop_posted_date
+                run.watermark_job_id = run.stop_job_id
+
+        await db.commit()
+
+    stats = {
+        "run_id": run.id,
+        "status": run.status,
+        "pages_fetched": run.pages_fetched,
+        "new_rows": run.new_rows,
+        "updated_rows": run.updated_rows,
+        "duplicate_rows": duplicate_rows,
+        "elapsed_seconds": run.elapsed_seconds
+    }
+
+    logger.info(f"Job ingestion run finished: {stats}")
+    return stats
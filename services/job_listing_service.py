@@ -0,0 +1,447 @@
+# services/job_listing_service.py
+import logging
+import json
+import base64
+import hashlib
+import re
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy import func, and_, or_, delete, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.future import select
+
+from config.settings import (
+    JOBS_LOCAL_MAX_AGE_MINUTES,
+    JOBS_QUERY_MAX_LIMIT,
+    JOBS_MATCH_CANDIDATE_LIMIT,
+    JOBS_UPSERT_BATCH_SIZE,
+    JOBS_RETENTION_DAYS
+)
+from models.job import JobListing, JobIngestionRun
+from utils.db import get_db
+
+logger = logging.getLogger(__name__)
+
+def parse_posted_date(value: Any) -> Optional[datetime]:
+    """
+    Parse a posted_date value from the Jobs API into a naive UTC datetime
+
+    Args:
+        value: ISO 8601 string, datetime or None
+
+    Returns:
+        datetime or None if missing/unparseable
+    """
+    if not value:
+        return None
+
+    if isinstance(value, datetime):
+        date_obj = value
+    else:
+        try:
+            date_obj = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    if date_obj.tzinfo is not None:
+        date_obj = date_obj.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return date_obj
+
+def _truncate(value: Any, length: int) -> Optional[str]:
+    """Convert a value to a string that fits a String(length) column"""
+    if value is None or value == "":
+        return None
+    return str(value)[:length]
+
+def compute_content_hash(job: Dict[str, Any]) -> str:
+    """
+    Compute a stable hash of a job's data to detect upstream changes
+
+    Args:
+        job: Job dictionary from the API
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    canonical = json.dumps(job, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def job_to_listing_values(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a Jobs API job dictionary to JobListing column values
+
+    Args:
+        job: Job dictionary from the API
+
+    Returns:
+        Dictionary of JobListing column values
+    """
+    return {
+        "job_id": str(job.get("id")),
+        "title": _truncate(job.get("title"), 255) or "",
+        "company": _truncate(job.get("company"), 255),
+        "location": _truncate(job.get("location"), 255),
+        "job_type": _truncate(job.get("job_type"), 100),
+        "experience": _truncate(job.get("experience"), 100),
+        "posted_date": parse_posted_date(job.get("posted_date")),
+        "job_data": job,
+        "content_hash": compute_content_hash(job)
+    }
+
+async def load_content_hashes(db, job_ids: List[str]) -> Dict[str, str]:
+    """
+    Get the stored content hash of listings
+
+    Args:
+        db: Database session
+        job_ids: Jobs API IDs
+
+    Returns:
+        Dictionary of job ID to content hash (listings not stored are absent)
+    """
+    if not job_ids:
+        return {}
+
+    result = await db.execute(
+        select(JobListing.job_id, JobListing.content_hash).where(JobListing.job_id.in_(job_ids))
+    )
+    return {job_id: content_hash for job_id, content_hash in result.all()}
+
+async def bulk_upsert_job_listings(
+    db,
+    rows: List[Dict[str, Any]],
+    batch_size: int = JOBS_UPSERT_BATCH_SIZE
+) -> Tuple[int, int]:
+    """
+    Insert or update job listings with batched INSERT ... ON CONFLICT (job_id)
+
+    Existing rows are only rewritten when their content_hash changed, so
+    unchanged listings cost nothing beyond the index lookup. Nothing is
+    loaded into Python except the returned (inserted) flags.
+
+    Args:
+        db: Database session (caller commits)
+        rows: JobListing column values from job_to_listing_values
+        batch_size: Rows per statement
+
+    Returns:
+        Tuple of (new rows, updated rows)
+    """
+    # A statement may not touch the same job_id twice; keep the last occurrence
+    unique_rows = list({row["job_id"]: row for row in rows}.values())
+
+    new_count = 0
+    updated_count = 0
+    now = datetime.utcnow()
+
+    for start in range(0, len(unique_rows), batch_size):
+        batch = [
+            {**row, "created_at": now, "updated_at": now}
+            for row in unique_rows[start:start + batch_size]
+        ]
+
+        stmt = pg_insert(JobListing).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobListing.job_id],
+            set_={
+                # Every supplied column except the key and the creation time
+                # (ingestion also supplies minhash and canonical_job_id)
+                column: stmt.excluded[column]
+                for column in batch[0]
+                if column not in ("job_id", "created_at")
+            },
+            where=JobListing.content_hash.is_distinct_from(stmt.excluded.content_hash)
+        ).returning(
+            # xmax is 0 only for freshly inserted tuples
+            literal_column("(xmax = 0)").label("inserted")
+        )
+
+        result = await db.execute(stmt)
+
+        for (inserted,) in result.fetchall():
+            if inserted:
+                new_count += 1
+            else:
+                updated_count += 1
+
+    return new_count, updated_count
+
+def encode_cursor(listing: JobListing) -> str:
+    """
+    Encode the keyset position of a listing as an opaque cursor
+
+    Args:
+        listing: Last JobListing on the current page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = {
+        "posted_date": listing.posted_date.isoformat() if listing.posted_date else None,
+        "id": listing.id
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Tuple of (posted_date, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        posted_date = payload.get("posted_date")
+        return (datetime.fromisoformat(posted_date) if posted_date else None), int(payload["id"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def _contains(column, value: str):
+    """Case-insensitive substring match with LIKE wildcards escaped"""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
+
+def _keyset_condition(posted_date: Optional[datetime], last_id: int, descending: bool):
+    """Build the WHERE clause selecting rows after the cursor (NULL dates sort last)"""
+    id_after = JobListing.id < last_id if descending else JobListing.id > last_id
+
+    if posted_date is None:
+        # Already inside the trailing block of undated listings
+        return and_(JobListing.posted_date.is_(None), id_after)
+
+    date_after = JobListing.posted_date < posted_date if descending else JobListing.posted_date > posted_date
+
+    return or_(
+        date_after,
+        and_(JobListing.posted_date == posted_date, id_after),
+        JobListing.posted_date.is_(None)
+    )
+
+async def query_job_listings(
+    limit: int = 10,
+    location: Optional[str] = None,
+    title: Optional[str] = None,
+    company: Optional[str] = None,
+    experience: Optional[str] = None,
+    job_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    order: str = "desc"
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Query the local job_listings table with the Jobs API filters
+
+    Text filters (location, title, company) are case-insensitive substring
+    matches served by trigram indexes; experience and job_type are exact
+    matches. Results are sorted by posted_date (then id) and paginated with
+    a keyset cursor.
+
+    Args:
+        limit: Page size (capped at JOBS_QUERY_MAX_LIMIT)
+        location: Filter by job location
+        title: Filter by job title
+        company: Filter by company name
+        experience: Filter by experience level
+        job_type: Filter by job type
+        cursor: Cursor returned by the previous page
+        order: "desc" for newest first, "asc" for oldest first
+
+    Returns:
+        Tuple of (list of job dictionaries, next cursor or None)
+    """
+    limit = max(1, min(limit, JOBS_QUERY_MAX_LIMIT))
+    descending = order != "asc"
+
+    # Near-duplicate re-posts are only reachable through their canonical listing
+    query = select(JobListing).where(JobListing.canonical_job_id.is_(None))
+
+    if location:
+        query = query.where(_contains(JobListing.location, location))
+    if title:
+        query = query.where(_contains(JobListing.title, title))
+    if company:
+        query = query.where(_contains(JobListing.company, company))
+    if experience:
+        query = query.where(JobListing.experience == experience)
+    if job_type:
+        query = query.where(JobListing.job_type == job_type)
+
+    if cursor:
+        posted_date, last_id = decode_cursor(cursor)
+        query = query.where(_keyset_condition(posted_date, last_id, descending))
+
+    if descending:
+        query = query.order_by(JobListing.posted_date.desc().nullslast(), JobListing.id.desc())
+    else:
+        query = query.order_by(JobListing.posted_date.asc().nullslast(), JobListing.id.asc())
+
+    # Fetch one extra row to know whether another page exists
+    query = query.limit(limit + 1)
+
+    async with get_db() as db:
+        result = await db.execute(query)
+        listings = result.scalars().all()
+
+    next_cursor = encode_cursor(listings[limit - 1]) if len(listings) > limit else None
+
+    return [listing.job_data for listing in listings[:limit]], next_cursor
+
+async def load_match_candidates(
+    location: Optional[str] = None,
+    experience: Optional[str] = None,
+    limit: int = JOBS_MATCH_CANDIDATE_LIMIT
+) -> List[Dict[str, Any]]:
+    """
+    Load canonical listings from the local catalogue as matching candidates
+
+    Args:
+        location: Filter by location (substring, case-insensitive)
+        experience: Filter by experience level
+        limit: Maximum number of candidates (newest first)
+
+    Returns:
+        List of job dictionaries
+    """
+    query = select(JobListing.job_data).where(JobListing.canonical_job_id.is_(None))
+
+    if location:
+        query = query.where(_contains(JobListing.location, location))
+    if experience:
+        query = query.where(JobListing.experience == experience)
+
+    query = query.order_by(JobListing.posted_date.desc().nullslast(), JobListing.id.desc()).limit(limit)
+
+    async with get_db() as db:
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+def build_prefix_tsquery(text_query: str) -> Optional[str]:
+    """
+    Turn free text into a to_tsquery expression with prefix matching
+
+    Every word must match (AND) and the last word is also matched as a
+    prefix, so partial input like "python dev" finds "developer".
+
+    Args:
+        text_query: User search text
+
+    Returns:
+        tsquery string or None if the text has no searchable words
+    """
+    words = re.findall(r"\w+", text_query.lower())
+
+    if not words:
+        return None
+
+    terms = words[:-1] + [f"{words[-1]}:*"]
+    return " & ".join(terms)
+
+async def search_job_listings(
+    text_query: str,
+    limit: int = 10,
+    offset: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Full-text search over job listings (title, company, skills, description)
+
+    Matches use the GIN-indexed search_vector; only matching rows are
+    ranked (ts_rank_cd with title > company/skills > description weights).
+
+    Args:
+        text_query: Free text search query
+        limit: Maximum results (capped at JOBS_QUERY_MAX_LIMIT)
+        offset: Number of ranked results to skip
+
+    Returns:
+        List of job dictionaries with a search_rank field, best first
+    """
+    tsquery_text = build_prefix_tsquery(text_query)
+
+    if not tsquery_text:
+        return []
+
+    limit = max(1, min(limit, JOBS_QUERY_MAX_LIMIT))
+    tsquery = func.to_tsquery("english", tsquery_text)
+    rank = func.ts_rank_cd(JobListing.search_vector, tsquery).label("rank")
+
+    query = (
+        select(JobListing.job_data, rank)
+        .where(
+            JobListing.search_vector.op("@@")(tsquery),
+            JobListing.canonical_job_id.is_(None)
+        )
+        .order_by(rank.desc(), JobListing.posted_date.desc().nullslast())
+        .offset(max(0, offset))
+        .limit(limit)
+    )
+
+    async with get_db() as db:
+        result = await db.execute(query)
+        rows = result.all()
+
+    return [{**job_data, "search_rank": round(float(score), 4)} for job_data, score in rows]
+
+async def is_local_data_fresh(max_age_minutes: int = JOBS_LOCAL_MAX_AGE_MINUTES) -> bool:
+    """
+    Check whether the local job listings were refreshed recently
+
+    Uses the last completed ingestion run rather than listing timestamps,
+    since unchanged listings are not rewritten on ingest.
+
+    Args:
+        max_age_minutes: Maximum age of the last completed ingestion run
+
+    Returns:
+        True if the local table can be served instead of the upstream API
+    """
+    try:
+        async with get_db() as db:
+            result = await db.execute(
+                select(func.max(JobIngestionRun.finished_at))
+                .where(JobIngestionRun.status == "completed")
+            )
+            last_update = result.scalar()
+
+        if last_update is None:
+            return False
+
+        return datetime.utcnow() - last_update < timedelta(minutes=max_age_minutes)
+
+    except Exception as e:
+        logger.error(f"Error checking local job data freshness: {str(e)}")
+        return False
+
+async def purge_expired_job_listings(retention_days: int = JOBS_RETENTION_DAYS) -> int:
+    """
+    Delete listings past the retention window in a single set-based DELETE
+
+    Listings are aged by posted_date, or by created_at when the upstream
+    feed gave no posted_date. Both predicates are index-backed.
+
+    Args:
+        retention_days: Number of days to keep listings
+
+    Returns:
+        Number of deleted listings
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+    async with get_db() as db:
+        result = await db.execute(
+            delete(JobListing).where(
+                or_(
+                    JobListing.posted_date < cutoff,
+                    and_(JobListing.posted_date.is_(None), JobListing.created_at < cutoff)
+                )
+            )
+        )
+        await db.commit()
+
+    return result.rowcount
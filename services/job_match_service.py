@@ -0,0 +1,401 @@
+# services/job_match_service.py
+import logging
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.future import select
+
+from config.settings import JOB_MATCH_TTL_HOURS, JOBS_MATCH_TOP_K
+from models.job import JobMatch
+from services.job_listing_service import compute_content_hash
+from utils.db import get_db
+from utils.validators import coerce_percentage
+
+logger = logging.getLogger(__name__)
+
+# Values of JobMatch.user_feedback set by the job card buttons
+FEEDBACK_SAVED = "saved"
+FEEDBACK_NOT_INTERESTED = "not_interested"
+
+def compute_resume_hash(resume_data: Dict[str, Any]) -> str:
+    """
+    Compute a stable hash of parsed resume data (the resume "version")
+
+    Args:
+        resume_data: Parsed resume data
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    canonical = json.dumps(resume_data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _match_to_dict(match: JobMatch, job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "job_id": match.job_id,
+        "match_percentage": match.match_percentage,
+        "match_reasons": match.match_reasons,
+        "job_data": job
+    }
+
+async def load_cached_matches(
+    user_id: int,
+    resume_hash: str,
+    jobs: List[Dict[str, Any]],
+    ttl_hours: int = JOB_MATCH_TTL_HOURS
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Load stored matches that are still valid for the given jobs
+
+    A stored match is reused only if it was scored by the LLM against the
+    same resume version and the same job content, within the TTL.
+
+    Args:
+        user_id: User ID
+        resume_hash: Hash of the current resume data
+        jobs: Candidate jobs
+        ttl_hours: Maximum age of a reusable match
+
+    Returns:
+        Dictionary of job ID to match dictionary
+    """
+    jobs_by_id = {str(job.get("id")): job for job in jobs if job.get("id")}
+
+    if not jobs_by_id:
+        return {}
+
+    async with get_db() as db:
+        result = await db.execute(
+            select(JobMatch).where(
+                JobMatch.user_id == user_id,
+                JobMatch.resume_hash == resume_hash,
+                JobMatch.job_id.in_(list(jobs_by_id)),
+                JobMatch.source.is_distinct_from("skills"),
+                JobMatch.source.is_distinct_from("cluster"),
+                JobMatch.created_at >= datetime.utcnow() - timedelta(hours=ttl_hours)
+            )
+        )
+        matches = result.scalars().all()
+
+    return {
+        match.job_id: _match_to_dict(match, jobs_by_id[match.job_id])
+        for match in matches
+        if match.job_content_hash == compute_content_hash(jobs_by_id[match.job_id])
+    }
+
+async def save_matches(
+    user_id: int,
+    resume_hash: str,
+    matches: List[Dict[str, Any]],
+    jobs_by_id: Dict[str, Dict[str, Any]],
+    source: str = "llm"
+) -> None:
+    """
+    Store freshly scored matches (replacing any older score for the same
+    user, resume version and job)
+
+    Args:
+        user_id: User ID
+        resume_hash: Hash of the resume data the matches were scored against
+        matches: Match dictionaries with job_id, match_percentage and match_reasons
+        jobs_by_id: Candidate jobs by job ID
+        source: "llm", or "cluster" for scores adjusted from a similar
+            user's ranking (these never replace an LLM score)
+    """
+    now = datetime.utcnow()
+    rows = {}
+
+    for match in matches:
+        job_id = str(match.get("job_id"))
+        job = jobs_by_id.get(job_id)
+
+        if job is None:
+            continue
+
+        match_percentage = coerce_percentage(match.get("match_percentage"))
+
+        if match_percentage is None:
+            continue
+
+        rows[job_id] = {
+            "user_id": user_id,
+            "job_id": job_id,
+            "resume_hash": resume_hash,
+            "job_content_hash": compute_content_hash(job),
+            "match_percentage": match_percentage,
+            "match_reasons": match.get("match_reasons"),
+            "source": source,
+            "job_data": job,
+            "created_at": now
+        }
+
+    if not rows:
+        return
+
+    stmt = pg_insert(JobMatch).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        constraint="uix_user_resume_job_match",
+        set_={
+            "job_content_hash": stmt.excluded.job_content_hash,
+            "match_percentage": stmt.excluded.match_percentage,
+            "match_reasons": stmt.excluded.match_reasons,
+            "source": stmt.excluded.source,
+            "job_data": stmt.excluded.job_data,
+            "created_at": stmt.excluded.created_at
+        },
+        where=None if source == "llm" else JobMatch.source.is_distinct_from("llm")
+    )
+
+    async with get_db() as db:
+        await db.execute(stmt)
+        await db.commit()
+
+async def append_pending_matches(rows: List[Dict[str, Any]]) -> int:
+    """
+    Store matches pushed by the skill scorer as pending (not yet sent)
+
+    An existing match for the same user, resume version and job is kept,
+    so a pushed score never replaces an LLM score.
+
+    Args:
+        rows: JobMatch column values (user_id, job_id, resume_hash,
+              job_content_hash, match_percentage, match_reasons, job_data)
+
+    Returns:
+        Number of stored matches
+    """
+    if not rows:
+        return 0
+
+    now = datetime.utcnow()
+    stmt = pg_insert(JobMatch).values([
+        {**row, "source": "skills", "sent_to_user": False, "created_at": now}
+        for row in rows
+    ])
+    stmt = stmt.on_conflict_do_nothing(constraint="uix_user_resume_job_match").returning(JobMatch.id)
+
+    async with get_db() as db:
+        result = await db.execute(stmt)
+        stored = len(result.fetchall())
+        await db.commit()
+
+    return stored
+
+async def load_pending_matches(
+    users: List[Any],
+    top_n: int = JOBS_MATCH_TOP_K,
+    ttl_hours: int = JOB_MATCH_TTL_HOURS
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Load the jobs pushed to users since their last update
+
+    Args:
+        users: Users with resume data
+        top_n: Jobs kept per user
+        ttl_hours: Maximum age of a pending match
+
+    Returns:
+        Dictionary of user ID to job dictionaries (best pushed score first)
+    """
+    resume_hashes = {user.id: compute_resume_hash(user.resume_data) for user in users if user.resume_data}
+
+    if not resume_hashes:
+        return {}
+
+    async with get_db() as db:
+        result = await db.execute(
+            select(JobMatch.user_id, JobMatch.resume_hash, JobMatch.job_data).where(
+                JobMatch.user_id.in_(list(resume_hashes)),
+                JobMatch.source == "skills",
+                JobMatch.sent_to_user.is_(False),
+                JobMatch.created_at >= datetime.utcnow() - timedelta(hours=ttl_hours)
+            ).order_by(JobMatch.match_percentage.desc())
+        )
+        rows = result.all()
+
+    pending = {}
+
+    for user_id, resume_hash, job_data in rows:
+        # Matches pushed against an older resume are no longer relevant
+        if resume_hash == resume_hashes[user_id] and job_data and len(pending.setdefault(user_id, [])) < top_n:
+            pending[user_id].append(job_data)
+
+    return pending
+
+async def mark_matches_sent(user_id: int, job_ids: List[str]) -> None:
+    """
+    Flag a user's matches for the given jobs as sent
+
+    Args:
+        user_id: User ID
+        job_ids: IDs of the jobs sent to the user
+    """
+    if not job_ids:
+        return
+
+    async with get_db() as db:
+        await db.execute(
+            update(JobMatch)
+            .where(JobMatch.user_id == user_id, JobMatch.job_id.in_([str(job_id) for job_id in job_ids]))
+            .values(sent_to_user=True)
+        )
+        await db.commit()
+
+async def record_match_feedback(user_id: int, job_id: str, feedback: str) -> int:
+    """
+    Store a user's reaction to a job on their matches for it
+
+    Args:
+        user_id: User ID
+        job_id: Job ID
+        feedback: FEEDBACK_SAVED or FEEDBACK_NOT_INTERESTED
+
+    Returns:
+        Number of matches updated (0 if the job was never matched, e.g.
+        a search result)
+    """
+    async with get_db() as db:
+        result = await db.execute(
+            update(JobMatch)
+            .where(JobMatch.user_id == user_id, JobMatch.job_id == str(job_id))
+            .values(user_feedback=feedback)
+        )
+        await db.commit()
+
+    return result.rowcount
+
+async def match_jobs_with_cache(
+    user_id: int,
+    resume_data: Dict[str, Any],
+    jobs: List[Dict[str, Any]],
+    matcher,
+    on_match: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Score jobs against a resume, sending only jobs without a valid stored
+    match to the LLM
+
+    With on_match, matches are handed over as the matcher streams them in,
+    merged with the stored matches so the callback sees them best first
+    (stored matches scoring at least as high as a streamed one go before
+    it, the rest after the stream ends).
+
+    Args:
+        user_id: User ID
+        resume_data: Parsed resume data
+        jobs: Candidate jobs (best first)
+        matcher: Async callable (jobs, resume_data[, on_match]) -> list of matches
+        on_match: Optional async callback receiving each scored match
+
+    Returns:
+        Matches sorted by match_percentage (best first), followed by any
+        jobs that could not be scored (as {"job_id", "job_data"})
+    """
+    resume_hash = compute_resume_hash(resume_data)
+    jobs_by_id = {str(job.get("id")): job for job in jobs if job.get("id")}
+
+    try:
+        cached = await load_cached_matches(user_id, resume_hash, jobs)
+    except Exception as e:
+        logger.error(f"Error loading stored matches for user {user_id}: {str(e)}")
+        cached = {}
+
+    unscored = [job for job_id, job in jobs_by_id.items() if job_id not in cached]
+    scored = dict(cached)
+    waiting = sorted(cached.values(), key=lambda match: match.get("match_percentage") or 0, reverse=True)
+    delivered = set()
+
+    def accept(match: Any) -> Optional[Dict[str, Any]]:
+        if not isinstance(match, dict) or str(match.get("job_id")) not in jobs_by_id:
+            return None
+
+        match_percentage = coerce_percentage(match.get("match_percentage"))
+
+        if match_percentage is None:
+            return None
+
+        job_id = str(match["job_id"])
+        return {**match, "job_id": job_id, "match_percentage": match_percentage, "job_data": jobs_by_id[job_id]}
+
+    async def deliver(match: Dict[str, Any]) -> None:
+        delivered.add(match["job_id"])
+
+        try:
+            await on_match(match)
+        except Exception as e:
+            logger.error(f"Error delivering match {match['job_id']} to user {user_id}: {str(e)}")
+
+    async def deliver_cached(min_percentage: float) -> None:
+        while waiting and (waiting[0].get("match_percentage") or 0) >= min_percentage:
+            await deliver(waiting.pop(0))
+
+    async def deliver_streamed(match: Dict[str, Any]) -> None:
+        match = accept(match)
+
+        if match and match["job_id"] not in delivered:
+            await deliver_cached(match["match_percentage"])
+            await deliver(match)
+
+    if unscored:
+        logger.info(f"Scoring {len(unscored)} new jobs for user {user_id} ({len(cached)} reused)")
+
+        new_matches = []
+        results = await (
+            matcher(unscored, resume_data, on_match=deliver_streamed) if on_match
+            else matcher(unscored, resume_data)
+        )
+
+        for match in results:
+            match = accept(match)
+
+            if match is None:
+                continue
+
+            scored[match["job_id"]] = match
+            new_matches.append(match)
+
+        try:
+            await save_matches(user_id, resume_hash, new_matches, jobs_by_id)
+        except Exception as e:
+            logger.error(f"Error storing matches for user {user_id}: {str(e)}")
+    else:
+        logger.info(f"Reusing {len(cached)} stored matches for user {user_id}")
+
+    if on_match:
+        await deliver_cached(float("-inf"))
+
+    ranked = sorted(scored.values(), key=lambda match: match.get("match_percentage") or 0, reverse=True)
+
+    # Jobs the LLM did not score keep their retrieval order after the scored ones
+    ranked.extend(
+        {"job_id": job_id, "job_data": job}
+        for job_id, job in jobs_by_id.items()
+        if job_id not in scored
+    )
+
+    return ranked
+
+async def purge_stale_job_matches(ttl_hours: int = JOB_MATCH_TTL_HOURS) -> int:
+    """
+    Delete expired matches, keeping those that carry user feedback
+
+    Args:
+        ttl_hours: Age after which a stored match is no longer reused
+
+    Returns:
+        Number of deleted matches
+    """
+    async with get_db() as db:
+        result = await db.execute(
+            delete(JobMatch).where(
+                JobMatch.created_at < datetime.utcnow() - timedelta(hours=ttl_hours),
+                JobMatch.user_feedback.is_(None)
+            )
+        )
+        await db.commit()
+
+    return result.rowcount
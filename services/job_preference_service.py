@@ -0,0 +1,234 @@
+# services/job_preference_service.py
+import logging
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.future import select
+
+from models.job import JobSearchPreference
+from utils.db import get_db
+
+logger = logging.getLogger(__name__)
+
+# Salary unit multipliers (salaries are compared as annual amounts)
+SALARY_UNITS = (
+    (re.compile(r"\b(crores?|cr)\b"), 10000000),
+    (re.compile(r"\b(lpa|lakhs?|lacs?|l)\b"), 100000),
+    (re.compile(r"\d\s*k\b"), 1000)
+)
+_monthly_pattern = re.compile(r"\b(per month|month|monthly|pm|p\.m\.)\b")
+_number_pattern = re.compile(r"\d+(?:\.\d+)?")
+_remote_pattern = re.compile(r"\b(remote|work from home|wfh|anywhere)\b")
+_hybrid_pattern = re.compile(r"\bhybrid\b")
+_non_alnum_pattern = re.compile(r"[^a-z0-9]+")
+
+def _normalize(value: Any) -> str:
+    """Lowercase a value and collapse punctuation ("Full-Time" -> "full time")"""
+    return _non_alnum_pattern.sub(" ", str(value or "").lower()).strip()
+
+def parse_salary(value: Any) -> Optional[float]:
+    """
+    Parse the upper end of a salary ("12-18 LPA", "50k per month", "800000")
+
+    Returns:
+        Annual amount, or None if missing/unparseable
+    """
+    text = str(value or "").lower().replace(",", "")
+    numbers = [float(number) for number in _number_pattern.findall(text)]
+
+    if not numbers:
+        return None
+
+    amount = max(numbers)
+
+    for pattern, multiplier in SALARY_UNITS:
+        if pattern.search(text):
+            amount *= multiplier
+            break
+
+    if _monthly_pattern.search(text):
+        amount *= 12
+
+    return amount
+
+class JobFeatureTable:
+    """
+    Column arrays of the job fields preferences filter on, built once per
+    catalogue so each preference compiles to a handful of vectorized
+    comparisons
+    """
+
+    def __init__(self, jobs: List[Dict[str, Any]]):
+        self.size = len(jobs)
+        self.location = np.array([_normalize(job.get("location")) for job in jobs], dtype=str)
+        self.job_type = np.array([_normalize(job.get("job_type")) for job in jobs], dtype=str)
+        # Space-padded so excluded names can be matched as whole words
+        self.company = np.array([f" {_normalize(job.get('company'))} " for job in jobs], dtype=str)
+        self.industry = np.array(
+            [_normalize(job.get("industry") or job.get("about_company")) for job in jobs],
+            dtype=str
+        )
+
+        salaries = [parse_salary(job.get("salary")) for job in jobs]
+        self.salary = np.array([np.nan if salary is None else salary for salary in salaries], dtype=np.float64)
+
+        work_mode = [_normalize(" ".join(str(job.get(field) or "") for field in ("location", "job_type", "title"))) for job in jobs]
+        self.remote = np.array([bool(_remote_pattern.search(text)) for text in work_mode], dtype=bool)
+        self.hybrid = np.array([bool(_hybrid_pattern.search(text)) for text in work_mode], dtype=bool)
+
+def _contains_any(column: np.ndarray, needles: Tuple[str, ...]) -> np.ndarray:
+    """Rows of a string column containing at least one needle"""
+    found = np.zeros(len(column), dtype=bool)
+    for needle in needles:
+        found |= np.char.find(column, needle) >= 0
+    return found
+
+class JobPreferenceFilter:
+    """
+    A user's JobSearchPreference compiled to a job predicate
+
+    Fields the user left empty do not filter, and a job missing the field
+    a preference checks is kept (the catalogue is too sparse to exclude on
+    missing data). Excluded companies always apply.
+    """
+
+    def __init__(
+        self,
+        locations: Optional[List[str]] = None,
+        job_types: Optional[List[str]] = None,
+        min_salary: Optional[int] = None,
+        industries: Optional[List[str]] = None,
+        excluded_companies: Optional[List[str]] = None,
+        remote_preference: Optional[str] = None
+    ):
+        self.locations = tuple(sorted({_normalize(value) for value in locations or [] if _normalize(value)}))
+        self.job_types = tuple(sorted({_normalize(value) for value in job_types or [] if _normalize(value)}))
+        self.min_salary = float(min_salary) if min_salary else None
+        self.industries = tuple(sorted({_normalize(value) for value in industries or [] if _normalize(value)}))
+        self.excluded_companies = tuple(sorted({_normalize(value) for value in excluded_companies or [] if _normalize(value)}))
+
+        remote_preference = _normalize(remote_preference)
+        self.remote_preference = remote_preference if remote_preference in ("remote", "hybrid", "on site", "onsite") else None
+
+    @classmethod
+    def from_model(cls, preference: JobSearchPreference) -> "JobPreferenceFilter":
+        return cls(
+            locations=preference.locations,
+            job_types=preference.job_types,
+            min_salary=preference.min_salary,
+            industries=preference.industries,
+            excluded_companies=preference.excluded_companies,
+            remote_preference=preference.remote_preference
+        )
+
+    @property
+    def key(self) -> tuple:
+        """Hashable identity (users with equal keys share one mask)"""
+        return (
+            self.locations, self.job_types, self.min_salary,
+            self.industries, self.excluded_companies, self.remote_preference
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not any(self.key)
+
+    def mask(self, table: JobFeatureTable) -> np.ndarray:
+        """
+        Evaluate the predicate over a whole catalogue
+
+        Args:
+            table: Feature table of the catalogue
+
+        Returns:
+            Boolean array, True for jobs the user accepts
+        """
+        allowed = np.ones(table.size, dtype=bool)
+
+        if self.excluded_companies:
+            # "infosys" excludes "Infosys Limited" and "Infosys BPM", but not "Infosystems"
+            allowed &= ~_contains_any(table.company, tuple(f" {company} " for company in self.excluded_companies))
+
+        if self.job_types:
+            allowed &= np.isin(table.job_type, self.job_types) | (table.job_type == "")
+
+        if self.min_salary:
+            allowed &= np.isnan(table.salary) | (table.salary >= self.min_salary)
+
+        if self.industries:
+            allowed &= _contains_any(table.industry, self.industries) | (table.industry == "")
+
+        if self.remote_preference == "remote":
+            allowed &= table.remote
+        elif self.remote_preference in ("on site", "onsite"):
+            allowed &= ~table.remote
+
+        if self.locations:
+            # Remote jobs satisfy a location preference unless the user wants on-site work
+            location_ok = _contains_any(table.location, self.locations) | (table.location == "")
+            if self.remote_preference not in ("on site", "onsite"):
+                location_ok |= table.remote
+            allowed &= location_ok
+
+        return allowed
+
+    def filter_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop the jobs the user excluded (same rules as mask)"""
+        if not jobs:
+            return jobs
+        return [job for job, allowed in zip(jobs, self.mask(JobFeatureTable(jobs))) if allowed]
+
+def compile_masks(
+    filters: Dict[int, JobPreferenceFilter],
+    table: JobFeatureTable
+) -> Dict[int, np.ndarray]:
+    """
+    Compile per-user bitsets over a catalogue, evaluating each distinct
+    preference once
+
+    Args:
+        filters: Dictionary of user ID to preference filter
+        table: Feature table of the catalogue
+
+    Returns:
+        Dictionary of user ID to boolean mask
+    """
+    masks_by_key = {}
+    masks = {}
+
+    for user_id, preference in filters.items():
+        if preference.key not in masks_by_key:
+            masks_by_key[preference.key] = preference.mask(table)
+        masks[user_id] = masks_by_key[preference.key]
+
+    return masks
+
+async def load_preference_filters(user_ids: List[int]) -> Dict[int, JobPreferenceFilter]:
+    """
+    Load and compile the job search preferences of many users
+
+    Args:
+        user_ids: User IDs
+
+    Returns:
+        Dictionary of user ID to filter; users without (non-empty)
+        preferences are left out
+    """
+    if not user_ids:
+        return {}
+
+    async with get_db() as db:
+        result = await db.execute(
+            select(JobSearchPreference).where(JobSearchPreference.user_id.in_(list(user_ids)))
+        )
+        preferences = result.scalars().all()
+
+    filters = {}
+
+    for preference in preferences:
+        preference_filter = JobPreferenceFilter.from_model(preference)
+        if not preference_filter.is_empty:
+            filters[preference.user_id] = preference_filter
+
+    return filters
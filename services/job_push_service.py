@@ -0,0 +1,172 @@
+# services/job_push_service.py
+import logging
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.future import select
+
+from config.settings import JOBS_MATCH_TOP_K, JOBS_PUSH_MIN_SCORE
+from models.job import JobListing, UserMatchTerm
+from models.subscription import Subscription
+from models.user import User
+from services.job_listing_service import compute_content_hash
+from services.job_match_service import compute_resume_hash, append_pending_matches
+from services.job_preference_service import load_preference_filters
+from services.skill_scoring_service import (
+    JOB_SKILL_FIELD_WEIGHTS,
+    resume_skills,
+    resume_match_terms,
+    job_match_terms,
+    score_users_by_skills
+)
+from utils.db import get_db
+
+logger = logging.getLogger(__name__)
+
+# Longest term stored in the index (matches UserMatchTerm.term)
+MAX_TERM_LENGTH = 100
+# Skills named in the reason of a pushed match
+REASON_SKILLS = 5
+
+async def index_user_terms(db, user_id: int, resume_data: Dict[str, Any]) -> None:
+    """
+    Replace a user's entries in the term -> users index
+
+    Args:
+        db: Database session (caller commits)
+        user_id: User ID
+        resume_data: Parsed resume data
+    """
+    await db.execute(delete(UserMatchTerm).where(UserMatchTerm.user_id == user_id))
+
+    terms = [term for term in resume_match_terms(resume_data or {}) if len(term) <= MAX_TERM_LENGTH]
+
+    if terms:
+        await db.execute(
+            pg_insert(UserMatchTerm)
+            .values([{"term": term, "user_id": user_id} for term in terms])
+            .on_conflict_do_nothing()
+        )
+
+async def rebuild_user_term_index() -> int:
+    """
+    Index every user with a resume (backfill for resumes uploaded before the index existed)
+
+    Returns:
+        Number of indexed users
+    """
+    async with get_db() as db:
+        result = await db.execute(select(User.id, User.resume_data).where(User.has_resume == True))
+        users = result.all()
+
+        for user_id, resume_data in users:
+            await index_user_terms(db, user_id, resume_data)
+
+        await db.commit()
+
+    return len(users)
+
+def _interested_users_query(terms: List[str]):
+    """
+    Select the subscribed users indexed under at least one of the terms
+
+    Both conditions are IN subqueries rather than joins, so a user with
+    several active subscriptions or matching terms is returned once without
+    a DISTINCT (which Postgres cannot apply to the JSON resume column).
+    """
+    interested = select(UserMatchTerm.user_id).where(UserMatchTerm.term.in_(terms))
+    subscribed = select(Subscription.user_id).where(
+        Subscription.is_active == True,
+        Subscription.end_date > datetime.utcnow()
+    )
+
+    return select(User).where(
+        User.has_resume == True,
+        User.id.in_(interested),
+        User.id.in_(subscribed)
+    )
+
+async def _find_interested_users(db, terms: List[str]) -> List[User]:
+    """Get the subscribed users indexed under at least one of the terms"""
+    result = await db.execute(_interested_users_query(terms))
+    return list(result.scalars().all())
+
+def _match_reason(skills: List[str], job: Dict[str, Any]) -> Optional[str]:
+    common = [skill for skill in skills if skill in job_match_terms(job, JOB_SKILL_FIELD_WEIGHTS)]
+    return f"Skills in common: {', '.join(common[:REASON_SKILLS])}" if common else None
+
+async def push_new_job_matches(
+    since: datetime,
+    top_n: int = JOBS_MATCH_TOP_K,
+    min_score: float = JOBS_PUSH_MIN_SCORE
+) -> Dict[str, Any]:
+    """
+    Score newly ingested listings against the users they concern
+
+    The index lookup narrows the users to those sharing a skill or title
+    term with the new listings, so the cost is new jobs x interested users
+    rather than all users x all jobs. Matches above min_score are appended
+    to the users' pending matches, picked up by the next job update.
+
+    Args:
+        since: Listings inserted at or after this time are new
+        top_n: Maximum matches pushed per user
+        min_score: Minimum skill score (0-1) for a pushed match
+
+    Returns:
+        Dictionary of push stats
+    """
+    started = time.monotonic()
+
+    async with get_db() as db:
+        result = await db.execute(
+            select(JobListing.job_data).where(
+                JobListing.created_at >= since,
+                JobListing.canonical_job_id.is_(None)
+            )
+        )
+        jobs = list(result.scalars().all())
+
+        terms = set()
+        for job in jobs:
+            terms |= job_match_terms(job)
+
+        users = await _find_interested_users(db, sorted(terms)) if terms else []
+
+    user_resumes = {user.id: user.resume_data for user in users if user.resume_data}
+    preferences = await load_preference_filters(list(user_resumes))
+    scored = score_users_by_skills(user_resumes, jobs, top_n, preferences)
+    rows = []
+
+    for user_id, ranked in scored.items():
+        resume_data = user_resumes[user_id]
+        resume_hash = compute_resume_hash(resume_data)
+        skills = resume_skills(resume_data)
+
+        for job, score in ranked:
+            if score < min_score:
+                continue
+
+            rows.append({
+                "user_id": user_id,
+                "job_id": str(job.get("id")),
+                "resume_hash": resume_hash,
+                "job_content_hash": compute_content_hash(job),
+                "match_percentage": int(round(score * 100)),
+                "match_reasons": _match_reason(skills, job),
+                "job_data": job
+            })
+
+    stats = {
+        "new_jobs": len(jobs),
+        "terms": len(terms),
+        "interested_users": len(user_resumes),
+        "pushed_matches": await append_pending_matches(rows),
+        "elapsed_seconds": round(time.monotonic() - started, 2)
+    }
+
+    logger.info(f"Pushed new job matches: {stats}")
+    return stats
@@ -0,0 +1,262 @@
+# services/job_ranking_service.py
+import logging
+import re
+from collections import Counter
+from functools import cached_property
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from config.settings import JOBS_MATCH_TOP_K, JOBS_CACHE_TTL
+from utils.cache import LRUCache
+from services.job_listing_service import load_match_candidates
+from services.job_preference_service import JobFeatureTable
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Field weights (a term in the title counts as much as three in the description)
+JOB_FIELD_WEIGHTS = {
+    "title": 3,
+    "education_and_skills": 2,
+    "job_description": 1
+}
+RESUME_SKILL_WEIGHT = 3
+RESUME_TITLE_WEIGHT = 2
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being but by can could did do does
+for from had has have having he her here his how i if in into is it its job jobs looking may
+more most must need not of on or our out over per role should so such than that the their them
+then there these they this those to under up us using very was we were what when where which
+while who will with within work working would you your
+""".split())
+
+_token_pattern = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+def tokenize(text: Any) -> List[str]:
+    """
+    Split text into lowercase terms, keeping tokens like c++, c# and node.js
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms without stopwords
+    """
+    if not text:
+        return []
+
+    if isinstance(text, (list, tuple)):
+        text = " ".join(str(item) for item in text if item)
+
+    return [term for term in _token_pattern.findall(str(text).lower()) if term not in STOPWORDS]
+
+def job_terms(job: Dict[str, Any]) -> List[str]:
+    """Get the weighted terms of a job (weights applied by repetition)"""
+    terms = []
+
+    for field, weight in JOB_FIELD_WEIGHTS.items():
+        terms.extend(tokenize(job.get(field)) * weight)
+
+    return terms
+
+def resume_query_terms(resume_data: Dict[str, Any]) -> Counter:
+    """
+    Build the weighted BM25 query for a parsed resume
+
+    Skills and past job titles dominate; the summary, responsibilities and
+    project technologies add context.
+
+    Args:
+        resume_data: Parsed resume data
+
+    Returns:
+        Counter of query term weights
+    """
+    query = Counter()
+
+    skills = resume_data.get("skills") or {}
+    if isinstance(skills, dict):
+        skills = [item for values in skills.values() if isinstance(values, list) for item in values]
+
+    for term in tokenize(skills):
+        query[term] += RESUME_SKILL_WEIGHT
+
+    for job in resume_data.get("work_experience") or []:
+        if not isinstance(job, dict):
+            continue
+
+        for term in tokenize(job.get("title")):
+            query[term] += RESUME_TITLE_WEIGHT
+        for term in tokenize(job.get("responsibilities")):
+            query[term] += 1
+
+    for project in resume_data.get("projects") or []:
+        if isinstance(project, dict):
+            for term in tokenize(project.get("technologies")):
+                query[term] += 1
+
+    for term in tokenize(resume_data.get("summary")):
+        query[term] += 1
+
+    return query
+
+class BM25Index:
+    """
+    Okapi BM25 index over a fixed list of jobs
+
+    Postings hold the precomputed, length-normalized term-frequency
+    component, so scoring a query is one vectorized add per query term.
+    """
+
+    def __init__(self, jobs: List[Dict[str, Any]], k1: float = BM25_K1, b: float = BM25_B):
+        self.jobs = jobs
+        self.size = len(jobs)
+
+        documents = [Counter(job_terms(job)) for job in jobs]
+        lengths = np.array([sum(doc.values()) for doc in documents], dtype=np.float32)
+        average_length = float(lengths.mean()) if self.size and lengths.sum() else 1.0
+        norms = k1 * (1 - b + b * lengths / average_length)
+
+        postings: Dict[str, Tuple[List[int], List[float]]] = {}
+        for index, doc in enumerate(documents):
+            for term, frequency in doc.items():
+                doc_ids, frequencies = postings.setdefault(term, ([], []))
+                doc_ids.append(index)
+                frequencies.append(frequency)
+
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for term, (doc_ids, frequencies) in postings.items():
+            doc_ids = np.array(doc_ids, dtype=np.int32)
+            frequencies = np.array(frequencies, dtype=np.float32)
+            idf = np.log(1 + (self.size - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            self._postings[term] = (doc_ids, idf * frequencies * (k1 + 1) / (frequencies + norms[doc_ids]))
+
+    @cached_property
+    def features(self) -> JobFeatureTable:
+        """Preference filter columns of the indexed jobs (built on first use)"""
+        return JobFeatureTable(self.jobs)
+
+    def score(self, query: Counter) -> np.ndarray:
+        """
+        Score every job against a weighted query
+
+        Args:
+            query: Counter of query term weights
+
+        Returns:
+            Array of BM25 scores, one per job
+        """
+        scores = np.zeros(self.size, dtype=np.float32)
+
+        for term, weight in query.items():
+            posting = self._postings.get(term)
+            if posting is not None:
+                doc_ids, contributions = posting
+                scores[doc_ids] += weight * contributions
+
+        return scores
+
+    def top_k(
+        self,
+        query: Counter,
+        k: int,
+        mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Get the k best-scoring jobs
+
+        Args:
+            query: Counter of query term weights
+            k: Number of jobs to return
+            mask: Boolean mask of the jobs that may be returned
+
+        Returns:
+            List of (job, score) tuples, best first
+        """
+        if not self.size or k <= 0:
+            return []
+
+        scores = self.score(query)
+
+        if mask is not None:
+            scores[~mask] = -np.inf
+            k = min(k, int(mask.sum()))
+
+        k = min(k, self.size)
+
+        if k <= 0:
+            return []
+
+        # Partial selection, then sort only the k winners
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [(self.jobs[index], float(scores[index])) for index in top]
+
+# Candidate indexes shared by users with the same filters
+_index_cache = LRUCache(64, ttl=JOBS_CACHE_TTL)
+
+async def get_candidate_index(
+    location: Optional[str] = None,
+    experience: Optional[str] = None
+) -> BM25Index:
+    """
+    Get a BM25 index over the local catalogue for the given filters
+
+    The index is built once per distinct filter combination and shared by
+    every user with those filters until it expires.
+
+    Args:
+        location: Filter by location
+        experience: Filter by experience level
+
+    Returns:
+        BM25Index instance (possibly empty)
+    """
+    cache_key = f"{(location or '').lower()}|{experience or ''}"
+    index = _index_cache.get(cache_key)
+
+    if index is None:
+        jobs = await load_match_candidates(location=location, experience=experience)
+        index = BM25Index(jobs)
+        _index_cache.set(cache_key, index)
+        logger.info(f"Built BM25 index over {index.size} local jobs for '{cache_key}'")
+
+    return index
+
+def prerank_jobs(
+    jobs: List[Dict[str, Any]],
+    resume_data: Dict[str, Any],
+    top_k: int = JOBS_MATCH_TOP_K,
+    index: Optional[BM25Index] = None,
+    mask: Optional[np.ndarray] = None
+) -> List[Dict[str, Any]]:
+    """
+    Narrow candidate jobs to the top-K by BM25 relevance to a resume
+
+    Args:
+        jobs: Candidate jobs
+        resume_data: Parsed resume data
+        top_k: Number of jobs to keep
+        index: Prebuilt index over the same jobs
+        mask: Boolean mask of the jobs the user accepts
+
+    Returns:
+        Up to top_k jobs, best first (original order if the resume has no terms)
+    """
+    query = resume_query_terms(resume_data)
+
+    if not query:
+        if mask is not None:
+            jobs = [job for job, allowed in zip(jobs, mask) if allowed]
+        return jobs[:top_k]
+
+    if index is None:
+        index = BM25Index(jobs)
+
+    return [job for job, _ in index.top_k(query, top_k, mask)]
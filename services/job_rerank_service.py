@@ -0,0 +1,383 @@
+# services/job_rerank_service.py
+import logging
+import json
+import math
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.future import select
+
+from config.settings import (
+    REDIS_URL,
+    JOBS_RERANKER_MIN_SAMPLES,
+    JOBS_RERANKER_MIN_AUC,
+    JOBS_RERANKER_REFRESH_SECONDS
+)
+from models.job import JobMatch, SavedJob
+from models.user import User
+from services.job_match_service import FEEDBACK_SAVED, FEEDBACK_NOT_INTERESTED
+from services.job_listing_service import parse_posted_date
+from services.job_ranking_service import tokenize
+from services.skill_scoring_service import (
+    EXPERIENCE_GAP_YEARS,
+    LOCATION_MISMATCH_FIT,
+    NEUTRAL_FIT,
+    city_key,
+    job_match_terms,
+    parse_experience_range,
+    resume_match_terms
+)
+from utils.db import get_db
+
+logger = logging.getLogger(__name__)
+
+# Redis key of the published model (shared by the bot, API and Celery processes)
+RERANKER_MODEL_KEY = "jobs:reranker-model"
+
+FEATURE_NAMES = (
+    "skill_overlap",
+    "skill_coverage",
+    "title_overlap",
+    "experience_fit",
+    "location_fit",
+    "recency"
+)
+
+# Training label of each feedback value
+FEEDBACK_LABELS = {FEEDBACK_SAVED: 1, FEEDBACK_NOT_INTERESTED: 0}
+
+# Overlapping terms at which skill_overlap saturates
+SKILL_OVERLAP_CAP = 10
+# Days over which the recency feature decays by a factor of e
+RECENCY_DAYS = 14.0
+# Newest share of the feedback held out to validate a trained model
+VALIDATION_SHARE = 0.2
+
+def match_features(
+    resume_data: Dict[str, Any],
+    jobs: List[Dict[str, Any]],
+    reference_times: Optional[List[datetime]] = None
+) -> np.ndarray:
+    """
+    Build the re-ranker's feature matrix for one resume and many jobs
+
+    Args:
+        resume_data: Parsed resume data
+        jobs: Job dictionaries
+        reference_times: Time each job was shown, for recency (now if not given)
+
+    Returns:
+        Array of shape (jobs, len(FEATURE_NAMES))
+    """
+    from services.job_service import calculate_experience_years
+
+    resume_terms = set(resume_match_terms(resume_data))
+    try:
+        years = calculate_experience_years(resume_data)
+    except Exception:
+        years = np.nan
+    contact_info = resume_data.get("contact_info") or {}
+    user_city = city_key(contact_info.get("location"))
+    titles = [job.get("title") for job in resume_data.get("work_experience") or [] if isinstance(job, dict)]
+    title_terms = set(tokenize(" ".join(str(title) for title in titles if title)))
+    now = datetime.utcnow()
+
+    features = np.zeros((len(jobs), len(FEATURE_NAMES)), dtype=np.float64)
+
+    for row, job in enumerate(jobs):
+        overlap = resume_terms & job_match_terms(job)
+        features[row, 0] = min(len(overlap), SKILL_OVERLAP_CAP) / SKILL_OVERLAP_CAP
+        features[row, 1] = len(overlap) / len(resume_terms) if resume_terms else 0.0
+
+        job_title_terms = set(tokenize(job.get("title")))
+        union = title_terms | job_title_terms
+        features[row, 2] = len(title_terms & job_title_terms) / len(union) if union else 0.0
+
+        # Same experience and location fit as the skill scorer
+        min_years, max_years = parse_experience_range(job.get("experience"))
+        if math.isnan(years) or math.isnan(min_years):
+            features[row, 3] = NEUTRAL_FIT
+        else:
+            gap = max(0.0, min_years - years) + 0.5 * max(0.0, years - max_years)
+            features[row, 3] = min(1.0, max(0.0, 1 - gap / EXPERIENCE_GAP_YEARS))
+
+        job_location = str(job.get("location") or "")
+        if "remote" in job_location.lower() or (user_city and user_city == city_key(job_location)):
+            features[row, 4] = 1.0
+        elif not user_city or not city_key(job_location):
+            features[row, 4] = NEUTRAL_FIT
+        else:
+            features[row, 4] = LOCATION_MISMATCH_FIT
+
+        posted = parse_posted_date(job.get("posted_date"))
+        shown = reference_times[row] if reference_times else now
+        if posted and shown:
+            features[row, 5] = math.exp(-max(0.0, (shown - posted).total_seconds() / 86400) / RECENCY_DAYS)
+        else:
+            features[row, 5] = 0.5
+
+    return features
+
+def roc_auc(labels: np.ndarray, scores: np.ndarray) -> float:
+    """Area under the ROC curve (probability a positive outranks a negative)"""
+    labels = np.asarray(labels, dtype=bool)
+    positives, negatives = labels.sum(), (~labels).sum()
+
+    if not positives or not negatives:
+        return 0.5
+
+    order = np.argsort(scores, kind="stable")
+    ranks = np.empty(len(scores), dtype=np.float64)
+    ranks[order] = np.arange(1, len(scores) + 1)
+
+    # Average the ranks of tied scores
+    sorted_scores = np.asarray(scores)[order]
+    _, starts, counts = np.unique(sorted_scores, return_index=True, return_counts=True)
+    for start, count in zip(starts, counts):
+        if count > 1:
+            ranks[order[start:start + count]] = start + (count + 1) / 2
+
+    return float((ranks[labels].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+class LogisticReranker:
+    """
+    L2-regularized logistic regression over standardized match features
+
+    Predicts the probability that a user saves (rather than dismisses) a
+    job. Trained with full-batch gradient descent; classes are weighted
+    so the rarer label counts as much as the common one.
+    """
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: float,
+        mean: np.ndarray,
+        scale: np.ndarray,
+        auc: Optional[float] = None,
+        samples: int = 0
+    ):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.auc = auc
+        self.samples = samples
+
+    @classmethod
+    def fit(
+        cls,
+        features: np.ndarray,
+        labels: np.ndarray,
+        l2: float = 0.01,
+        epochs: int = 500,
+        learning_rate: float = 0.5
+    ) -> "LogisticReranker":
+        """
+        Train a model
+
+        Args:
+            features: Feature matrix (samples x features)
+            labels: 1 for saved, 0 for not interested
+            l2: Regularization strength
+            epochs: Gradient descent steps
+            learning_rate: Step size
+
+        Returns:
+            Trained LogisticReranker
+        """
+        labels = np.asarray(labels, dtype=np.float64)
+        mean = features.mean(axis=0)
+        scale = features.std(axis=0)
+        scale[scale == 0] = 1.0
+        x = (features - mean) / scale
+
+        positives = max(1.0, labels.sum())
+        negatives = max(1.0, len(labels) - labels.sum())
+        sample_weights = np.where(labels == 1, len(labels) / (2 * positives), len(labels) / (2 * negatives))
+
+        weights = np.zeros(x.shape[1])
+        bias = 0.0
+
+        for _ in range(epochs):
+            predictions = 1 / (1 + np.exp(-(x @ weights + bias)))
+            error = (predictions - labels) * sample_weights / len(labels)
+            weights -= learning_rate * (x.T @ error + l2 * weights)
+            bias -= learning_rate * error.sum()
+
+        return cls(weights, bias, mean, scale, samples=len(labels))
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Probability of a save for each row of a feature matrix"""
+        logits = ((features - self.mean) / self.scale) @ self.weights + self.bias
+        return 1 / (1 + np.exp(-logits))
+
+    def rank(self, resume_data: Dict[str, Any], jobs: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Order jobs for a resume
+
+        Returns:
+            List of (job, probability), best first
+        """
+        if not jobs:
+            return []
+
+        probabilities = self.predict(match_features(resume_data, jobs))
+        order = np.argsort(-probabilities, kind="stable")
+        return [(jobs[i], float(probabilities[i])) for i in order]
+
+    def matches(self, resume_data: Dict[str, Any], jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Rank jobs as match dictionaries, in place of the LLM
+
+        Returns:
+            Matches (job_id, match_percentage, match_reasons, job_data), best first
+        """
+        resume_terms = set(resume_match_terms(resume_data))
+        matches = []
+
+        for job, probability in self.rank(resume_data, jobs):
+            common = sorted(resume_terms & job_match_terms(job))
+            matches.append({
+                "job_id": str(job.get("id")),
+                "match_percentage": int(round(100 * probability)),
+                "match_reasons": f"Matches your skills: {', '.join(common[:4])}." if common else None,
+                "job_data": job
+            })
+
+        return matches
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "features": list(FEATURE_NAMES),
+            "weights": self.weights.tolist(),
+            "bias": self.bias,
+            "mean": self.mean.tolist(),
+            "scale": self.scale.tolist(),
+            "auc": self.auc,
+            "samples": self.samples
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional["LogisticReranker"]:
+        """Restore a model (None if it was trained on other features)"""
+        if tuple(data.get("features") or ()) != FEATURE_NAMES:
+            return None
+        return cls(data["weights"], data["bias"], data["mean"], data["scale"], data.get("auc"), data.get("samples", 0))
+
+async def load_feedback_examples() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build training data from match feedback and saved jobs, oldest first
+
+    Returns:
+        Tuple of (feature matrix, labels)
+    """
+    async with get_db() as db:
+        result = await db.execute(
+            select(JobMatch.user_id, JobMatch.job_id, JobMatch.job_data, JobMatch.user_feedback, JobMatch.created_at)
+            .where(JobMatch.user_feedback.in_(list(FEEDBACK_LABELS)), JobMatch.job_data.isnot(None))
+        )
+        events = {
+            (user_id, job_id): (job_data, FEEDBACK_LABELS[feedback], created_at)
+            for user_id, job_id, job_data, feedback, created_at in result.all()
+        }
+
+        # Jobs saved from search results have no match row but are positives too
+        result = await db.execute(select(SavedJob.user_id, SavedJob.job_id, SavedJob.job_data, SavedJob.saved_at))
+        for user_id, job_id, job_data, saved_at in result.all():
+            events.setdefault((user_id, job_id), (job_data, 1, saved_at))
+
+        user_ids = {user_id for user_id, _ in events}
+        result = await db.execute(select(User.id, User.resume_data).where(User.id.in_(list(user_ids))))
+        resumes = {user_id: resume_data for user_id, resume_data in result.all() if resume_data}
+
+    by_user = {}
+
+    for (user_id, _), (job_data, label, shown_at) in events.items():
+        if user_id in resumes and job_data:
+            by_user.setdefault(user_id, []).append((job_data, label, shown_at or datetime.utcnow()))
+
+    rows, labels, times = [], [], []
+
+    for user_id, examples in by_user.items():
+        rows.append(match_features(resumes[user_id], [job for job, _, _ in examples], [shown for _, _, shown in examples]))
+        labels.extend(label for _, label, _ in examples)
+        times.extend(shown for _, _, shown in examples)
+
+    if not rows:
+        return np.zeros((0, len(FEATURE_NAMES))), np.zeros(0)
+
+    order = np.argsort(np.array([time_.timestamp() for time_ in times]), kind="stable")
+    return np.vstack(rows)[order], np.array(labels, dtype=np.float64)[order]
+
+async def train_reranker() -> Optional[LogisticReranker]:
+    """
+    Train the re-ranker and publish it if it ranks held-out feedback well
+
+    The newest VALIDATION_SHARE of the feedback validates a model trained
+    on the rest; a model passing JOBS_RERANKER_MIN_AUC is retrained on all
+    of it and published for every process to load.
+
+    Returns:
+        The published model, or None if there was too little data or the
+        model was not good enough
+    """
+    features, labels = await load_feedback_examples()
+
+    if len(labels) < JOBS_RERANKER_MIN_SAMPLES or len(set(labels.tolist())) < 2:
+        logger.info(f"Not training the job re-ranker: {len(labels)} feedback events")
+        return None
+
+    split = int(len(labels) * (1 - VALIDATION_SHARE))
+    auc = roc_auc(labels[split:], LogisticReranker.fit(features[:split], labels[:split]).predict(features[split:]))
+
+    if auc < JOBS_RERANKER_MIN_AUC:
+        logger.warning(f"Job re-ranker not published: validation AUC {auc:.3f} < {JOBS_RERANKER_MIN_AUC}")
+        return None
+
+    model = LogisticReranker.fit(features, labels)
+    model.auc = auc
+
+    import redis.asyncio as redis
+
+    client = redis.from_url(REDIS_URL)
+    try:
+        await client.set(RERANKER_MODEL_KEY, json.dumps(model.to_dict()))
+    finally:
+        await client.close()
+
+    logger.info(f"Published job re-ranker trained on {len(labels)} events (validation AUC {auc:.3f})")
+    return model
+
+# Global model instance (reloaded every JOBS_RERANKER_REFRESH_SECONDS)
+_reranker = None
+_reranker_loaded_at = None
+
+async def get_reranker() -> Optional[LogisticReranker]:
+    """
+    Get the published re-ranker
+
+    Returns:
+        LogisticReranker, or None if none has been published
+    """
+    global _reranker, _reranker_loaded_at
+
+    if _reranker_loaded_at is None or time.monotonic() - _reranker_loaded_at >= JOBS_RERANKER_REFRESH_SECONDS:
+        _reranker_loaded_at = time.monotonic()
+
+        try:
+            import redis.asyncio as redis
+
+            client = redis.from_url(REDIS_URL)
+            try:
+                raw = await client.get(RERANKER_MODEL_KEY)
+            finally:
+                await client.close()
+
+            _reranker = LogisticReranker.from_dict(json.loads(raw)) if raw else None
+        except Exception as e:
+            logger.warning(f"Could not load the job re-ranker: {str(e)}")
+
+    return _reranker
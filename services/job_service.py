@@ -1,23 +1,33 @@
 # services/job_service.py
 import logging
 import json
-import aiohttp
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
-from config.settings import JOBS_API_KEY
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from models.user import User
 from utils.db import get_db
+from utils.jobs_api import get_jobs_api_client, JobsAPIError, JobsAPIUnavailable
 from ai.agents.job_matching_agent import JobMatchingAgent
+from config.settings import (
+    JOB_LOOKUP_CACHE_SIZE,
+    JOB_LOOKUP_CACHE_TTL,
+    JOBS_MATCH_TOP_K,
+    JOBS_RERANKER_MODE,
+    JOBS_RERANKER_LLM_TOP_K
+)
+from utils.cache import LRUCache
+from services.job_dedup_service import filter_canonical_jobs
+from services.job_listing_service import is_local_data_fresh
+from services.job_ranking_service import get_candidate_index, prerank_jobs
+from services.job_match_service import match_jobs_with_cache
+from services.job_preference_service import load_preference_filters
+from services.job_rerank_service import get_reranker
 
 logger = logging.getLogger(__name__)
 
-# Jobs API Configuration
-JOBS_API_BASE_URL = "https://jobs.indianapi.in"
-JOBS_API_HEADERS = {
-    "X-Api-Key": JOBS_API_KEY
-}
+# In-process cache for single-job lookups (button taps, resume requests)
+_job_lookup_cache = LRUCache(JOB_LOOKUP_CACHE_SIZE, ttl=JOB_LOOKUP_CACHE_TTL)
 
 async def fetch_jobs(
     limit: int = 20,
@@ -25,7 +35,10 @@ async def fetch_jobs(
     title: Optional[str] = None,
     company: Optional[str] = None,
     experience: Optional[str] = None,
-    job_type: Optional[str] = None
+    job_type: Optional[str] = None,
+    offset: Optional[int] = None,
+    job_id: Optional[str] = None,
+    fallback: bool = True
 ) -> List[Dict[str, Any]]:
     """
     Fetch jobs from the Jobs API with optional filters
@@ -37,9 +50,16 @@ async def fetch_jobs(
         company: Filter by company name
         experience: Filter by experience level
         job_type: Filter by job type (Full Time, Part Time, etc.)
+        offset: Number of results to skip (for paging through the feed)
+        job_id: Fetch a single job by its Jobs API ID
+        fallback: Answer from the local table when the API fails (off for
+            callers that cache the result as upstream data)
         
     Returns:
         List of job dictionaries
+    
+    While the Jobs API circuit breaker is open (or the API fails), filtered
+    listing requests are answered from the local job_listings table instead.
     """
     try:
         # Build query parameters
@@ -55,33 +75,179 @@ async def fetch_jobs(
             params["experience"] = experience
         if job_type:
             params["job_type"] = job_type
+        if offset:
+            params["offset"] = str(offset)
+        if job_id:
+            params["job_id"] = str(job_id)
         
-        # Make API request
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{JOBS_API_BASE_URL}/jobs",
-                headers=JOBS_API_HEADERS,
-                params=params
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"Jobs API error: {response.status} - {error_text}")
-                    return []
-                
-                jobs_data = await response.json()
-                return jobs_data
+        # Make API request through the shared, pooled client
+        return await get_jobs_api_client().get_jobs(params)
+    
+    except JobsAPIUnavailable as e:
+        logger.warning(f"{str(e)}; serving local job listings")
+    
+    except JobsAPIError as e:
+        logger.error(str(e))
     
     except Exception as e:
         logger.error(f"Error fetching jobs: {str(e)}")
+    
+    # Feed paging and single-job lookups have no local equivalent here
+    if not fallback or offset or job_id:
         return []
+    
+    return await fetch_local_jobs(
+        limit=limit,
+        location=location,
+        title=title,
+        company=company,
+        experience=experience,
+        job_type=job_type
+    )
+
+async def fetch_local_jobs(
+    limit: int = 20,
+    location: Optional[str] = None,
+    title: Optional[str] = None,
+    company: Optional[str] = None,
+    experience: Optional[str] = None,
+    job_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch jobs from the local job_listings table (Jobs API fallback)
+    
+    Args:
+        Same filters as fetch_jobs
+        
+    Returns:
+        List of job dictionaries (newest first)
+    """
+    from services.job_listing_service import query_job_listings
+    
+    try:
+        jobs, _ = await query_job_listings(
+            limit=limit,
+            location=location,
+            title=title,
+            company=company,
+            experience=experience,
+            job_type=job_type
+        )
+        return jobs
+    
+    except Exception as e:
+        logger.error(f"Error fetching local job listings: {str(e)}")
+        return []
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a single job by ID
+    
+    Checks the in-process LRU first, then the local job_listings table, and
+    only then the Jobs API. Whatever is found is written back to the faster
+    tiers, so repeated taps on the same job card never leave the process.
+    
+    Args:
+        job_id: Jobs API job ID
+        
+    Returns:
+        Job dictionary or None if not found
+    """
+    job_id = str(job_id)
+    
+    job = _job_lookup_cache.get(job_id)
+    if job is not None:
+        return job
+    
+    from models.job import JobListing
+    from services.job_listing_service import job_to_listing_values, bulk_upsert_job_listings
+    
+    try:
+        async with get_db() as db:
+            result = await db.execute(
+                select(JobListing.job_data).where(JobListing.job_id == job_id)
+            )
+            job = result.scalar_one_or_none()
+    except Exception as e:
+        logger.error(f"Error looking up job {job_id} locally: {str(e)}")
+    
+    if job is not None:
+        _job_lookup_cache.set(job_id, job)
+        return job
+    
+    jobs = await fetch_jobs(limit=1, job_id=job_id)
+    job = next((j for j in jobs if str(j.get("id")) == job_id), None)
+    
+    if job is None:
+        return None
+    
+    _job_lookup_cache.set(job_id, job)
+    
+    try:
+        async with get_db() as db:
+            await bulk_upsert_job_listings(db, [job_to_listing_values(job)])
+            await db.commit()
+    except Exception as e:
+        logger.error(f"Error writing job {job_id} back to job listings: {str(e)}")
+    
+    return job
+
+async def get_cached_jobs(
+    limit: int = 20,
+    location: Optional[str] = None,
+    title: Optional[str] = None,
+    company: Optional[str] = None,
+    experience: Optional[str] = None,
+    job_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch jobs through the read-through query cache
+    
+    Users sharing the same filters share one cache entry, so a scheduled
+    run costs one upstream call per distinct filter instead of per user.
+    Only Jobs API results are cached; when the API fails, the local
+    job_listings fallback is queried outside the cache.
+    
+    Args:
+        Same as fetch_jobs
+        
+    Returns:
+        List of job dictionaries
+    """
+    from services.job_cache import get_jobs_query_cache
+    
+    params = {
+        "limit": limit,
+        "location": location,
+        "title": title,
+        "company": company,
+        "experience": experience,
+        "job_type": job_type
+    }
+    
+    jobs = await get_jobs_query_cache().get_or_fetch(
+        params,
+        lambda: fetch_jobs(**params, fallback=False)
+    )
+    
+    return jobs or await fetch_local_jobs(**params)
 
-async def get_personalized_jobs_for_user(user_id: int, limit: int = 5) -> Tuple[List[Dict[str, Any]], bool]:
+async def get_personalized_jobs_for_user(
+    user_id: int,
+    limit: int = 5,
+    candidate_jobs: Optional[List[Dict[str, Any]]] = None,
+    on_match: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+) -> Tuple[List[Dict[str, Any]], bool]:
     """
     Get personalized job recommendations for a user based on their resume
     
     Args:
         user_id: User ID
         limit: Maximum number of jobs to return
+        candidate_jobs: Jobs already retrieved for this user (e.g. by the
+            batched vector search); skips the BM25 retrieval stage
+        on_match: Optional async callback receiving scored matches best
+            first while the LLM is still streaming the rest
         
     Returns:
         Tuple of (list of jobs, success boolean)
@@ -106,19 +272,55 @@ async def get_personalized_jobs_for_user(user_id: int, limit: int = 5) -> Tuple[
         # Extract experience level from resume
         experience_level = calculate_experience_level(resume_data)
         
-        # Fetch jobs with basic filtering
-        jobs = await fetch_jobs(
-            limit=limit * 3,  # Fetch more jobs for better matching
-            location=user_location,
-            experience=experience_level
-        )
+        # Search preferences are applied before any ranking, so excluded jobs never reach the LLM
+        preference = (await load_preference_filters([user_id])).get(user_id)
+        
+        # Stage 1: vector or BM25 retrieval, over the whole local catalogue when it is fresh
+        if candidate_jobs:
+            if preference:
+                candidate_jobs = preference.filter_jobs(candidate_jobs)
+            jobs = _prefer_location(candidate_jobs, user_location)[:JOBS_MATCH_TOP_K]
+        elif await is_local_data_fresh():
+            index = await get_candidate_index(location=user_location, experience=experience_level)
+            mask = preference.mask(index.features) if preference else None
+            jobs = prerank_jobs(index.jobs, resume_data, top_k=JOBS_MATCH_TOP_K, index=index, mask=mask)
+        else:
+            # Fetch jobs with basic filtering (shared across users with the same filters)
+            jobs = await get_cached_jobs(
+                limit=max(limit * 3, JOBS_MATCH_TOP_K),  # Fetch more jobs for better matching
+                location=user_location,
+                experience=experience_level
+            )
+            
+            # Drop re-posts so the same role is neither ranked nor delivered twice
+            jobs = await filter_canonical_jobs(jobs)
+            
+            if preference:
+                jobs = preference.filter_jobs(jobs)
+            
+            jobs = prerank_jobs(jobs, resume_data, top_k=JOBS_MATCH_TOP_K)
         
         if not jobs:
-            logger.warning("No jobs returned from API")
+            logger.warning("No candidate jobs found")
             return [], False
         
-        # Use AI to match jobs to the user's resume
-        matched_jobs = await JobMatchingAgent.match_jobs_to_resume(jobs, resume_data)
+        # Learned re-ranker (once trained and published) replaces the LLM or narrows what it sees
+        reranker = await get_reranker() if JOBS_RERANKER_MODE in ("gate", "replace") else None
+        
+        if reranker:
+            if JOBS_RERANKER_MODE == "replace":
+                return reranker.matches(resume_data, jobs)[:limit], True
+            
+            jobs = [job for job, _ in reranker.rank(resume_data, jobs)][:max(limit, JOBS_RERANKER_LLM_TOP_K)]
+        
+        # Stage 2: only the top-K candidates without a stored match go to the LLM
+        matched_jobs = await match_jobs_with_cache(
+            user_id,
+            resume_data,
+            jobs,
+            JobMatchingAgent.match_jobs_to_resume,
+            on_match=on_match
+        )
         
         # Return top matches, limited to requested number
         return matched_jobs[:limit], True
@@ -127,6 +329,61 @@ async def get_personalized_jobs_for_user(user_id: int, limit: int = 5) -> Tuple[
         logger.error(f"Error getting personalized jobs: {str(e)}")
         return [], False
 
+def _prefer_location(jobs: List[Dict[str, Any]], location: Optional[str]) -> List[Dict[str, Any]]:
+    """Move jobs in the user's location to the front, keeping relevance order otherwise"""
+    if not location:
+        return jobs
+    
+    location = location.lower()
+    local_jobs = [job for job in jobs if location in str(job.get("location") or "").lower()]
+    other_jobs = [job for job in jobs if location not in str(job.get("location") or "").lower()]
+    
+    return local_jobs + other_jobs
+
+def calculate_experience_years(resume_data: Dict[str, Any]) -> float:
+    """
+    Calculate total years of work experience from the work history in a resume
+    
+    Args:
+        resume_data: Parsed resume data
+        
+    Returns:
+        Total years of experience (0 if unknown)
+    """
+    total_years = 0
+    
+    for job in resume_data.get("work_experience") or []:
+        if "start_date" in job and job["start_date"]:
+            start_date = None
+            end_date = datetime.now()
+            
+            # Parse start date
+            try:
+                start_date = datetime.strptime(job["start_date"], "%Y-%m")
+            except ValueError:
+                try:
+                    start_date = datetime.strptime(job["start_date"], "%Y")
+                except ValueError:
+                    continue
+            
+            # Parse end date if provided
+            if "end_date" in job and job["end_date"] and job["end_date"].lower() != "present":
+                try:
+                    end_date = datetime.strptime(job["end_date"], "%Y-%m")
+                except ValueError:
+                    try:
+                        end_date = datetime.strptime(job["end_date"], "%Y")
+                    except ValueError:
+                        pass
+            
+            if start_date:
+                # Calculate duration
+                duration = end_date - start_date
+                years = duration.days / 365.25
+                total_years += years
+    
+    return total_years
+
 def calculate_experience_level(resume_data: Dict[str, Any]) -> Optional[str]:
     """
     Calculate experience level based on work history in resume
@@ -142,37 +399,7 @@ def calculate_experience_level(resume_data: Dict[str, Any]) -> Optional[str]:
             return "Fresher"
         
         # Calculate total experience in years
-        total_years = 0
-        
-        for job in resume_data["work_experience"]:
-            if "start_date" in job and job["start_date"]:
-                start_date = None
-                end_date = datetime.now()
-                
-                # Parse start date
-                try:
-                    start_date = datetime.strptime(job["start_date"], "%Y-%m")
-                except ValueError:
-                    try:
-                        start_date = datetime.strptime(job["start_date"], "%Y")
-                    except ValueError:
-                        continue
-                
-                # Parse end date if provided
-                if "end_date" in job and job["end_date"] and job["end_date"].lower() != "present":
-                    try:
-                        end_date = datetime.strptime(job["end_date"], "%Y-%m")
-                    except ValueError:
-                        try:
-                            end_date = datetime.strptime(job["end_date"], "%Y")
-                        except ValueError:
-                            pass
-                
-                if start_date:
-                    # Calculate duration
-                    duration = end_date - start_date
-                    years = duration.days / 365.25
-                    total_years += years
+        total_years = calculate_experience_years(resume_data)
         
         # Determine experience level
         if total_years < 1:
@@ -262,14 +489,12 @@ async def save_job_for_user(user_id: int, job_id: str) -> bool:
     """
     try:
         # Fetch job details
-        jobs = await fetch_jobs(limit=1, job_id=job_id)
+        job = await get_job(job_id)
         
-        if not jobs:
+        if not job:
             logger.warning(f"Job {job_id} not found")
             return False
         
-        job = jobs[0]
-        
         # Save job in database
         from models.job import SavedJob
         
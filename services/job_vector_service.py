@@ -0,0 +1,376 @@
+# services/job_vector_service.py
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.future import select
+
+from ai.embeddings import get_embedder
+from config.settings import JOBS_MATCH_TOP_K, JOBS_CACHE_TTL, EMBEDDING_BATCH_SIZE
+from models.job import JobListing
+from models.user import User
+from utils.cache import LRUCache
+from services.job_preference_service import JobFeatureTable, JobPreferenceFilter, compile_masks, load_preference_filters
+from utils.db import get_db
+
+logger = logging.getLogger(__name__)
+
+# Queries scored per matrix product (bounds the size of the score matrix)
+SEARCH_BLOCK_SIZE = 256
+
+def vector_to_blob(vector: np.ndarray) -> bytes:
+    """Serialize a vector for a LargeBinary column"""
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+def blob_to_vector(blob: Optional[bytes], dim: int) -> Optional[np.ndarray]:
+    """Deserialize a stored vector (None if missing or of another dimension)"""
+    if not blob or len(blob) != dim * 4:
+        return None
+    return np.frombuffer(blob, dtype=np.float32)
+
+def job_embedding_text(job: Dict[str, Any]) -> str:
+    """Text embedded for a job"""
+    return "\n".join(
+        str(job.get(field) or "")
+        for field in ("title", "company", "experience", "education_and_skills", "job_description")
+    )
+
+def resume_embedding_text(resume_data: Dict[str, Any]) -> str:
+    """Text embedded for a resume (summary, skills, titles and responsibilities)"""
+    parts = [str(resume_data.get("summary") or "")]
+
+    skills = resume_data.get("skills") or {}
+    if isinstance(skills, dict):
+        for values in skills.values():
+            if isinstance(values, list):
+                parts.append(", ".join(str(value) for value in values if value))
+    elif isinstance(skills, list):
+        parts.append(", ".join(str(value) for value in skills if value))
+
+    for job in resume_data.get("work_experience") or []:
+        if isinstance(job, dict):
+            parts.append(str(job.get("title") or ""))
+            responsibilities = job.get("responsibilities") or []
+            if isinstance(responsibilities, list):
+                parts.extend(str(item) for item in responsibilities if item)
+
+    for project in resume_data.get("projects") or []:
+        if isinstance(project, dict):
+            parts.append(", ".join(str(value) for value in project.get("technologies") or [] if value))
+
+    return "\n".join(part for part in parts if part)
+
+class VectorIndex:
+    """
+    In-memory cosine index: one contiguous float32 matrix of unit vectors
+    plus an id map
+
+    Search scores a whole block of queries with a single matrix product.
+    """
+
+    def __init__(self, ids: List[str], matrix: np.ndarray, features: Optional[JobFeatureTable] = None):
+        self.ids = list(ids)
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32).reshape(len(self.ids), -1)
+        self.positions = {item_id: position for position, item_id in enumerate(self.ids)}
+        # Preference filter columns of the indexed jobs (same order as ids)
+        self.features = features
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    def search(
+        self,
+        queries: np.ndarray,
+        top_n: int,
+        masks: Optional[Dict[int, np.ndarray]] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Find the top-N most similar items for each query
+
+        Args:
+            queries: Matrix of unit-length query vectors (one per row)
+            top_n: Results per query
+            masks: Boolean mask over the items per query row (items the
+                query may return); rows without one search every item
+
+        Returns:
+            One list of (id, cosine similarity) per query, best first
+        """
+        masks = masks or {}
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+
+        if not self.size or top_n <= 0:
+            return [[] for _ in range(len(queries))]
+
+        top_n = min(top_n, self.size)
+        results = []
+
+        for start in range(0, len(queries), SEARCH_BLOCK_SIZE):
+            scores = queries[start:start + SEARCH_BLOCK_SIZE] @ self.matrix.T
+
+            for row in range(len(scores)):
+                mask = masks.get(start + row)
+                if mask is not None:
+                    scores[row, ~mask] = -np.inf
+
+            # Partial selection per row, then sort only the winners
+            top = np.argpartition(-scores, top_n - 1, axis=1)[:, :top_n]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            for row_ids, row_scores in zip(top, top_scores):
+                results.append([
+                    (self.ids[i], float(score))
+                    for i, score in zip(row_ids, row_scores)
+                    if score != -np.inf
+                ])
+
+        return results
+
+async def embed_listing_rows(rows: List[Dict[str, Any]], changed_rows: List[Dict[str, Any]]) -> None:
+    """
+    Embed new or changed listings at ingest (sets "embedding" on every row)
+
+    Unchanged rows get None, which the upsert ignores since it skips them.
+    A provider failure is logged and leaves the rows without an embedding.
+    Call it outside any open transaction, since it waits on the provider.
+
+    Args:
+        rows: All rows of the page
+        changed_rows: Rows whose content differs from the stored listing
+    """
+    for row in rows:
+        row["embedding"] = None
+
+    if not changed_rows:
+        return
+
+    try:
+        vectors = await get_embedder().embed([job_embedding_text(row["job_data"]) for row in changed_rows])
+    except Exception as e:
+        logger.error(f"Error embedding {len(changed_rows)} job listings: {str(e)}")
+        return
+
+    for row, vector in zip(changed_rows, vectors):
+        row["embedding"] = vector_to_blob(vector)
+
+async def embed_resume(resume_data: Optional[Dict[str, Any]]) -> Optional[bytes]:
+    """
+    Embed a parsed resume (called once at upload)
+
+    Args:
+        resume_data: Parsed resume data
+
+    Returns:
+        Serialized vector, or None if there is nothing to embed or embedding failed
+    """
+    if not resume_data:
+        return None
+
+    text = resume_embedding_text(resume_data)
+
+    if not text:
+        return None
+
+    try:
+        vectors = await get_embedder().embed([text])
+        return vector_to_blob(vectors[0])
+    except Exception as e:
+        logger.error(f"Error embedding resume: {str(e)}")
+        return None
+
+# Job index shared by all matching in this process until it expires
+_job_index_cache = LRUCache(1, ttl=JOBS_CACHE_TTL)
+
+async def backfill_job_embeddings(batch_size: int = EMBEDDING_BATCH_SIZE) -> int:
+    """
+    Embed canonical listings that have no embedding (backfill for listings
+    ingested before embeddings existed, or whose embedding failed at ingest)
+
+    Listings are processed in id order, one batch per provider request; a
+    failed batch is logged and skipped so the rest still get embedded.
+
+    Args:
+        batch_size: Listings per provider request
+
+    Returns:
+        Number of embedded listings
+    """
+    embedder = get_embedder()
+    embedded = 0
+    last_id = 0
+
+    while True:
+        async with get_db() as db:
+            result = await db.execute(
+                select(JobListing.id, JobListing.job_data).where(
+                    JobListing.id > last_id,
+                    JobListing.embedding.is_(None),
+                    JobListing.canonical_job_id.is_(None)
+                ).order_by(JobListing.id).limit(batch_size)
+            )
+            rows = result.all()
+
+            if not rows:
+                break
+
+            last_id = rows[-1][0]
+
+            try:
+                vectors = await embedder.embed([job_embedding_text(job_data or {}) for _, job_data in rows])
+            except Exception as e:
+                logger.error(f"Error embedding {len(rows)} job listings: {str(e)}")
+                continue
+
+            for (listing_id, _), vector in zip(rows, vectors):
+                await db.execute(
+                    update(JobListing).where(JobListing.id == listing_id).values(embedding=vector_to_blob(vector))
+                )
+
+            await db.commit()
+            embedded += len(rows)
+
+    if embedded:
+        _job_index_cache.pop("jobs")
+
+    return embedded
+
+async def get_job_vector_index() -> VectorIndex:
+    """
+    Get the vector index over all embedded canonical listings
+
+    Returns:
+        VectorIndex keyed by job_id (possibly empty)
+    """
+    index = _job_index_cache.get("jobs")
+
+    if index is not None:
+        return index
+
+    dim = get_embedder().dim
+
+    async with get_db() as db:
+        result = await db.execute(
+            select(
+                JobListing.job_id,
+                JobListing.embedding,
+                JobListing.title,
+                JobListing.company,
+                JobListing.location,
+                JobListing.job_type,
+                JobListing.job_data["salary"].as_string(),
+                JobListing.job_data["industry"].as_string(),
+                JobListing.job_data["about_company"].as_string()
+            ).where(
+                JobListing.embedding.isnot(None),
+                JobListing.canonical_job_id.is_(None)
+            )
+        )
+        rows = result.all()
+
+    ids = []
+    vectors = []
+    filter_fields = []
+
+    for job_id, blob, title, company, location, job_type, salary, industry, about_company in rows:
+        vector = blob_to_vector(blob, dim)
+        if vector is not None:
+            ids.append(job_id)
+            vectors.append(vector)
+            filter_fields.append({
+                "title": title,
+                "company": company,
+                "location": location,
+                "job_type": job_type,
+                "salary": salary,
+                "industry": industry,
+                "about_company": about_company
+            })
+
+    matrix = np.vstack(vectors) if vectors else np.zeros((0, dim), dtype=np.float32)
+    index = VectorIndex(ids, matrix, JobFeatureTable(filter_fields))
+    _job_index_cache.set("jobs", index)
+
+    logger.info(f"Built job vector index over {index.size} listings")
+    return index
+
+async def match_users_by_vector(
+    users: List[User],
+    top_n: int = JOBS_MATCH_TOP_K,
+    preferences: Optional[Dict[int, JobPreferenceFilter]] = None
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Retrieve the top-N jobs for many users with one batched cosine search
+
+    Users without a stored resume embedding (e.g. resumes uploaded before
+    embeddings existed) are embedded here once and the vector is saved.
+
+    Args:
+        users: Users with resume data
+        top_n: Jobs retrieved per user
+        preferences: Preference filters by user ID (loaded if not given);
+            excluded jobs are masked out of the search
+
+    Returns:
+        Dictionary of user ID to job dictionaries (best first); users that
+        could not be matched are left out
+    """
+    index = await get_job_vector_index()
+
+    if not index.size or not users:
+        return {}
+
+    embedder = get_embedder()
+    user_ids = []
+    vectors = []
+    missing = []
+
+    for user in users:
+        vector = blob_to_vector(user.resume_embedding, embedder.dim)
+        if vector is not None:
+            user_ids.append(user.id)
+            vectors.append(vector)
+        elif user.resume_data and resume_embedding_text(user.resume_data):
+            missing.append(user)
+
+    if missing:
+        try:
+            new_vectors = await embedder.embed([resume_embedding_text(user.resume_data) for user in missing])
+
+            async with get_db() as db:
+                for user, vector in zip(missing, new_vectors):
+                    user_ids.append(user.id)
+                    vectors.append(vector)
+                    await db.execute(
+                        update(User).where(User.id == user.id).values(resume_embedding=vector_to_blob(vector))
+                    )
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Error embedding {len(missing)} resumes: {str(e)}")
+
+    if not vectors:
+        return {}
+
+    if preferences is None:
+        preferences = await load_preference_filters(user_ids)
+
+    masks = compile_masks(preferences, index.features) if preferences else {}
+    query_masks = {row: masks[user_id] for row, user_id in enumerate(user_ids) if user_id in masks}
+
+    results = index.search(np.vstack(vectors), top_n, query_masks)
+    job_ids = {job_id for matches in results for job_id, _ in matches}
+
+    async with get_db() as db:
+        result = await db.execute(
+            select(JobListing.job_id, JobListing.job_data).where(JobListing.job_id.in_(job_ids))
+        )
+        jobs = {job_id: job_data for job_id, job_data in result.all()}
+
+    return {
+        user_id: [jobs[job_id] for job_id, _ in matches if job_id in jobs]
+        for user_id, matches in zip(user_ids, results)
+    }
@@ -78,16 +78,14 @@ async def generate_custom_resume(user_id: int, job_id: str) -> Tuple[bool, Optio
             resume_data = user.resume_data
         
         # Get job data
-        from services.job_service import fetch_jobs
+        from services.job_service import get_job
         
-        jobs = await fetch_jobs(limit=1, job_id=job_id)
+        job_data = await get_job(job_id)
         
-        if not jobs:
+        if not job_data:
             logger.error(f"Job {job_id} not found")
             return False, None
         
-        job_data = jobs[0]
-        
         # Create a resume request record
         async with get_db() as db:
             resume_request = ResumeRequest(
@@ -0,0 +1,380 @@
+# services/skill_scoring_service.py
+import logging
+import re
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from config.settings import JOBS_MATCH_TOP_K
+from services.job_ranking_service import tokenize
+from services.job_preference_service import JobFeatureTable, JobPreferenceFilter, compile_masks, load_preference_filters
+
+logger = logging.getLogger(__name__)
+
+# Longest skill phrase matched in job text ("spring boot", "google cloud platform")
+MAX_SKILL_WORDS = 3
+
+# Weight of a skill found in each job field (the strongest field wins)
+JOB_SKILL_FIELD_WEIGHTS = {
+    "education_and_skills": 1.0,
+    "title": 1.0,
+    "job_description": 0.5
+}
+
+# Job fields whose terms trigger a push to interested users
+PUSH_TRIGGER_FIELDS = ("title", "education_and_skills")
+
+# Blend of the three sub-scores
+OVERLAP_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.25
+LOCATION_WEIGHT = 0.15
+
+# Sub-score used when either side is unknown
+NEUTRAL_FIT = 0.75
+# Location fit for a known, different city
+LOCATION_MISMATCH_FIT = 0.3
+# Years of experience gap at which experience fit reaches zero
+EXPERIENCE_GAP_YEARS = 3.0
+
+# Users scored per sparse product (bounds the size of the pair arrays)
+SCORE_BLOCK_SIZE = 2048
+
+_years_pattern = re.compile(r"(\d+(?:\.\d+)?)")
+_remote_pattern = re.compile(r"\b(remote|work from home|wfh|anywhere)\b", re.IGNORECASE)
+
+def normalize_skill(skill: Any) -> Optional[str]:
+    """Normalize a skill to a phrase of at most MAX_SKILL_WORDS terms (None if unusable)"""
+    terms = tokenize(str(skill or ""))
+    if not terms or len(terms) > MAX_SKILL_WORDS:
+        return None
+    return " ".join(terms)
+
+def resume_skills(resume_data: Dict[str, Any]) -> List[str]:
+    """Get the normalized skills listed in a parsed resume"""
+    skills = resume_data.get("skills") or {}
+
+    if isinstance(skills, dict):
+        skills = [item for values in skills.values() if isinstance(values, list) for item in values]
+    elif not isinstance(skills, list):
+        skills = []
+
+    return sorted({phrase for phrase in map(normalize_skill, skills) if phrase})
+
+def parse_experience_range(value: Any) -> Tuple[float, float]:
+    """
+    Parse a job experience requirement ("2-5 years", "5+ years", "Fresher")
+
+    Returns:
+        Tuple of (min years, max years); NaN for unknown
+    """
+    text = str(value or "").lower()
+
+    if not text:
+        return np.nan, np.nan
+    if "fresher" in text or "entry" in text:
+        return 0.0, 1.0
+
+    numbers = [float(number) for number in _years_pattern.findall(text)]
+
+    if not numbers:
+        return np.nan, np.nan
+    if len(numbers) == 1:
+        return numbers[0], np.inf if "+" in text else numbers[0]
+    return min(numbers[:2]), max(numbers[:2])
+
+def city_key(location: Any) -> str:
+    """Normalize a location to its first component ("Bangalore, Karnataka" -> "bangalore")"""
+    return str(location or "").split(",")[0].strip().lower()
+
+def _phrases(text: Any) -> set:
+    """All 1..MAX_SKILL_WORDS term phrases of a text"""
+    terms = tokenize(text)
+    return {
+        " ".join(terms[start:start + size])
+        for size in range(1, MAX_SKILL_WORDS + 1)
+        for start in range(len(terms) - size + 1)
+    }
+
+def resume_match_terms(resume_data: Dict[str, Any]) -> List[str]:
+    """Get the skill and past job title terms a user is indexed under"""
+    terms = set(resume_skills(resume_data))
+
+    for job in resume_data.get("work_experience") or []:
+        if isinstance(job, dict):
+            title = normalize_skill(job.get("title"))
+            if title:
+                terms.add(title)
+
+    return sorted(terms)
+
+def job_match_terms(job: Dict[str, Any], fields=PUSH_TRIGGER_FIELDS) -> set:
+    """Get the terms of a job's fields that can match resume terms"""
+    terms = set()
+
+    for field in fields:
+        terms |= _phrases(job.get(field))
+
+    return terms
+
+class SkillScoringEngine:
+    """
+    Deterministic users x jobs scoring over sparse skill matrices
+
+    U (users x skills) is binary, J (jobs x skills) holds field weights, and
+    skills are weighted by rarity across jobs (IDF). Weighted overlap for
+    every pair comes from one sparse product U diag(idf) J^T; experience and
+    location fit are then computed only for the non-zero pairs.
+    """
+
+    def __init__(self, jobs: List[Dict[str, Any]], vocabulary: List[str]):
+        self.jobs = jobs
+        self.vocabulary = {skill: column for column, skill in enumerate(vocabulary)}
+
+        rows, cols, data = [], [], []
+
+        for row, job in enumerate(jobs):
+            weights = {}
+
+            for field, weight in JOB_SKILL_FIELD_WEIGHTS.items():
+                for phrase in _phrases(job.get(field)):
+                    column = self.vocabulary.get(phrase)
+                    if column is not None and weights.get(column, 0) < weight:
+                        weights[column] = weight
+
+            rows.extend([row] * len(weights))
+            cols.extend(weights.keys())
+            data.extend(weights.values())
+
+        self.job_matrix = sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), (rows, cols)),
+            shape=(len(jobs), len(self.vocabulary))
+        )
+
+        document_frequency = np.bincount(self.job_matrix.indices, minlength=len(self.vocabulary))
+        self.idf = np.log1p(len(jobs) / (1.0 + document_frequency)).astype(np.float32)
+
+        experience = np.array([parse_experience_range(job.get("experience")) for job in jobs], dtype=np.float32)
+        self.job_min_years = experience[:, 0] if len(jobs) else np.zeros(0, dtype=np.float32)
+        self.job_max_years = experience[:, 1] if len(jobs) else np.zeros(0, dtype=np.float32)
+
+        self._cities = {}
+        self.job_city = np.array([self._city_id(job.get("location")) for job in jobs], dtype=np.int32)
+        self.job_remote = np.array([bool(_remote_pattern.search(str(job.get("location") or ""))) for job in jobs])
+
+    def _city_id(self, location: Any) -> int:
+        key = city_key(location)
+        if not key:
+            return -1
+        return self._cities.setdefault(key, len(self._cities))
+
+    def score(
+        self,
+        user_skills: List[List[str]],
+        user_years: np.ndarray,
+        user_locations: List[Any],
+        top_n: int = JOBS_MATCH_TOP_K,
+        user_masks: Optional[Dict[int, np.ndarray]] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Rank jobs for every user
+
+        Args:
+            user_skills: Normalized skills per user
+            user_years: Years of experience per user (NaN if unknown)
+            user_locations: Location per user
+            top_n: Jobs kept per user
+            user_masks: Boolean mask over the jobs per user row (jobs the
+                user accepts); rows without one accept every job
+
+        Returns:
+            One list of (job index, score) per user, best first; only jobs
+            sharing at least one skill with the user are ranked
+        """
+        user_masks = user_masks or {}
+        rows, cols = [], []
+
+        for row, skills in enumerate(user_skills):
+            columns = [self.vocabulary[skill] for skill in skills if skill in self.vocabulary]
+            rows.extend([row] * len(columns))
+            cols.extend(columns)
+
+        user_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(user_skills), len(self.vocabulary))
+        )
+
+        # Share of the user's (IDF-weighted) skills each job covers
+        weighted_users = (user_matrix @ sparse.diags(self.idf)).tocsr()
+        user_totals = np.asarray(weighted_users.sum(axis=1)).ravel()
+        user_totals[user_totals == 0] = 1.0
+        normalized_users = (sparse.diags(1.0 / user_totals) @ weighted_users).astype(np.float32).tocsr()
+        skill_jobs = self.job_matrix.T.tocsr()
+
+        user_years = np.asarray(user_years, dtype=np.float32)
+        # -1: no user location, -2: a city no job is in
+        user_city = np.array(
+            [self._cities.get(city_key(location), -2) if city_key(location) else -1 for location in user_locations],
+            dtype=np.int32
+        )
+
+        results = []
+
+        for start in range(0, len(user_skills), SCORE_BLOCK_SIZE):
+            overlap = normalized_users[start:start + SCORE_BLOCK_SIZE] @ skill_jobs
+            counts = np.diff(overlap.indptr)
+            pair_users = np.repeat(np.arange(start, start + len(counts)), counts)
+            pair_jobs = overlap.indices
+
+            # Experience fit: full inside the range, overqualification penalized half as much
+            years = user_years[pair_users]
+            gap = np.maximum(0, self.job_min_years[pair_jobs] - years)
+            gap += 0.5 * np.maximum(0, years - self.job_max_years[pair_jobs])
+            experience_fit = np.clip(1 - gap / EXPERIENCE_GAP_YEARS, 0, 1)
+            experience_fit[np.isnan(experience_fit)] = NEUTRAL_FIT
+
+            # Location fit: same city or remote job, neutral when either side is unknown
+            pair_user_city = user_city[pair_users]
+            pair_job_city = self.job_city[pair_jobs]
+            location_fit = np.full(len(pair_jobs), LOCATION_MISMATCH_FIT, dtype=np.float32)
+            location_fit[(pair_user_city == -1) | (pair_job_city == -1)] = NEUTRAL_FIT
+            location_fit[((pair_user_city == pair_job_city) & (pair_job_city >= 0)) | self.job_remote[pair_jobs]] = 1.0
+
+            # Blend in place, reusing the product's sparsity structure
+            scores = overlap.data
+            scores *= OVERLAP_WEIGHT
+            scores += EXPERIENCE_WEIGHT * experience_fit
+            scores += LOCATION_WEIGHT * location_fit
+
+            for row in range(len(counts)):
+                row_start, row_end = overlap.indptr[row], overlap.indptr[row + 1]
+                row_jobs, row_scores = pair_jobs[row_start:row_end], scores[row_start:row_end]
+
+                mask = user_masks.get(start + row)
+                if mask is not None:
+                    allowed = mask[row_jobs]
+                    row_jobs, row_scores = row_jobs[allowed], row_scores[allowed]
+
+                if len(row_scores) > top_n:
+                    top = np.argpartition(-row_scores, top_n - 1)[:top_n]
+                    row_jobs, row_scores = row_jobs[top], row_scores[top]
+
+                order = np.argsort(-row_scores, kind="stable")
+                results.append(list(zip(row_jobs[order].tolist(), row_scores[order].tolist())))
+
+        return results
+
+def score_users_by_skills(
+    user_resumes: Dict[int, Dict[str, Any]],
+    jobs: List[Dict[str, Any]],
+    top_n: int = JOBS_MATCH_TOP_K,
+    preferences: Optional[Dict[int, JobPreferenceFilter]] = None
+) -> Dict[int, List[Tuple[Dict[str, Any], float]]]:
+    """
+    Baseline (LLM-free) scoring of jobs for many users at once
+
+    Args:
+        user_resumes: Dictionary of user ID to parsed resume data
+        jobs: Job catalogue
+        top_n: Jobs kept per user
+        preferences: Dictionary of user ID to search preference filter;
+            excluded jobs are never ranked
+
+    Returns:
+        Dictionary of user ID to (job dictionary, score in 0-1) pairs, best
+        first; users with no skill in common with any job are left out
+    """
+    from services.job_service import calculate_experience_years
+
+    started = time.monotonic()
+    user_ids = list(user_resumes)
+    user_skills = [resume_skills(user_resumes[user_id]) for user_id in user_ids]
+    vocabulary = sorted({skill for skills in user_skills for skill in skills})
+
+    if not vocabulary or not jobs:
+        return {}
+
+    user_years = []
+    user_locations = []
+
+    for user_id in user_ids:
+        resume_data = user_resumes[user_id]
+        contact_info = resume_data.get("contact_info") or {}
+
+        try:
+            user_years.append(calculate_experience_years(resume_data))
+        except Exception:
+            user_years.append(np.nan)
+
+        user_locations.append(contact_info.get("location") if isinstance(contact_info, dict) else None)
+
+    # One bitset over the catalogue per distinct preference
+    masks = compile_masks(preferences, JobFeatureTable(jobs)) if preferences else {}
+    user_masks = {row: masks[user_id] for row, user_id in enumerate(user_ids) if user_id in masks}
+
+    engine = SkillScoringEngine(jobs, vocabulary)
+    results = engine.score(user_skills, np.array(user_years, dtype=np.float32), user_locations, top_n, user_masks)
+
+    logger.info(
+        f"Skill-scored {len(user_ids)} users x {len(jobs)} jobs "
+        f"({len(vocabulary)} skills) in {time.monotonic() - started:.2f}s"
+    )
+
+    return {
+        user_id: [(jobs[index], score) for index, score in ranked]
+        for user_id, ranked in zip(user_ids, results)
+        if ranked
+    }
+
+def rank_users_by_skills(
+    user_resumes: Dict[int, Dict[str, Any]],
+    jobs: List[Dict[str, Any]],
+    top_n: int = JOBS_MATCH_TOP_K,
+    preferences: Optional[Dict[int, JobPreferenceFilter]] = None
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Baseline (LLM-free) ranking of jobs for many users at once
+
+    Args:
+        user_resumes: Dictionary of user ID to parsed resume data
+        jobs: Job catalogue
+        top_n: Jobs kept per user
+        preferences: Dictionary of user ID to search preference filter
+
+    Returns:
+        Dictionary of user ID to job dictionaries (best first)
+    """
+    return {
+        user_id: [job for job, _ in ranked]
+        for user_id, ranked in score_users_by_skills(user_resumes, jobs, top_n, preferences).items()
+    }
+
+async def match_users_by_skills(
+    users: List[Any],
+    top_n: int = JOBS_MATCH_TOP_K,
+    preferences: Optional[Dict[int, JobPreferenceFilter]] = None
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Rank the local catalogue for many users by skill overlap
+
+    Args:
+        users: Users with resume data
+        top_n: Jobs kept per user
+        preferences: Preference filters by user ID (loaded if not given)
+
+    Returns:
+        Dictionary of user ID to job dictionaries (best first)
+    """
+    from services.job_listing_service import load_match_candidates
+
+    user_resumes = {user.id: user.resume_data for user in users if user.resume_data}
+
+    if not user_resumes:
+        return {}
+
+    if preferences is None:
+        preferences = await load_preference_filters(list(user_resumes))
+
+    jobs = await load_match_candidates()
+    return rank_users_by_skills(user_resumes, jobs, top_n, preferences)
@@ -10,6 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import User
 from models.subscription import Subscription
 from utils.db import get_db, get_or_create
+from services.job_vector_service import embed_resume
+from services.job_push_service import index_user_terms
 
 logger = logging.getLogger(__name__)
 
@@ -210,6 +212,9 @@ async def update_user_resume_status(
         Success boolean
     """
     try:
+        # Embed once at upload, outside the transaction
+        resume_embedding = await embed_resume(resume_data)
+        
         async with get_db() as db:
             result = await db.execute(
                 select(User).where(User.id == user_id)
@@ -224,6 +229,9 @@ async def update_user_resume_status(
             
             if resume_data:
                 user.resume_data = resume_data
+                user.resume_embedding = resume_embedding
+                # Keep the term index current so new jobs are pushed to this resume
+                await index_user_terms(db, user.id, resume_data)
             
             user.updated_at = datetime.utcnow()
             
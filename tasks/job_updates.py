@@ -7,10 +7,17 @@ from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 from config.celery import app
+from config.settings import JOBS_MATCH_TOP_K, JOBS_CLUSTER_RANKING
 from models.user import User
 from models.subscription import Subscription
 from services.job_service import get_personalized_jobs_for_user, format_job_for_telegram
+from services.job_cluster_service import rank_users_by_cluster
+from services.job_match_service import load_pending_matches, mark_matches_sent
+from services.job_preference_service import load_preference_filters
+from services.job_vector_service import match_users_by_vector
+from services.skill_scoring_service import match_users_by_skills
 from utils.db import get_db
+from utils.jobs_api import run_with_jobs_api_client
 from bot.bot import get_bot_instance
 
 logger = logging.getLogger(__name__)
@@ -21,7 +28,7 @@ def send_job_updates():
     Celery task to send personalized job updates to subscribed users
     This is a wrapper that calls the async function
     """
-    asyncio.run(_send_job_updates_async())
+    run_with_jobs_api_client(_send_job_updates_async())
 
 async def _send_job_updates_async():
     """
@@ -48,75 +55,188 @@ async def _send_job_updates_async():
             # Send job updates to each user
             bot = get_bot_instance()
             
+            # Batched skill scoring and vector search retrieve candidates for every user
+            candidates = await _retrieve_candidates(users)
+            
+            # Optionally rank once per cluster of similar users instead of once per user
+            ranked = {}
+            
+            if JOBS_CLUSTER_RANKING:
+                try:
+                    ranked = await rank_users_by_cluster(users, candidates)
+                except Exception as e:
+                    logger.error(f"Error ranking jobs by cluster: {str(e)}")
+            
             for user in users:
-                await process_user_job_updates(user, bot)
+                await process_user_job_updates(user, bot, candidates.get(user.id), ranked.get(user.id))
     
     except Exception as e:
         logger.error(f"Error in job updates task: {str(e)}")
 
-async def process_user_job_updates(user: User, bot):
+async def _retrieve_candidates(users: List[User]) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Retrieve candidate jobs for all users at once, without LLM calls
+    
+    Jobs pushed to the user since the last update come first, followed by
+    the skill-overlap ranking (one sparse matrix product) interleaved with
+    the vector search (one batched cosine search), dropping repeats.
+    
+    Args:
+        users: Users with resumes
+        
+    Returns:
+        Dictionary of user ID to candidate jobs (users missing from it fall
+        back to per-user retrieval)
+    """
+    try:
+        pending = await load_pending_matches(users)
+    except Exception as e:
+        logger.error(f"Error loading pending matches: {str(e)}")
+        pending = {}
+    
+    try:
+        # Compiled once and applied inside both retrievals
+        preferences = await load_preference_filters([user.id for user in users])
+    except Exception as e:
+        logger.error(f"Error loading search preferences: {str(e)}")
+        preferences = None
+    
+    rankings = []
+    
+    for retrieve in (match_users_by_skills, match_users_by_vector):
+        try:
+            rankings.append(await retrieve(users, top_n=JOBS_MATCH_TOP_K * 3, preferences=preferences))
+        except Exception as e:
+            logger.error(f"Error retrieving candidates with {retrieve.__name__}: {str(e)}")
+    
+    candidates = {}
+    
+    for user in users:
+        merged = list(pending.get(user.id) or [])
+        seen = {str(job.get("id")) for job in merged}
+        user_rankings = [ranking.get(user.id) or [] for ranking in rankings]
+        
+        for position in range(max((len(jobs) for jobs in user_rankings), default=0)):
+            for jobs in user_rankings:
+                if position < len(jobs) and str(jobs[position].get("id")) not in seen:
+                    seen.add(str(jobs[position].get("id")))
+                    merged.append(jobs[position])
+        
+        if merged:
+            candidates[user.id] = merged
+    
+    return candidates
+
+async def process_user_job_updates(
+    user: User,
+    bot,
+    candidate_jobs: List[Dict[str, Any]] = None,
+    ranked_jobs: List[Dict[str, Any]] = None
+):
     """
     Process and send job updates for a specific user
     
+    Job cards are sent as soon as the LLM streams the best matches, so the
+    first card does not wait for the whole ranking.
+    
     Args:
         user: User object
         bot: Telegram bot instance
+        candidate_jobs: Jobs retrieved for this user by the batched retrieval
+        ranked_jobs: Matches already ranked for this user's cluster (skips
+            the per-user LLM ranking)
     """
+    limit = 2
+    sent_job_ids = []
+    
+    async def send_streamed_match(match: Dict[str, Any]):
+        if len(sent_job_ids) < limit:
+            await _send_job_card(user, bot, match, sent_job_ids)
+    
     try:
-        # Get personalized jobs for user
-        jobs, success = await get_personalized_jobs_for_user(user.id, limit=2)
+        if ranked_jobs:
+            jobs, success = ranked_jobs[:limit], True
+        else:
+            # Get personalized jobs for user, sending the top matches as they stream in
+            jobs, success = await get_personalized_jobs_for_user(
+                user.id,
+                limit=limit,
+                candidate_jobs=candidate_jobs,
+                on_match=send_streamed_match
+            )
         
-        if not success or not jobs:
+        if not sent_job_ids and (not success or not jobs):
             logger.warning(f"No matched jobs found for user {user.id}")
             return
         
-        logger.info(f"Sending {len(jobs)} job updates to user {user.id}")
-        
-        # Send each job as a separate message
+        # Jobs the stream did not deliver (unscored jobs, or matching fell back)
         for job in jobs:
-            # Format job for Telegram
-            job_data = job.get("job_data", {})
-            job_text = await format_job_for_telegram(job_data)
-            
-            # Add match percentage if available
-            match_percentage = job.get("match_percentage")
-            match_reasons = job.get("match_reasons")
-            
-            if match_percentage is not None:
-                job_text = f"🔄 *Match: {match_percentage}%*\n\n" + job_text
-            
-            if match_reasons:
-                job_text += f"\n\n*Why this matches your profile:*\n{match_reasons}"
+            if len(sent_job_ids) >= limit:
+                break
             
-            # Create inline keyboard with actions
-            keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton("Customize Resume", callback_data=f"resume_request_{job_data.get('id')}")
-                ],
-                [
-                    InlineKeyboardButton("Save Job", callback_data=f"save_job_{job_data.get('id')}"),
-                    InlineKeyboardButton("Not Interested", callback_data=f"not_interested_{job_data.get('id')}")
-                ]
-            ])
-            
-            # Send message
-            try:
-                await bot.send_message(
-                    chat_id=user.telegram_id,
-                    text=job_text,
-                    reply_markup=keyboard,
-                    parse_mode="Markdown",
-                    disable_web_page_preview=True
-                )
-                
-                # Add a small delay between messages to avoid rate limiting
-                await asyncio.sleep(0.5)
-            
-            except Exception as send_error:
-                logger.error(f"Error sending job update to user {user.id}: {str(send_error)}")
+            if job.get("job_data", {}).get("id") not in sent_job_ids:
+                await _send_job_card(user, bot, job, sent_job_ids)
+        
+        logger.info(f"Sent {len(sent_job_ids)} job updates to user {user.id}")
     
     except Exception as e:
         logger.error(f"Error processing job updates for user {user.id}: {str(e)}")
+    
+    finally:
+        if sent_job_ids:
+            await mark_matches_sent(user.id, sent_job_ids)
+
+async def _send_job_card(user: User, bot, job: Dict[str, Any], sent_job_ids: List[Any]):
+    """
+    Send one matched job as a Telegram message with action buttons
+    
+    Args:
+        user: User object
+        bot: Telegram bot instance
+        job: Match (job_data, match_percentage, match_reasons)
+        sent_job_ids: IDs of the jobs sent so far (appended to on success)
+    """
+    # Format job for Telegram
+    job_data = job.get("job_data", {})
+    job_text = await format_job_for_telegram(job_data)
+    
+    # Add match percentage if available
+    match_percentage = job.get("match_percentage")
+    match_reasons = job.get("match_reasons")
+    
+    if match_percentage is not None:
+        job_text = f"🔄 *Match: {match_percentage}%*\n\n" + job_text
+    
+    if match_reasons:
+        job_text += f"\n\n*Why this matches your profile:*\n{match_reasons}"
+    
+    # Create inline keyboard with actions
+    keyboard = InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("Customize Resume", callback_data=f"resume_request_{job_data.get('id')}")
+        ],
+        [
+            InlineKeyboardButton("Save Job", callback_data=f"save_job_{job_data.get('id')}"),
+            InlineKeyboardButton("Not Interested", callback_data=f"not_interested_{job_data.get('id')}")
+        ]
+    ])
+    
+    # Send message
+    try:
+        await bot.send_message(
+            chat_id=user.telegram_id,
+            text=job_text,
+            reply_markup=keyboard,
+            parse_mode="Markdown",
+            disable_web_page_preview=True
+        )
+        sent_job_ids.append(job_data.get('id'))
+        
+        # Add a small delay between messages to avoid rate limiting
+        await asyncio.sleep(0.5)
+    
+    except Exception as send_error:
+        logger.error(f"Error sending job update to user {user.id}: {str(send_error)}")
 
 @app.task
 def send_daily_job_digest():
@@ -124,7 +244,7 @@ def send_daily_job_digest():
     Send a daily digest of top job matches to users
     This is typically scheduled to run once per day
     """
-    asyncio.run(_send_daily_job_digest_async())
+    run_with_jobs_api_client(_send_daily_job_digest_async())
 
 async def _send_daily_job_digest_async():
     """
@@ -155,23 +275,27 @@ async def _send_daily_job_digest_async():
             # Send digest to each user
             bot = get_bot_instance()
             
+            # Batched skill scoring and vector search retrieve candidates for every user
+            candidates = await _retrieve_candidates(users)
+            
             for user in users:
-                await send_user_job_digest(user, bot)
+                await send_user_job_digest(user, bot, candidates.get(user.id))
     
     except Exception as e:
         logger.error(f"Error in daily job digest task: {str(e)}")
 
-async def send_user_job_digest(user: User, bot):
+async def send_user_job_digest(user: User, bot, candidate_jobs: List[Dict[str, Any]] = None):
     """
     Send a job digest to a specific user
     
     Args:
         user: User object
         bot: Telegram bot instance
+        candidate_jobs: Jobs retrieved for this user by the batched retrieval
     """
     try:
         # Get more personalized jobs for the digest
-        jobs, success = await get_personalized_jobs_for_user(user.id, limit=5)
+        jobs, success = await get_personalized_jobs_for_user(user.id, limit=5, candidate_jobs=candidate_jobs)
         
         if not success or not jobs:
             logger.warning(f"No matched jobs found for user {user.id} digest")
@@ -222,7 +346,7 @@ def update_job_database():
     Update the local job database with fresh data from the API
     This task helps with faster job matching by keeping a local cache
     """
-    asyncio.run(_update_job_database_async())
+    run_with_jobs_api_client(_update_job_database_async())
 
 async def _update_job_database_async():
     """
@@ -231,72 +355,29 @@ async def _update_job_database_async():
     logger.info("Starting job database update task")
     
     try:
-        from services.job_service import fetch_jobs
-        
-        # Fetch latest jobs (with a high limit)
-        jobs = await fetch_jobs(limit=200)
-        
-        if not jobs:
-            logger.warning("No jobs returned from API for database update")
-            return
+        from services.job_ingestion_service import ingest_jobs, ingestion_lock, get_push_watermark, mark_run_pushed
+        from services.job_push_service import push_new_job_matches
         
-        logger.info(f"Fetched {len(jobs)} jobs for database update")
-        
-        # Store jobs in database for quick access
-        from models.job import JobListing
-        
-        async with get_db() as db:
-            # Get existing job IDs to avoid duplicates
-            from sqlalchemy import select
-            result = await db.execute(select(JobListing.job_id))
-            existing_job_ids = {row[0] for row in result.fetchall()}
-            
-            # Add new jobs
-            new_job_count = 0
+        # One worker at a time, so overlapping invocations never advance the same run or push twice
+        async with ingestion_lock() as acquired:
+            if not acquired:
+                logger.info("Job ingestion is already running in another worker; skipping")
+                return
             
-            for job in jobs:
-                job_id = str(job.get("id"))
-                
-                if job_id not in existing_job_ids:
-                    job_listing = JobListing(
-                        job_id=job_id,
-                        title=job.get("title"),
-                        company=job.get("company"),
-                        location=job.get("location"),
-                        job_type=job.get("job_type"),
-                        experience=job.get("experience"),
-                        posted_date=job.get("posted_date"),
-                        job_data=job
-                    )
-                    
-                    db.add(job_listing)
-                    new_job_count += 1
+            # Page through the feed down to the last ingested watermark
+            stats = await ingest_jobs()
             
-            # Commit if we have new jobs
-            if new_job_count > 0:
-                await db.commit()
-                logger.info(f"Added {new_job_count} new jobs to database")
-            else:
-                logger.info("No new jobs to add to database")
-            
-            # Optionally, remove old jobs (e.g., older than 30 days)
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            
-            # Use job posted_date if available, otherwise use created_at from our db
-            delete_query = select(JobListing).filter(
-                (JobListing.posted_date < thirty_days_ago) | 
-                ((JobListing.posted_date == None) & (JobListing.created_at < thirty_days_ago))
+            logger.info(
+                f"Job ingestion {stats['status']}: {stats['pages_fetched']} pages, "
+                f"{stats['new_rows']} new, {stats['updated_rows']} updated in {stats['elapsed_seconds']}s"
             )
             
-            result = await db.execute(delete_query)
-            old_jobs = result.scalars().all()
-            
-            for old_job in old_jobs:
-                await db.delete(old_job)
-            
-            if old_jobs:
-                await db.commit()
-                logger.info(f"Removed {len(old_jobs)} old jobs from database")
+            # Once the run is complete, score the listings stored since the last push
+            # (including those of earlier invocations), against only the users
+            # indexed under their terms
+            if stats["status"] == "completed":
+                await push_new_job_matches(since=await get_push_watermark(stats["run_id"]))
+                await mark_run_pushed(stats["run_id"])
     
     except Exception as e:
         logger.error(f"Error updating job database: {str(e)}")
\ No newline at end of file
@@ -7,7 +7,7 @@ from pathlib import Path
 from datetime import datetime, timedelta
 
 from config.celery import app
-from config.settings import TEMP_DIR, LOGS_DIR
+from config.settings import TEMP_DIR, LOGS_DIR, JOBS_RETENTION_DAYS
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +74,130 @@ async def _cleanup_temp_files_async():
     except Exception as e:
         logger.error(f"Error in cleanup task: {str(e)}")
 
+@app.task
+def purge_expired_job_listings(retention_days: int = JOBS_RETENTION_DAYS):
+    """
+    Celery task to apply the job listings retention policy
+    This is a wrapper that calls the async function
+    """
+    asyncio.run(_purge_expired_job_listings_async(retention_days))
+
+async def _purge_expired_job_listings_async(retention_days: int):
+    """
+    Async implementation of the job listings retention task
+    Deletes listings older than the retention window in one statement
+    """
+    logger.info(f"Starting job listings purge (retention: {retention_days} days)")
+    
+    try:
+        from services.job_listing_service import purge_expired_job_listings as purge_listings
+        
+        deleted_count = await purge_listings(retention_days)
+        
+        logger.info(f"Removed {deleted_count} expired job listings")
+    
+    except Exception as e:
+        logger.error(f"Error in job listings purge task: {str(e)}")
+
+@app.task
+def purge_stale_job_matches():
+    """
+    Celery task to delete expired AI job matches
+    This is a wrapper that calls the async function
+    """
+    asyncio.run(_purge_stale_job_matches_async())
+
+async def _purge_stale_job_matches_async():
+    """
+    Async implementation of the job matches cleanup task
+    Matches with user feedback are kept
+    """
+    logger.info("Starting stale job matches purge")
+    
+    try:
+        from services.job_match_service import purge_stale_job_matches as purge_matches
+        
+        deleted_count = await purge_matches()
+        
+        logger.info(f"Removed {deleted_count} stale job matches")
+    
+    except Exception as e:
+        logger.error(f"Error in job matches purge task: {str(e)}")
+
+@app.task
+def rebuild_user_term_index():
+    """
+    Celery task to rebuild the term -> users index used to push new jobs
+    Run once to backfill resumes uploaded before the index existed
+    """
+    asyncio.run(_rebuild_user_term_index_async())
+
+async def _rebuild_user_term_index_async():
+    """
+    Async implementation of the term index rebuild task
+    """
+    logger.info("Starting user term index rebuild")
+    
+    try:
+        from services.job_push_service import rebuild_user_term_index as rebuild_index
+        
+        indexed_count = await rebuild_index()
+        
+        logger.info(f"Indexed terms for {indexed_count} users")
+    
+    except Exception as e:
+        logger.error(f"Error in user term index rebuild task: {str(e)}")
+
+@app.task
+def backfill_job_embeddings():
+    """
+    Celery task to embed job listings that have no embedding
+    Run once to backfill listings ingested before the vector index existed
+    """
+    asyncio.run(_backfill_job_embeddings_async())
+
+async def _backfill_job_embeddings_async():
+    """
+    Async implementation of the job embedding backfill task
+    """
+    logger.info("Starting job embedding backfill")
+    
+    try:
+        from services.job_vector_service import backfill_job_embeddings as backfill_embeddings
+        
+        embedded_count = await backfill_embeddings()
+        
+        logger.info(f"Embedded {embedded_count} job listings")
+    
+    except Exception as e:
+        logger.error(f"Error in job embedding backfill task: {str(e)}")
+
+@app.task
+def train_job_reranker():
+    """
+    Celery task to retrain the learned job re-ranker from user feedback
+    This is a wrapper that calls the async function
+    """
+    asyncio.run(_train_job_reranker_async())
+
+async def _train_job_reranker_async():
+    """
+    Async implementation of the re-ranker training task
+    The model is only published if it ranks held-out feedback well enough
+    """
+    logger.info("Starting job re-ranker training")
+    
+    try:
+        from services.job_rerank_service import train_reranker
+        
+        model = await train_reranker()
+        
+        if model:
+            logger.info(f"Job re-ranker weights: {dict(zip(model.to_dict()['features'], model.weights.round(3).tolist()))}")
+    
+    except Exception as e:
+        logger.error(f"Error in job re-ranker training task: {str(e)}")
+
 @app.task
 def vacuum_database():
     """
@@ -6,6 +6,7 @@ from datetime import datetime
 
 from config.celery import app
 from ai.agents.resume_agent import ResumeAgent
+from utils.jobs_api import run_with_jobs_api_client
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +16,7 @@ def generate_resume_task(user_id: int, job_id: str, request_id: str):
     Celery task to generate a customized resume
     This is a wrapper that calls the async function
     """
-    asyncio.run(_generate_resume_async(user_id, job_id, request_id))
+    run_with_jobs_api_client(_generate_resume_async(user_id, job_id, request_id))
 
 async def _generate_resume_async(user_id: int, job_id: str, request_id: str):
     """
@@ -65,11 +66,11 @@ async def _generate_resume_async(user_id: int, job_id: str, request_id: str):
             resume_data = user.resume_data
         
         # Get job data
-        from services.job_service import fetch_jobs
+        from services.job_service import get_job
         
-        jobs = await fetch_jobs(limit=1, job_id=job_id)
+        job_data = await get_job(job_id)
         
-        if not jobs:
+        if not job_data:
             logger.error(f"Job {job_id} not found")
             
             # Update request status to failed
@@ -88,8 +89,6 @@ async def _generate_resume_async(user_id: int, job_id: str, request_id: str):
             
             return
         
-        job_data = jobs[0]
-        
         # Generate customized resume
         start_time = datetime.utcnow()
         
@@ -0,0 +1,102 @@
+# tests/test_ai.py
+import asyncio
+
+from ai.cache import LLMResponseCache, MemoryResponseCacheBackend, build_cache_key
+from utils.json_stream import JSONArrayStreamParser
+
+def _cache():
+    return LLMResponseCache(MemoryResponseCacheBackend(), ttl=60, agents=["resume"])
+
+def test_cache_skips_truncated_and_invalid_responses():
+    cache = _cache()
+    calls = []
+
+    def call(response, truncated=False):
+        async def _call(info):
+            calls.append(response)
+            info["truncated"] = truncated
+            return response
+        return _call
+
+    async def run():
+        is_json = lambda text: text.startswith("{")
+        args = ("resume", "fake", "model", "prompt", {"max_tokens": 10})
+
+        assert await cache.get_or_call(*args, call('{"a"', truncated=True), is_json) == '{"a"'
+        assert await cache.get_or_call(*args, call("not json"), is_json) == "not json"
+        assert await cache.get_or_call(*args, call('{"a": 1}'), is_json) == '{"a": 1}'
+        assert await cache.get_or_call(*args, call("unused"), is_json) == '{"a": 1}'
+
+    asyncio.run(run())
+
+    assert calls == ['{"a"', "not json", '{"a": 1}']
+
+def test_cache_skips_responses_from_another_model():
+    cache = _cache()
+
+    async def downgraded(info):
+        info.update({"provider": "fake", "model": "small", "truncated": False})
+        return "answer"
+
+    async def run():
+        args = ("resume", "fake", "large", "prompt", {"max_tokens": 10})
+        await cache.get_or_call(*args, downgraded)
+        return await cache.backend.get(build_cache_key("fake", "large", "prompt", {"max_tokens": 10}))
+
+    assert asyncio.run(run()) is None
+
+def _feed(parser, chunks):
+    return [item for chunk in chunks for item in parser.feed(chunk)]
+
+def test_stream_parser_splits_inside_strings_and_escapes():
+    text = '```json\n[{"job_id": "1", "reason": "uses [Go] and {C}"}, {"job_id": "2", "reason": "a \\"quoted\\" \\\\ path"}]\n```'
+    expected = [
+        {"job_id": "1", "reason": "uses [Go] and {C}"},
+        {"job_id": "2", "reason": 'a "quoted" \\ path'}
+    ]
+
+    # Every split point, including inside strings and escape sequences
+    for size in range(1, len(text) + 1):
+        parser = JSONArrayStreamParser()
+        assert _feed(parser, [text[i:i + size] for i in range(0, len(text), size)]) == expected
+        assert parser.finished
+        assert parser.errors == 0
+
+def test_stream_parser_skips_malformed_elements():
+    parser = JSONArrayStreamParser()
+    items = _feed(parser, ['Here you go: [{"job_id": 1}, 42, {"job_id": 2,}, ', '{"job_id": 3}] trailing {"job_id": 4}'])
+
+    assert items == [{"job_id": 1}, {"job_id": 3}]
+    assert parser.errors == 1
+    assert parser.finished
+
+def test_stream_parser_unfinished_array():
+    parser = JSONArrayStreamParser()
+
+    assert _feed(parser, ['[{"job_id": 1}, {"job_id": 2, "reason": "cut o']) == [{"job_id": 1}]
+    assert not parser.finished
+
+def test_router_recovers_downgraded_tier_after_samples_expire():
+    from ai.routing import LATENCY_MAX_AGE, MIN_LATENCY_SAMPLES, TIER_MODELS, ModelRouter
+
+    now = [0.0]
+    router = ModelRouter(enabled=True, clock=lambda: now[0])
+    balanced, fast = TIER_MODELS["claude"]["balanced"], TIER_MODELS["claude"]["fast"]
+
+    for _ in range(MIN_LATENCY_SAMPLES):
+        router.record("claude", balanced, 60, task="match")
+
+    assert router.select("claude", "match", 0, 30) == fast
+
+    # Slow samples of another task on the same model do not count against match
+    for _ in range(MIN_LATENCY_SAMPLES):
+        router.record("claude", balanced, 60, task="customize")
+    assert router.p95("claude", balanced, "parse") is None
+
+    now[0] += LATENCY_MAX_AGE + 1
+    assert router.select("claude", "match", 0, 30) == balanced
+
+    for _ in range(MIN_LATENCY_SAMPLES):
+        router.record("claude", balanced, 2, task="match")
+    assert router.select("claude", "match", 0, 30) == balanced
+    assert router.stats["downgrades"] == 1
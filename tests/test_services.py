@@ -0,0 +1,89 @@
+# tests/test_services.py
+import asyncio
+
+import numpy as np
+from sqlalchemy.dialects import postgresql
+
+import services.job_cache as job_cache
+import services.job_service as job_service
+from services.job_preference_service import JobPreferenceFilter
+from services.job_push_service import _interested_users_query
+from services.job_rerank_service import FEATURE_NAMES, LogisticReranker, roc_auc
+from utils.jobs_api import JobsAPIUnavailable
+
+def test_interested_users_query_compiles_for_postgres():
+    sql = str(_interested_users_query(["python", "django"]).compile(dialect=postgresql.dialect()))
+
+    # SELECT DISTINCT over users.resume_data (JSON) fails on Postgres
+    assert "DISTINCT" not in sql
+    assert "JOIN" not in sql
+    assert "user_match_terms" in sql
+    assert "subscriptions" in sql
+
+def test_excluded_company_matches_whole_words():
+    jobs = [
+        {"id": 1, "company": "Infosys"},
+        {"id": 2, "company": "Infosys Limited"},
+        {"id": 3, "company": "Infosys BPM"},
+        {"id": 4, "company": "Infosystems Inc"},
+        {"id": 5, "company": "TCS"},
+        {"id": 6, "company": None}
+    ]
+    preference = JobPreferenceFilter(excluded_companies=["INFOSYS"])
+
+    assert [job["id"] for job in preference.filter_jobs(jobs)] == [4, 5, 6]
+
+def test_roc_auc_counts_ties_as_half():
+    # One positive ties a negative (0.5), the other pairs are ordered correctly
+    assert roc_auc(np.array([1, 0, 1, 0]), np.array([0.5, 0.5, 0.9, 0.1])) == 0.875
+    assert roc_auc(np.array([1, 0, 1, 0]), np.array([0.3, 0.3, 0.3, 0.3])) == 0.5
+    assert roc_auc(np.array([1, 1]), np.array([0.2, 0.8])) == 0.5
+
+def test_reranker_fits_separable_data():
+    rng = np.random.default_rng(0)
+    features = rng.random((200, len(FEATURE_NAMES)))
+    labels = (features[:, 0] > 0.5).astype(np.float64)
+
+    model = LogisticReranker.fit(features, labels)
+
+    assert model.samples == 200
+    assert model.weights[0] > 0
+    assert roc_auc(labels, model.predict(features)) > 0.99
+    assert ((model.predict(features) > 0.5) == labels.astype(bool)).mean() > 0.95
+
+def test_reranker_round_trip_and_feature_mismatch():
+    rng = np.random.default_rng(1)
+    features = rng.random((50, len(FEATURE_NAMES)))
+    model = LogisticReranker.fit(features, (features[:, 1] > 0.5).astype(np.float64))
+    data = model.to_dict()
+
+    restored = LogisticReranker.from_dict(data)
+    assert np.allclose(restored.predict(features), model.predict(features))
+
+    # A model trained on another feature set must not be loaded
+    assert LogisticReranker.from_dict({**data, "features": list(FEATURE_NAMES[:-1])}) is None
+    assert LogisticReranker.from_dict({**data, "features": None}) is None
+
+def test_local_fallback_is_not_cached_as_upstream_data(monkeypatch):
+    class UnavailableClient:
+        async def get_jobs(self, params):
+            raise JobsAPIUnavailable("Jobs API circuit breaker is open")
+
+    async def fetch_local_jobs(**filters):
+        return [{"id": "local-1"}]
+
+    cache = job_cache.JobsQueryCache(job_cache.MemoryCacheBackend())
+    monkeypatch.setattr(job_cache, "_jobs_query_cache", cache)
+    monkeypatch.setattr(job_service, "get_jobs_api_client", lambda: UnavailableClient())
+    monkeypatch.setattr(job_service, "fetch_local_jobs", fetch_local_jobs)
+
+    async def run():
+        jobs = await job_service.get_cached_jobs(limit=5, location="Pune")
+        return jobs, await cache.backend.get(job_cache.build_cache_key({
+            "limit": 5, "location": "Pune", "title": None, "company": None, "experience": None, "job_type": None
+        }))
+
+    jobs, entry = asyncio.run(run())
+
+    assert jobs == [{"id": "local-1"}]
+    assert entry is None
@@ -0,0 +1,38 @@
+# utils/cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+class LRUCache:
+    """Small synchronous in-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        item = self._entries.get(key)
+
+        if item is None:
+            return None
+
+        expires_at, value = item
+
+        if expires_at is not None and expires_at < time.time():
+            self._entries.pop(key, None)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        self._entries[key] = (time.time() + ttl if ttl is not None else None, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        self._entries.pop(key, None)
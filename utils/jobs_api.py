@@ -0,0 +1,255 @@
+# utils/jobs_api.py
+import logging
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from config.settings import (
+    JOBS_API_KEY,
+    JOBS_API_BASE_URL,
+    JOBS_API_CONNECT_TIMEOUT,
+    JOBS_API_READ_TIMEOUT,
+    JOBS_API_MAX_CONNECTIONS,
+    JOBS_API_MAX_CONNECTIONS_PER_HOST,
+    JOBS_API_DNS_CACHE_TTL,
+    JOBS_API_KEEPALIVE_TIMEOUT,
+    JOBS_API_BREAKER_WINDOW,
+    JOBS_API_BREAKER_MIN_REQUESTS,
+    JOBS_API_BREAKER_FAILURE_RATIO,
+    JOBS_API_BREAKER_OPEN_SECONDS,
+    JOBS_API_MIN_CONCURRENCY,
+    JOBS_API_INITIAL_CONCURRENCY,
+    JOBS_API_LATENCY_TARGET,
+    JOBS_API_QUEUE_TIMEOUT
+)
+from utils.resilience import CircuitBreaker, AdaptiveConcurrencyLimiter, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+class JobsAPIError(Exception):
+    """Raised when the Jobs API returns a non-200 response"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Jobs API error: {status} - {message}")
+        self.status = status
+        self.message = message
+
+class JobsAPIUnavailable(JobsAPIError):
+    """Raised without contacting the Jobs API (breaker open or no free slot)"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(503, message)
+        self.retry_after = retry_after
+
+# Statuses that mean the upstream is struggling (counted against the breaker)
+OVERLOAD_STATUSES = {429, 500, 502, 503, 504}
+
+class JobsAPIClient:
+    """
+    Long-lived HTTP client for the Jobs API
+
+    Keeps a single aiohttp session (keep-alive connections, DNS cache and
+    per-host connection limits) for the lifetime of the event loop it was
+    created on. Celery tasks run each job in a fresh loop via asyncio.run,
+    so the session is transparently recreated when the loop changes.
+
+    Every request goes through a rolling-window circuit breaker and an AIMD
+    concurrency limiter, so a slow or failing upstream is shed quickly
+    instead of holding every caller for the full timeout.
+    """
+
+    def __init__(self, base_url: str = JOBS_API_BASE_URL, api_key: Optional[str] = JOBS_API_KEY):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"X-Api-Key": api_key} if api_key else {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.breaker = CircuitBreaker(
+            "jobs_api",
+            window=JOBS_API_BREAKER_WINDOW,
+            min_requests=JOBS_API_BREAKER_MIN_REQUESTS,
+            failure_ratio=JOBS_API_BREAKER_FAILURE_RATIO,
+            open_seconds=JOBS_API_BREAKER_OPEN_SECONDS
+        )
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=JOBS_API_INITIAL_CONCURRENCY,
+            min_limit=JOBS_API_MIN_CONCURRENCY,
+            max_limit=JOBS_API_MAX_CONNECTIONS_PER_HOST,
+            latency_target=JOBS_API_LATENCY_TARGET,
+            queue_timeout=JOBS_API_QUEUE_TIMEOUT
+        )
+
+    def _build_session(self) -> aiohttp.ClientSession:
+        """Create a pooled session with the configured limits and timeouts"""
+        connector = aiohttp.TCPConnector(
+            limit=JOBS_API_MAX_CONNECTIONS,
+            limit_per_host=JOBS_API_MAX_CONNECTIONS_PER_HOST,
+            use_dns_cache=True,
+            ttl_dns_cache=JOBS_API_DNS_CACHE_TTL,
+            keepalive_timeout=JOBS_API_KEEPALIVE_TIMEOUT,
+        )
+
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=JOBS_API_CONNECT_TIMEOUT,
+            sock_connect=JOBS_API_CONNECT_TIMEOUT,
+            sock_read=JOBS_API_READ_TIMEOUT,
+        )
+
+        return aiohttp.ClientSession(
+            base_url=self.base_url,
+            connector=connector,
+            timeout=timeout,
+            headers=self.headers,
+        )
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared session for the running event loop
+
+        Returns:
+            Open aiohttp session
+        """
+        loop = asyncio.get_running_loop()
+
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # A session bound to a previous (closed) loop cannot be reused or closed
+            self._session = self._build_session()
+            self._loop = loop
+            logger.debug("Created new Jobs API session")
+
+        return self._session
+
+    async def get(self, path: str, params: Optional[Dict[str, str]] = None) -> Tuple[int, Any]:
+        """
+        Perform a GET request against the Jobs API
+
+        Args:
+            path: Request path (e.g. "/jobs")
+            params: Query parameters
+
+        Returns:
+            Tuple of (HTTP status, parsed JSON body or error text)
+
+        Raises:
+            JobsAPIUnavailable: If the breaker is open or no slot frees up in time
+        """
+        if not self.breaker.allow_request():
+            raise JobsAPIUnavailable("circuit breaker open", self.breaker.retry_after())
+
+        if not await self.limiter.acquire():
+            self.breaker.record_failure()
+            raise JobsAPIUnavailable(f"no free slot (limit {self.limiter.limit})")
+
+        started = time.monotonic()
+        succeeded = False
+
+        try:
+            session = await self.get_session()
+
+            async with session.get(path, params=params) as response:
+                if response.status in OVERLOAD_STATUSES:
+                    self.breaker.record_failure(parse_retry_after(response.headers.get("Retry-After")))
+                    return response.status, await response.text()
+
+                if response.status != 200:
+                    body = await response.text()
+                else:
+                    body = await response.json()
+
+                succeeded = True
+                self.breaker.record_success()
+                return response.status, body
+
+        except BaseException:
+            # Connection errors, timeouts, bad JSON and cancellation all count
+            # as failures (this also releases a half-open probe)
+            if not succeeded:
+                self.breaker.record_failure()
+            raise
+
+        finally:
+            await self.limiter.release(succeeded, time.monotonic() - started)
+
+    async def get_jobs(self, params: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch a list of jobs from the /jobs endpoint
+
+        Args:
+            params: Query parameters
+
+        Returns:
+            List of job dictionaries
+
+        Raises:
+            JobsAPIError: If the API returns a non-200 response
+        """
+        status, body = await self.get("/jobs", params=params)
+
+        if status != 200:
+            raise JobsAPIError(status, body)
+
+        return body
+
+    async def close(self) -> None:
+        """Close the underlying session if it belongs to the running loop"""
+        session, self._session = self._session, None
+        loop, self._loop = self._loop, None
+
+        if session is None or session.closed:
+            return
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if loop is running_loop:
+            await session.close()
+            logger.debug("Closed Jobs API session")
+
+# Global client instance
+_jobs_api_client = None
+
+def get_jobs_api_client() -> JobsAPIClient:
+    """
+    Get the process-wide Jobs API client
+
+    Returns:
+        JobsAPIClient instance
+    """
+    global _jobs_api_client
+
+    if _jobs_api_client is None:
+        _jobs_api_client = JobsAPIClient()
+
+    return _jobs_api_client
+
+async def close_jobs_api_client() -> None:
+    """Close the process-wide Jobs API client (call on shutdown)"""
+    if _jobs_api_client is not None:
+        await _jobs_api_client.close()
+
+def run_with_jobs_api_client(coro):
+    """
+    Run a coroutine in a new event loop and close the shared Jobs API
+    session before the loop is torn down
+
+    Used by the Celery task wrappers instead of a bare asyncio.run so the
+    session is reused for the whole task and never leaks across loops.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The result of the coroutine
+    """
+    async def _runner():
+        try:
+            return await coro
+        finally:
+            await close_jobs_api_client()
+
+    return asyncio.run(_runner())
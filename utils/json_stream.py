@@ -0,0 +1,86 @@
+# utils/json_stream.py
+import json
+import logging
+from typing import Any, List
+
+logger = logging.getLogger(__name__)
+
+class JSONArrayStreamParser:
+    """
+    Incremental parser for a JSON array of objects arriving in chunks
+
+    Each element is returned as soon as its closing brace arrives, so a
+    consumer can act on the first items of a streamed completion while the
+    rest is still being generated. Anything before the opening bracket
+    (such as a ```json fence) is skipped, as is anything after the array
+    closes. Top-level scalars are ignored and malformed elements are
+    counted in `errors` rather than aborting the stream.
+    """
+
+    def __init__(self):
+        self.errors = 0
+        self._buffer: List[str] = []
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def finished(self) -> bool:
+        """Whether the closing bracket of the array has been seen"""
+        return self._finished
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Consume the next chunk of the stream
+
+        Args:
+            text: Chunk of response text
+
+        Returns:
+            Elements completed by this chunk, in order
+        """
+        items = []
+
+        for char in text:
+            if self._finished:
+                break
+
+            if not self._started:
+                self._started = char == "["
+                continue
+
+            if self._depth == 0:
+                if char in "{[":
+                    self._buffer = [char]
+                    self._depth = 1
+                elif char == "]":
+                    self._finished = True
+                continue
+
+            self._buffer.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+
+                if self._depth == 0:
+                    try:
+                        items.append(json.loads("".join(self._buffer)))
+                    except ValueError as e:
+                        self.errors += 1
+                        logger.debug(f"Skipping malformed array element: {str(e)}")
+                    self._buffer = []
+
+        return items
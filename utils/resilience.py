@@ -0,0 +1,348 @@
+# utils/resilience.py
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if missing or invalid
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker
+
+    Closed: requests flow and outcomes are recorded over the last `window`
+    seconds. Once at least `min_requests` outcomes are in the window and the
+    failure ratio reaches `failure_ratio`, the breaker opens.
+
+    Open: requests are rejected until `open_seconds` (or a longer
+    Retry-After from the upstream) have passed.
+
+    Half-open: a single probe request is let through; its success closes
+    the breaker, its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: float,
+        min_requests: int,
+        failure_ratio: float,
+        open_seconds: float
+    ):
+        self.name = name
+        self.window = window
+        self.min_requests = min_requests
+        self.failure_ratio = failure_ratio
+        self.open_seconds = open_seconds
+
+        self._outcomes = deque()  # (monotonic time, succeeded)
+        self._failures = 0
+        self._opened_until = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open"""
+        if not self._opened_until:
+            return "closed"
+        if time.monotonic() < self._opened_until:
+            return "open"
+        return "half_open"
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a probe through"""
+        return max(0.0, self._opened_until - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent now
+
+        Returns:
+            True if the request may proceed (the caller must record its outcome)
+        """
+        state = self.state
+
+        if state == "closed":
+            return True
+
+        if state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        return False
+
+    def _prune(self, now: float) -> None:
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            _, succeeded = self._outcomes.popleft()
+            if not succeeded:
+                self._failures -= 1
+
+    def _open(self, seconds: float) -> None:
+        self._opened_until = max(self._opened_until, time.monotonic() + seconds)
+        self._probe_in_flight = False
+        logger.warning(f"Circuit breaker '{self.name}' opened for {seconds:.0f}s")
+
+    def record_success(self) -> None:
+        """Record a successful request"""
+        if self._opened_until:
+            if self.state == "half_open":
+                logger.info(f"Circuit breaker '{self.name}' closed")
+                self._opened_until = 0.0
+                self._probe_in_flight = False
+                self._outcomes.clear()
+                self._failures = 0
+            return
+
+        now = time.monotonic()
+        self._outcomes.append((now, True))
+        self._prune(now)
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        """
+        Record a failed request
+
+        Args:
+            retry_after: Upstream Retry-After in seconds; opens the breaker
+                for at least that long regardless of the failure ratio
+        """
+        if retry_after:
+            self._open(max(retry_after, 0.0))
+            return
+
+        if self._opened_until:
+            if self.state == "half_open":
+                self._open(self.open_seconds)
+            return
+
+        now = time.monotonic()
+        self._outcomes.append((now, False))
+        self._failures += 1
+        self._prune(now)
+
+        if len(self._outcomes) >= self.min_requests and self._failures / len(self._outcomes) >= self.failure_ratio:
+            self._open(self.open_seconds)
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limiter
+
+    The limit grows by roughly one slot per round of successful, fast
+    responses (additive increase) and is halved on failures or responses
+    slower than `latency_target` (multiplicative decrease). Waiting callers
+    give up after `queue_timeout` instead of queueing behind a slow upstream.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target: float,
+        queue_timeout: float
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.queue_timeout = queue_timeout
+
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently holding a slot"""
+        return self._in_flight
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+
+        if self._condition is None or self._loop is not loop:
+            # Slots held on a previous (closed) loop can never be released
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self._in_flight = 0
+
+        return self._condition
+
+    async def acquire(self) -> bool:
+        """
+        Wait for a free slot
+
+        Returns:
+            True if a slot was acquired, False if the queue timeout expired
+        """
+        condition = self._get_condition()
+
+        async with condition:
+            try:
+                await asyncio.wait_for(
+                    condition.wait_for(lambda: self._in_flight < self.limit),
+                    timeout=self.queue_timeout
+                )
+            except asyncio.TimeoutError:
+                return False
+
+            self._in_flight += 1
+            return True
+
+    async def release(self, succeeded: bool, latency: float) -> None:
+        """
+        Release a slot and adapt the limit
+
+        Args:
+            succeeded: Whether the request succeeded
+            latency: Request latency in seconds
+        """
+        condition = self._get_condition()
+
+        async with condition:
+            self._in_flight = max(0, self._in_flight - 1)
+
+            if succeeded and latency <= self.latency_target:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            else:
+                self._limit = max(self.min_limit, self._limit / 2)
+
+            condition.notify_all()
+
+# Refill and take one token atomically, on the Redis clock so all workers agree.
+# Returns the wait in seconds (as a string, Lua numbers are truncated to integers).
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+class RedisTokenBucket:
+    """
+    Token bucket shared by every process through Redis
+
+    `rate` tokens per second refill up to `capacity` (the allowed burst).
+    If Redis is unreachable the bucket degrades to a per-process one with
+    the same parameters for `fallback_seconds` instead of failing the caller.
+    """
+
+    fallback_seconds = 30.0
+
+    def __init__(self, key: str, rate: float, capacity: float, url: Optional[str] = None):
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self.url = url
+        self._client = None
+        self._script = None
+        self._loop = None
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._redis_retry_at = 0.0
+
+    def _get_script(self):
+        # redis.asyncio connections are bound to the loop that opened them
+        loop = asyncio.get_running_loop()
+
+        if self._client is None or self._loop is not loop:
+            import redis.asyncio as redis
+            from config.settings import REDIS_URL
+
+            self._client = redis.from_url(self.url or REDIS_URL)
+            self._script = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+            self._loop = loop
+
+        return self._script
+
+    def _take_local(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+
+        return (1 - self._tokens) / self.rate
+
+    async def _take(self) -> float:
+        if time.monotonic() < self._redis_retry_at:
+            return self._take_local()
+
+        try:
+            return float(await self._get_script()(keys=[self.key], args=[self.rate, self.capacity]))
+        except Exception as e:
+            logger.warning(f"Token bucket {self.key} falling back to a local bucket: {str(e)}")
+            self._redis_retry_at = time.monotonic() + self.fallback_seconds
+            return self._take_local()
+
+    async def acquire(self, timeout: float) -> bool:
+        """
+        Wait for a token
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if a token was taken, False if it would take longer than timeout
+        """
+        deadline = time.monotonic() + timeout
+
+        while True:
+            wait = await self._take()
+
+            if wait <= 0:
+                return True
+
+            if time.monotonic() + wait > deadline:
+                return False
+
+            await asyncio.sleep(wait)
@@ -0,0 +1,17 @@
+# utils/validators.py
+from typing import Any, Optional
+
+def coerce_percentage(value: Any) -> Optional[int]:
+    """
+    Clamp a model-reported match percentage to an int in 0-100
+
+    Args:
+        value: Score as reported (int, float or numeric string)
+
+    Returns:
+        Rounded percentage, or None if the value is not a number
+    """
+    try:
+        return max(0, min(100, int(round(float(value)))))
+    except (TypeError, ValueError):
+        return None